@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+动态背景模块
+后台线程按顺序解码帧序列到有界环形缓冲区，主线程按时间取帧，跟不上时丢帧而不是等待
+"""
+
+import threading
+from collections import deque
+
+import pygame
+
+from .surface_ingest import ingest, target_format
+
+
+# 默认帧率和预解码帧数
+DEFAULT_FPS = 24
+DEFAULT_BUFFER_FRAMES = 4
+
+
+class AnimatedWallpaper:
+    """流式动态背景
+
+    帧号从0开始单调递增，对帧数取模得到文件索引（循环播放）。后台线程最多
+    预解码 buffer_frames 帧，缓冲区满时等待；主线程每次取出到期的最新一帧，
+    更早的帧直接丢弃，解码线程落后时也会跳过已过期的帧。
+    内存占用只与缓冲区大小有关，与帧序列长度无关。
+    """
+
+    def __init__(self, frame_paths, size, fps=DEFAULT_FPS, buffer_frames=DEFAULT_BUFFER_FRAMES):
+        self.frame_paths = list(frame_paths)
+        self.size = size
+        self.interval = 1000.0 / max(1, fps)
+        self.capacity = max(1, buffer_frames)
+
+        # (帧号, Surface) 的环形缓冲区
+        self._ring = deque()
+        self._condition = threading.Condition()
+        self._wanted = 0
+        self._next_decode = 0
+        self._running = False
+        self._worker = None
+        # 解码线程转换帧时使用的显示格式（在主线程取得）
+        self._target = None
+
+        # 主线程持有的显示格式帧，每次复制新帧进去，不逐帧分配
+        self._frame = None
+        self._shown = -1
+        self._start_time = None
+        self.dropped_frames = 0
+
+    def __len__(self):
+        return len(self.frame_paths)
+
+    def start(self):
+        """启动解码线程"""
+        if self._running or not self.frame_paths:
+            return
+        self._running = True
+        self._target = target_format()
+        self._worker = threading.Thread(target=self._worker_loop, name="animated-wallpaper", daemon=True)
+        self._worker.start()
+
+    def stop(self):
+        """停止解码线程并释放缓冲的帧"""
+        with self._condition:
+            self._running = False
+            self._ring.clear()
+            self._condition.notify_all()
+
+    def set_size(self, size):
+        """改变输出尺寸：之后解码的帧按新尺寸缩放，已缓冲的旧尺寸帧在取出时缩放"""
+        with self._condition:
+            self.size = size
+        if self._frame is not None:
+            self._frame = ingest(pygame.transform.smoothscale(self._frame, size), "animated_frame")
+    
+    def update(self, now):
+        """取出当前时间应显示的帧，尚无可用帧时返回None"""
+        if self._start_time is None:
+            self._start_time = now
+        target = int((now - self._start_time) / self.interval)
+
+        chosen = None
+        with self._condition:
+            self._wanted = max(self._wanted, target)
+            while self._ring and self._ring[0][0] <= target:
+                if chosen is not None:
+                    self.dropped_frames += 1
+                chosen = self._ring.popleft()
+            self._condition.notify()
+
+        if chosen is not None:
+            if self._frame is None:
+                self._frame = ingest(pygame.Surface(self.size), "animated_frame")
+            frame = chosen[1]
+            if frame.get_size() != self.size:
+                # 改变尺寸之前解码的帧
+                frame = pygame.transform.scale(frame, self.size)
+            self._frame.blit(frame, (0, 0))
+            self._shown = chosen[0]
+        return self._frame
+
+    def frame_number(self):
+        """当前显示的帧号，尚未显示任何帧时为-1"""
+        return self._shown
+
+    def next_deadline(self):
+        """下一帧到期的时间点（pygame.time.get_ticks() 时间轴），已停止播放时返回None"""
+        if self._start_time is None or not self._running:
+            return None
+        return int(self._start_time + (self._shown + 1) * self.interval)
+
+    def _worker_loop(self):
+        """解码线程"""
+        failures = 0
+        while True:
+            with self._condition:
+                while self._running and len(self._ring) >= self.capacity:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                # 落后时直接跳到主线程需要的帧
+                if self._next_decode < self._wanted:
+                    self.dropped_frames += self._wanted - self._next_decode
+                    self._next_decode = self._wanted
+                number = self._next_decode
+                self._next_decode += 1
+
+            path = self.frame_paths[number % len(self.frame_paths)]
+            try:
+                surface = pygame.transform.scale(pygame.image.load(str(path)), self.size)
+                # 在解码线程中转换为显示格式，主线程取帧时只做同格式复制
+                surface = ingest(surface, "animated_frame", alpha=False, target=self._target)
+                failures = 0
+            except Exception as e:
+                print(f"动态背景帧加载失败 {path}: {e}")
+                failures += 1
+                if failures >= len(self.frame_paths):
+                    print("动态背景所有帧都无法加载，停止播放")
+                    self.stop()
+                    return
+                continue
+
+            with self._condition:
+                if not self._running:
+                    return
+                self._ring.append((number, surface))
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+动画模块
+按时间（而不是帧数）推进的补间动画：缓动曲线、颜色和矩形插值，
+以及"是否有动画进行中"的判断，供帧调度决定能否休眠
+"""
+
+import re
+
+import pygame
+
+
+# CSS命名缓动曲线对应的三次贝塞尔控制点
+NAMED_EASINGS = {
+    "ease": (0.25, 0.1, 0.25, 1.0),
+    "ease-in": (0.42, 0.0, 1.0, 1.0),
+    "ease-out": (0.0, 0.0, 0.58, 1.0),
+    "ease-in-out": (0.42, 0.0, 0.58, 1.0),
+}
+
+_CUBIC_BEZIER = re.compile(r"^cubic-bezier\(([^)]*)\)$")
+
+# 缓动描述 -> 缓动函数
+_easing_cache = {}
+
+
+def linear(t):
+    """线性缓动"""
+    return t
+
+
+def cubic_bezier(x1, y1, x2, y2):
+    """返回与CSS cubic-bezier(x1, y1, x2, y2) 相同的缓动函数"""
+    def sample(a1, a2, t):
+        return ((1 - 3 * a2 + 3 * a1) * t + (3 * a2 - 6 * a1)) * t * t + 3 * a1 * t
+
+    def slope(a1, a2, t):
+        return 3 * (1 - 3 * a2 + 3 * a1) * t * t + 2 * (3 * a2 - 6 * a1) * t + 3 * a1
+
+    def easing(x):
+        if x <= 0:
+            return 0.0
+        if x >= 1:
+            return 1.0
+        # 先用牛顿迭代求曲线参数，不收敛时改用二分
+        t = x
+        for _ in range(8):
+            error = sample(x1, x2, t) - x
+            if abs(error) < 1e-6:
+                return sample(y1, y2, t)
+            derivative = slope(x1, x2, t)
+            if abs(derivative) < 1e-6:
+                break
+            t -= error / derivative
+        low, high = 0.0, 1.0
+        t = x
+        while high - low > 1e-6:
+            if sample(x1, x2, t) < x:
+                low = t
+            else:
+                high = t
+            t = (low + high) / 2
+        return sample(y1, y2, t)
+
+    return easing
+
+
+def get_easing(easing):
+    """把缓动描述解析为函数
+
+    支持 "linear"、CSS命名曲线（ease、ease-in、ease-out、ease-in-out）、
+    "cubic-bezier(x1, y1, x2, y2)" 和可调用对象；无法识别时使用线性缓动。
+    """
+    if callable(easing):
+        return easing
+    if easing is None:
+        return linear
+
+    key = str(easing).strip().lower()
+    function = _easing_cache.get(key)
+    if function is not None:
+        return function
+
+    if key == "linear":
+        function = linear
+    elif key in NAMED_EASINGS:
+        function = cubic_bezier(*NAMED_EASINGS[key])
+    else:
+        match = _CUBIC_BEZIER.match(key.replace(" ", ""))
+        try:
+            points = [float(value) for value in match.group(1).split(",")] if match else []
+        except ValueError:
+            points = []
+        if len(points) == 4:
+            function = cubic_bezier(*points)
+        else:
+            print(f"无法识别的缓动曲线 {easing}，使用线性缓动")
+            function = linear
+    _easing_cache[key] = function
+    return function
+
+
+def lerp(start, end, t):
+    """数值插值"""
+    return start + (end - start) * t
+
+
+def lerp_color(start, end, t):
+    """颜色插值（RGB或RGBA），返回整数分量的元组"""
+    t = max(0.0, min(1.0, t))
+    if len(start) != len(end):
+        # 缺少透明度分量的一方按不透明处理
+        start = tuple(start) + (255,) * (4 - len(start))
+        end = tuple(end) + (255,) * (4 - len(end))
+    return tuple(int(round(lerp(a, b, t))) for a, b in zip(start, end))
+
+
+def lerp_rect(start, end, t):
+    """矩形插值，返回 pygame.Rect"""
+    start = pygame.Rect(start)
+    end = pygame.Rect(end)
+    return pygame.Rect(
+        round(lerp(start.x, end.x, t)),
+        round(lerp(start.y, end.y, t)),
+        round(lerp(start.width, end.width, t)),
+        round(lerp(start.height, end.height, t))
+    )
+
+
+def interpolate(start, end, t):
+    """按值的类型插值：数值、矩形、颜色（3或4个分量的序列）"""
+    if isinstance(start, pygame.Rect) or isinstance(end, pygame.Rect):
+        return lerp_rect(start, end, t)
+    if isinstance(start, (int, float)) and isinstance(end, (int, float)):
+        return lerp(start, end, t)
+    if isinstance(start, (list, tuple, pygame.Color)) and isinstance(end, (list, tuple, pygame.Color)):
+        return lerp_color(start, end, t)
+    # 无法插值的值在结束时跳变
+    return end if t >= 1 else start
+
+
+class Tween:
+    """从 start 到 end 的补间，进度只由时间决定，与帧率无关"""
+
+    def __init__(self, start, end, duration, easing=None, start_time=0):
+        self.start = start
+        self.end = end
+        self.duration = max(0, duration)
+        self.easing = get_easing(easing)
+        self.start_time = start_time
+        # 已经以结束值绘制过一次
+        self.finished = False
+
+    def progress(self, now):
+        """缓动后的进度，0表示开始，1表示结束（曲线允许时可能越过0或1）"""
+        if self.duration <= 0:
+            return 1.0
+        elapsed = (now - self.start_time) / self.duration
+        if elapsed >= 1:
+            return 1.0
+        return self.easing(max(0.0, elapsed))
+
+    def value(self, now):
+        """当前值；取到结束值后动画视为完成"""
+        if now - self.start_time >= self.duration:
+            self.finished = True
+            return self.end
+        return interpolate(self.start, self.end, self.progress(now))
+
+
+class Animator:
+    """按名称管理一组补间动画
+
+    同名动画重新开始时替换旧的。所有动画使用同一个时钟（默认为
+    pygame.time.get_ticks，单位毫秒），在20帧和60帧下同一时刻的值相同，
+    降低帧率只减少采样次数，不改变动画的时长和曲线。
+    """
+
+    def __init__(self, clock=None):
+        self.clock = clock or pygame.time.get_ticks
+        self._tweens = {}
+
+    def now(self):
+        """当前时间（毫秒）"""
+        return self.clock()
+
+    def start(self, name, start, end, duration, easing=None, now=None):
+        """开始（或重新开始）名为 name 的动画，duration 单位为毫秒"""
+        tween = Tween(start, end, duration, easing, self.now() if now is None else now)
+        self._tweens[name] = tween
+        return tween
+
+    def get(self, name):
+        """获取动画，不存在时返回None"""
+        return self._tweens.get(name)
+
+    def value(self, name, default=None, now=None):
+        """名为 name 的动画的当前值，不存在时返回 default"""
+        tween = self._tweens.get(name)
+        if tween is None:
+            return default
+        return tween.value(self.now() if now is None else now)
+
+    def progress(self, name, now=None):
+        """名为 name 的动画缓动后的进度，不存在时返回1"""
+        tween = self._tweens.get(name)
+        if tween is None:
+            return 1.0
+        if now is None:
+            now = self.now()
+        if now - tween.start_time >= tween.duration:
+            tween.finished = True
+        return tween.progress(now)
+
+    def stop(self, name):
+        """移除动画"""
+        self._tweens.pop(name, None)
+
+    def clear(self):
+        """移除所有动画"""
+        self._tweens.clear()
+
+    def is_active(self, name=None):
+        """是否有动画尚未以结束值绘制（name为None时检查全部）
+
+        动画到时后还需要再绘制一帧结束状态，因此以"已取到结束值"而不是
+        "时间已到"判断完成。
+        """
+        if name is not None:
+            tween = self._tweens.get(name)
+            return tween is not None and not tween.finished
+        return any(not tween.finished for tween in self._tweens.values())
@@ -7,6 +7,7 @@
 
 from pathlib import Path
 from .desktop_parser import DesktopParser
+from .json_style_manager import get_style_manager
 
 
 class AppConfigLoader:
@@ -66,6 +67,9 @@ class AppConfigLoader:
             selected_apps = priority_apps[:max_apps//2] + other_apps[:max_apps//2]
             filtered_apps = selected_apps[:max_apps]
         
+        # 按渲染器绘制图标图片的尺寸选择图标文件
+        icon_size = get_style_manager().get_app_icon_image_size()
+        
         for app in filtered_apps:
             # 获取图标路径
             icon_path = None
@@ -75,8 +79,8 @@ class AppConfigLoader:
                 if Path(icon_name).is_absolute() and Path(icon_name).exists():
                     icon_path = icon_name
                 else:
-                    # 否则搜索图标
-                    icon_path = self.desktop_parser.get_icon_path(icon_name)
+                    # 否则按主题和尺寸搜索图标（结果保存在注册表中）
+                    icon_path = self.desktop_parser.resolve_icon(app, icon_size)
             
             converted_app = {
                 'name': app['name'],
@@ -97,6 +101,7 @@ class AppConfigLoader:
                 print(f"应用 {app['name']} 未找到图标: {icon_name}")
             converted_apps.append(converted_app)
         
+        self.desktop_parser.flush_registry()
         return converted_apps
     
     def _should_skip_app(self, app):
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+模糊滤镜模块
+在缩小的图像上用 NumPy 做可分离的盒式模糊（三次近似高斯），再放大回原尺寸
+"""
+
+import pygame
+
+from .surface_ingest import ingest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# 缩小倍数范围：至少缩小4倍以保证速度，过大时放大后会出现明显色块
+MIN_DOWNSAMPLE = 4
+MAX_DOWNSAMPLE = 8
+
+# 不超过该半径时用切片累加代替前缀和
+SLICE_SUM_MAX_RADIUS = 4
+
+# 盒式模糊次数，三次叠加即可很好地近似高斯模糊
+BOX_PASSES = 3
+
+# 缓存的模糊结果数量（每个为一整屏Surface）
+BLUR_CACHE_ENTRIES = 2
+
+# [(源画面内容键, 半径, 模糊结果), ...]，最近使用的在末尾
+_blur_cache = []
+
+
+def blur_surface(surface, radius, key=None):
+    """返回surface的模糊副本
+
+    key 为描述源画面内容的键（按相等比较），给出时按 (key, 半径) 缓存结果，
+    同一画面上再次打开模态界面时直接复用。返回值可能是缓存中的Surface，
+    调用方修改前需先复制。
+    """
+    radius = int(radius)
+    if radius <= 0:
+        return surface
+    if key is None:
+        return _blur(surface, radius)
+
+    for entry in _blur_cache:
+        if entry[1] == radius and entry[2].get_size() == surface.get_size() and entry[0] == key:
+            _blur_cache.remove(entry)
+            _blur_cache.append(entry)
+            return entry[2]
+    blurred = _blur(surface, radius)
+    _blur_cache.append((key, radius, blurred))
+    del _blur_cache[:-BLUR_CACHE_ENTRIES]
+    return blurred
+
+
+def clear_blur_cache():
+    """丢弃缓存的模糊结果（背景切换时调用）"""
+    del _blur_cache[:]
+
+
+def _blur(surface, radius):
+    """计算模糊结果"""
+    width, height = surface.get_size()
+    downsample = max(MIN_DOWNSAMPLE, min(MAX_DOWNSAMPLE, radius // 2))
+    small_size = (max(1, width // downsample), max(1, height // downsample))
+    # smoothscale 只支持24/32位Surface
+    source = surface if surface.get_bitsize() in (24, 32) else surface.convert(32)
+    small = pygame.transform.smoothscale(source, small_size)
+
+    if np is not None:
+        small_radius = max(1, round(radius / downsample))
+        box_radius = max(1, round(small_radius / BOX_PASSES))
+        try:
+            pixels = pygame.surfarray.array3d(small).astype(np.float32)
+            for _ in range(BOX_PASSES):
+                pixels = _box_blur_axis(pixels, box_radius, 0)
+                pixels = _box_blur_axis(pixels, box_radius, 1)
+            pygame.surfarray.blit_array(small, pixels.clip(0, 255).astype(np.uint8))
+        except Exception as e:
+            print(f"NumPy模糊失败，使用缩放近似: {e}")
+            small = _scale_blur(source, radius)
+    else:
+        # 没有NumPy时仅用多级缩放近似
+        small = _scale_blur(source, radius)
+
+    return ingest(pygame.transform.smoothscale(small, (width, height)), "blur", alpha=False)
+
+
+def _box_blur_axis(pixels, radius, axis):
+    """沿一个轴做盒式模糊，边缘像素向外延伸"""
+    def span(start, stop):
+        index = [slice(None)] * pixels.ndim
+        index[axis] = slice(start, stop)
+        return tuple(index)
+
+    length = pixels.shape[axis]
+    size = 2 * radius + 1
+    padded = np.concatenate([
+        np.repeat(pixels[span(0, 1)], radius, axis=axis),
+        pixels,
+        np.repeat(pixels[span(length - 1, length)], radius, axis=axis),
+    ], axis=axis)
+    if radius <= SLICE_SUM_MAX_RADIUS:
+        # 小半径直接累加错位切片，比前缀和少一次大数组分配
+        result = padded[span(0, length)].copy()
+        for offset in range(1, size):
+            result += padded[span(offset, offset + length)]
+    else:
+        # 前缀和相减得到每个窗口的和，复杂度与半径无关
+        sums = np.cumsum(padded, axis=axis, dtype=np.float32)
+        result = sums[span(size - 1, None)].copy()
+        result[span(1, None)] -= sums[span(0, length - 1)]
+    result /= size
+    return result
+
+
+def _scale_blur(surface, radius):
+    """缩小到很小再放大的近似模糊（无NumPy时的备选）"""
+    width, height = surface.get_size()
+    factor = max(2, radius)
+    return pygame.transform.smoothscale(surface, (max(1, width // factor), max(1, height // factor)))
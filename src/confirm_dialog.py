@@ -6,6 +6,9 @@
 """
 
 import pygame
+from .text_cache import blit_text
+from .json_style_manager import get_style_manager
+from .text_layout import get_text_layout
 
 
 class ConfirmDialog:
@@ -67,100 +70,87 @@ class ConfirmDialog:
         
         return None
     
-    def render(self, screen, font_large, font_medium, font_small):
-        """渲染对话框"""
+    def get_state(self):
+        """对话框的显示状态，状态变化时需要重绘"""
+        if not self.visible:
+            return None
+        return (self.title, self.message, self.selected_option)
+    
+    def get_bounds(self, screen_width, screen_height):
+        """对话框及其下方操作提示占用的屏幕区域（不含全屏遮罩）"""
+        px = get_style_manager().scaled
+        bounds = self._dialog_rect(screen_width, screen_height).inflate(px(100), 0)
+        bounds.height += px(50)
+        return bounds.clip(pygame.Rect(0, 0, screen_width, screen_height))
+    
+    def _dialog_rect(self, screen_width, screen_height):
+        """对话框矩形（尺寸按内部渲染分辨率缩放，与字体一致）"""
+        px = get_style_manager().scaled
+        dialog_width = min(px(600), screen_width - px(100))
+        dialog_height = px(200)
+        dialog_x = (screen_width - dialog_width) // 2
+        dialog_y = (screen_height - dialog_height) // 2
+        return pygame.Rect(dialog_x, dialog_y, dialog_width, dialog_height)
+    
+    def render(self, screen, font_large, font_medium, font_small, draw_overlay=True):
+        """渲染对话框，draw_overlay为False时不绘制背景遮罩（由模态背景提供）"""
         if not self.visible:
             return
         
         screen_width = screen.get_width()
         screen_height = screen.get_height()
+        px = get_style_manager().scaled
         
         # 计算对话框尺寸
-        dialog_width = min(600, screen_width - 100)
-        dialog_height = 200
-        dialog_x = (screen_width - dialog_width) // 2
-        dialog_y = (screen_height - dialog_height) // 2
+        dialog_rect = self._dialog_rect(screen_width, screen_height)
+        dialog_x, dialog_y, dialog_width, dialog_height = dialog_rect
         
         # 绘制半透明背景遮罩
-        overlay = pygame.Surface((screen_width, screen_height))
-        overlay.set_alpha(180)
-        overlay.fill(self.BLACK)
-        screen.blit(overlay, (0, 0))
+        if draw_overlay:
+            overlay = pygame.Surface((screen_width, screen_height))
+            overlay.set_alpha(180)
+            overlay.fill(self.BLACK)
+            screen.blit(overlay, (0, 0))
         
         # 绘制对话框背景
-        dialog_rect = pygame.Rect(dialog_x, dialog_y, dialog_width, dialog_height)
-        pygame.draw.rect(screen, self.GRAY, dialog_rect, border_radius=15)
-        pygame.draw.rect(screen, self.WHITE, dialog_rect, 3, border_radius=15)
+        pygame.draw.rect(screen, self.GRAY, dialog_rect, border_radius=px(15))
+        pygame.draw.rect(screen, self.WHITE, dialog_rect, px(3), border_radius=px(15))
         
         # 绘制标题 - 使用中等字体大小，避免太大
-        title_surface = font_medium.render(self.title, True, self.WHITE)
-        title_rect = title_surface.get_rect(centerx=screen_width // 2, top=dialog_y + 20)
-        screen.blit(title_surface, title_rect)
+        blit_text(screen, font_medium, self.title, self.WHITE, centerx=screen_width // 2, top=dialog_y + px(20))
         
         # 绘制消息文本 - 使用小字体，避免字体过大
         # 处理多行消息
-        message_lines = self._wrap_text(self.message, font_small, dialog_width - 40)
-        message_y = dialog_y + 60
+        message_lines = get_text_layout().wrap(font_small, self.message, dialog_width - px(40))
+        message_y = dialog_y + px(60)
         for line in message_lines:
-            message_surface = font_small.render(line, True, self.WHITE)
-            message_rect = message_surface.get_rect(centerx=screen_width // 2, top=message_y)
-            screen.blit(message_surface, message_rect)
-            message_y += 25
+            blit_text(screen, font_small, line, self.WHITE, centerx=screen_width // 2, top=message_y)
+            message_y += px(25)
         
         # 绘制按钮
-        button_width = 120
-        button_height = 40
-        button_spacing = 40
+        button_width = px(120)
+        button_height = px(40)
+        button_spacing = px(40)
         total_button_width = 2 * button_width + button_spacing
         start_x = (screen_width - total_button_width) // 2
-        button_y = dialog_y + dialog_height - 70
+        button_y = dialog_y + dialog_height - px(70)
         
         # 取消按钮
         cancel_rect = pygame.Rect(start_x, button_y, button_width, button_height)
         cancel_color = self.LIGHT_BLUE if self.selected_option == 0 else self.BLUE
-        pygame.draw.rect(screen, cancel_color, cancel_rect, border_radius=8)
-        pygame.draw.rect(screen, self.WHITE, cancel_rect, 2, border_radius=8)
+        pygame.draw.rect(screen, cancel_color, cancel_rect, border_radius=px(8))
+        pygame.draw.rect(screen, self.WHITE, cancel_rect, px(2), border_radius=px(8))
         
-        cancel_text = font_medium.render(self.cancel_text, True, self.WHITE)
-        cancel_text_rect = cancel_text.get_rect(center=cancel_rect.center)
-        screen.blit(cancel_text, cancel_text_rect)
+        blit_text(screen, font_medium, self.cancel_text, self.WHITE, center=cancel_rect.center)
         
         # 确认按钮
         confirm_rect = pygame.Rect(start_x + button_width + button_spacing, button_y, button_width, button_height)
         confirm_color = self.RED if self.selected_option == 1 else self.GREEN
-        pygame.draw.rect(screen, confirm_color, confirm_rect, border_radius=8)
-        pygame.draw.rect(screen, self.WHITE, confirm_rect, 2, border_radius=8)
+        pygame.draw.rect(screen, confirm_color, confirm_rect, border_radius=px(8))
+        pygame.draw.rect(screen, self.WHITE, confirm_rect, px(2), border_radius=px(8))
         
-        confirm_text = font_medium.render(self.confirm_text, True, self.WHITE)
-        confirm_text_rect = confirm_text.get_rect(center=confirm_rect.center)
-        screen.blit(confirm_text, confirm_text_rect)
+        blit_text(screen, font_medium, self.confirm_text, self.WHITE, center=confirm_rect.center)
         
         # 绘制操作提示
-        hint_text = font_small.render("使用方向键选择，回车确认，ESC取消", True, self.WHITE)
-        hint_rect = hint_text.get_rect(centerx=screen_width // 2, top=button_y + button_height + 15)
-        screen.blit(hint_text, hint_rect)
-    
-    def _wrap_text(self, text, font, max_width):
-        """文本换行处理"""
-        words = text.split()
-        lines = []
-        current_line = []
-        current_width = 0
-        
-        for word in words:
-            word_surface = font.render(word, True, (255, 255, 255))
-            word_width = word_surface.get_width()
-            
-            if current_width + word_width <= max_width:
-                current_line.append(word)
-                current_width += word_width + 5  # 添加空格宽度
-            else:
-                if current_line:
-                    lines.append(' '.join(current_line))
-                current_line = [word]
-                current_width = word_width
-        
-        if current_line:
-            lines.append(' '.join(current_line))
-        
-        return lines if lines else [text]
+        blit_text(screen, font_small, "使用方向键选择，回车确认，ESC取消", self.WHITE,
+                  centerx=screen_width // 2, top=button_y + button_height + px(15))
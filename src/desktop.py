@@ -7,10 +7,13 @@ Flying Desktop 主类
 
 import pygame
 import sys
+import time
 
 from .config import ConfigManager
 from .input_handler import InputHandler
-from .renderer import Renderer
+from .sdl2_renderer import create_renderer
+from .icon_loader import ICON_LOADED_EVENT
+from .wallpaper_prefetch import WALLPAPER_LOADED_EVENT
 from .app_launcher import AppLauncher
 from .app_config import AppConfigLoader
 from .i18n import I18n
@@ -18,6 +21,13 @@ from .audio import AudioManager
 from .settings import SettingsPage
 from .confirm_dialog import ConfirmDialog
 from .json_style_manager import get_style_manager
+from .text_cache import blit_text
+from .frame_scheduler import FrameScheduler
+from .modal_backdrop import ModalStack
+from .quality_governor import (
+    QualityGovernor, QUALITY_NO_CROSSFADE, QUALITY_NO_DROPDOWN_EFFECTS,
+    QUALITY_NO_TILE_LABELS, QUALITY_LOW_RESOLUTION, MIN_LOW_RENDER_SCALE
+)
 
 
 class FlyingDesktop:
@@ -34,21 +44,21 @@ class FlyingDesktop:
         # 初始化音频系统
         self.audio = AudioManager(self.config_manager)
         
-        # 加载应用配置
-        self.app_config = AppConfigLoader()
-        self.apps = self.app_config.get_apps()
-        
-        if not self.apps:
-            print("警告: 没有找到可用的应用")
-        
         # 初始化样式管理器（屏幕尺寸将在Renderer初始化后设置）
         self.style_manager = get_style_manager()
         
         # 初始化各个模块（注意顺序：先渲染器再输入处理器）
-        self.renderer = Renderer(self.config_manager)
+        self.renderer = create_renderer(self.config_manager)
         # 设置样式管理器的屏幕尺寸
         self.style_manager.set_screen_size(self.renderer.screen_width, self.renderer.screen_height)
         
+        # 加载应用配置（在渲染器之后，按渲染器实际绘制的图标尺寸选择图标文件）
+        self.app_config = AppConfigLoader()
+        self.apps = self.app_config.get_apps()
+        
+        if not self.apps:
+            print("警告: 没有找到可用的应用")
+        
         self.input_handler = InputHandler(self.config_manager)
         self.app_launcher = AppLauncher()
         
@@ -69,6 +79,24 @@ class FlyingDesktop:
         self.keys_pressed = set()
         self.last_action_time = 0
         
+        # 模态界面冻结背景（设置页面、文件浏览器、确认对话框）
+        self.modal_stack = ModalStack() if self.config_manager.get('desktop.modal_backdrop', True) else None
+        
+        # 画质调节器：帧时间超出预算时逐级降低视觉效果
+        self.quality_governor = None
+        if self.config_manager.get('quality.adaptive', False):
+            self.quality_governor = QualityGovernor(
+                fps=self.config_manager.get('desktop.fps', 60),
+                window=self.config_manager.get('quality.window', 30),
+                degrade_ratio=self.config_manager.get('quality.degrade_ratio', 1.25),
+                restore_ratio=self.config_manager.get('quality.restore_ratio', 0.6),
+                cooldown=self.config_manager.get('quality.cooldown', 3000)
+            )
+        low_render_scale = self.config_manager.get('quality.low_render_scale', 0.75)
+        self.low_render_scale = min(1.0, max(MIN_LOW_RENDER_SCALE, low_render_scale))
+        if self.low_render_scale != low_render_scale:
+            print(f"quality.low_render_scale 超出范围，使用 {self.low_render_scale}")
+        
         # 删除确认对话框
         self.delete_confirm_dialog = ConfirmDialog(
             "删除应用",
@@ -79,7 +107,8 @@ class FlyingDesktop:
     
     def run(self):
         """主运行循环"""
-        clock = pygame.time.Clock()
+        # 画面静止时阻塞等待事件，只在需要时重绘
+        scheduler = FrameScheduler(self.config_manager.get("desktop.fps", 60))
         running = True
         
         print("Flying Desktop 已启动")
@@ -88,11 +117,33 @@ class FlyingDesktop:
         print(f"当前语言: {self.i18n.language}")
         
         while running:
+            # 等待事件或下一个定时点（背景轮播、长按重复）
+            # 只有当前画面会推进背景时，背景的过渡和定时点才需要重绘
+            desktop_live = self._desktop_is_live()
+            animating = self.renderer.is_animating() and desktop_live
+            events = scheduler.wait_for_events(
+                deadlines=(
+                    self.renderer.next_background_deadline() if desktop_live else None,
+                    self.input_handler.next_hold_deadline()
+                ),
+                animating=animating
+            )
+            
             # 处理事件
-            for event in pygame.event.get():
+            for event in events:
                 if event.type == pygame.QUIT:
                     running = False
                 
+                if event.type == ICON_LOADED_EVENT:
+                    # 图标异步加载完成，放入图标缓存
+                    self.renderer.on_icon_loaded(event)
+                    continue
+                
+                if event.type == WALLPAPER_LOADED_EVENT:
+                    # 下一张背景预取完成
+                    self.renderer.on_wallpaper_loaded(event)
+                    continue
+                
                 if self.current_view == 'settings':
                     # 设置页面事件处理
                     result = self.settings.handle_input(event)
@@ -112,6 +163,9 @@ class FlyingDesktop:
                         self.app_config.refresh_apps()
                         self.apps = self.app_config.get_apps()
                         print(f"应用列表已刷新，当前有 {len(self.apps)} 个应用")
+                        if self.modal_stack:
+                            # 冻结的桌面画面已过期
+                            self.modal_stack.invalidate()
                         
                         # 如果这是第一个应用，可以返回桌面
                         if len(self.apps) == 1:
@@ -191,6 +245,8 @@ class FlyingDesktop:
             
             # 键盘长按处理
             key_hold_actions = self.input_handler.handle_key_hold(current_time)
+            if key_hold_actions:
+                scheduler.request_redraw()
             for action in key_hold_actions:
                 if self.current_view == 'desktop' and not self.delete_confirm_dialog.is_visible():
                     if action == 'left' and len(self.apps) > 0:
@@ -207,6 +263,8 @@ class FlyingDesktop:
             
             # 手柄长按处理
             joystick_hold_actions = self.input_handler.handle_joystick_hold(current_time)
+            if joystick_hold_actions:
+                scheduler.request_redraw()
             for action in joystick_hold_actions:
                 if self.current_view == 'desktop' and not self.delete_confirm_dialog.is_visible():
                     if action == 'left' and len(self.apps) > 0:
@@ -221,8 +279,17 @@ class FlyingDesktop:
                         # 这里可以添加设置页面的长按滚动支持
                         pass
             
+            # 画面没有变化时跳过重绘
+            if not scheduler.should_render(events, animating):
+                continue
+            
+            frame_start = time.perf_counter()
+            
             # 渲染界面
-            if self.current_view == 'settings':
+            if self.current_view == 'settings' and self.modal_stack:
+                self._render_settings_modal()
+                self.renderer.present()
+            elif self.current_view == 'settings':
                 # 先渲染桌面作为背景（不刷新显示）
                 if self.apps:
                     self.renderer.render_background_only(self.apps, self.selected_app)
@@ -237,7 +304,7 @@ class FlyingDesktop:
                     self.renderer.small_font
                 )
                 # 只在这里刷新一次
-                pygame.display.flip()
+                self.renderer.present()
             else:
                 # 渲染桌面
                 if self.apps:
@@ -245,14 +312,41 @@ class FlyingDesktop:
                     self._render_desktop_with_dialog()
                 else:
                     self._render_no_apps()
+                if self.modal_stack and self.modal_stack.is_open() and not self.delete_confirm_dialog.is_visible():
+                    # 模态界面已关闭，释放冻结的背景
+                    self.modal_stack.invalidate()
+            
+            if self.quality_governor:
+                # 只统计重绘本身的耗时，不含空闲等待
+                frame_ms = (time.perf_counter() - frame_start) * 1000
+                level = self.quality_governor.record(frame_ms, pygame.time.get_ticks())
+                if level is not None:
+                    self._apply_quality_level(level)
+                    scheduler.request_redraw()
             
-            clock.tick(60)
+            scheduler.frame_done()
         
         # 清理资源
         self.renderer.cleanup()
         self.audio.cleanup()
         sys.exit()
     
+    def _apply_quality_level(self, level):
+        """按画质等级开关各项视觉效果"""
+        self.renderer.crossfade_enabled = level < QUALITY_NO_CROSSFADE
+        self.settings.dropdown_effects = level < QUALITY_NO_DROPDOWN_EFFECTS
+        
+        show_labels = level < QUALITY_NO_TILE_LABELS
+        if show_labels != self.renderer.show_unselected_labels:
+            self.renderer.show_unselected_labels = show_labels
+            if self.renderer.layers:
+                self.renderer.layers.clear()
+            self.renderer.invalidate()
+        
+        scale = self.low_render_scale if level >= QUALITY_LOW_RESOLUTION else 1.0
+        if self.renderer.set_render_scale(scale) and self.modal_stack:
+            self.modal_stack.invalidate()
+    
     def reload_after_settings(self):
         """设置更改后重新加载组件"""
         # 重新加载语言
@@ -262,17 +356,99 @@ class FlyingDesktop:
         # 重新加载音频设置
         self.audio.set_enabled(self.config_manager.get('audio.sound_effects', True))
     
+    def _desktop_is_live(self):
+        """当前画面是否会绘制桌面并推进背景（调用 update_background）
+        
+        模态界面打开时下层画面已冻结；没有应用时只绘制提示文字。
+        这两种情况下背景轮播的定时点到了也没有可重绘的内容。
+        """
+        if self.modal_stack and self.modal_stack.is_open():
+            return False
+        return bool(self.apps)
+    
     def _render_no_apps(self):
         """渲染无应用提示"""
         self._render_no_apps_content()
-        pygame.display.flip()
+        self.renderer.invalidate()
+        self.renderer.present()
     
     def _render_no_apps_background(self):
         """渲染无应用背景（不刷新显示）"""
         self._render_no_apps_content()
     
+    def _render_desktop_background(self):
+        """渲染模态界面下方的桌面画面（不刷新显示）"""
+        if self.apps:
+            self.renderer.render_background_only(self.apps, self.selected_app, "", show_title=False)
+            # 冻结前把背景合成进画面（纹理渲染后端的背景由GPU绘制在界面下面）
+            self.renderer.flatten_background()
+        else:
+            self._render_no_apps_background()
+    
+    def _desktop_backdrop_key(self):
+        """模态界面下方桌面画面的内容键（见 Renderer.backdrop_key），没有应用时为None"""
+        if not self.apps:
+            return None
+        return self.renderer.backdrop_key(self.apps, self.selected_app)
+    
+    def _render_settings_modal(self):
+        """在冻结的桌面背景上渲染设置页面（及文件浏览器）"""
+        screen = self.renderer.screen
+        fonts = (self.renderer.large_font, self.renderer.medium_font, self.renderer.small_font)
+        settings_blur = self.style_manager.get_settings_style()["background"]["blur_radius"]
+        modals = [
+            ('settings', lambda: self.settings.render_panel(screen, *fonts), 120, settings_blur)
+        ]
+        if self.settings.in_file_browser and self.settings.file_browser:
+            file_browser = self.settings.file_browser
+            file_browser_blur = self.style_manager.get_file_browser_style()["background"].get("blur_radius", 0)
+            modals.append(
+                ('file_browser', lambda: file_browser.render(screen, *fonts, draw_overlay=False), 180, file_browser_blur)
+            )
+        self.modal_stack.render(screen, modals, self._render_desktop_background,
+                                self._desktop_backdrop_key)
+        self.renderer.invalidate()
+    
+    def _render_dialog_modal(self):
+        """在冻结的桌面背景上渲染删除确认对话框"""
+        screen = self.renderer.screen
+        dialog = self.delete_confirm_dialog
+        modals = [
+            ('confirm', lambda: dialog.render(
+                screen,
+                self.renderer.large_font,
+                self.renderer.medium_font,
+                self.renderer.small_font,
+                draw_overlay=False
+            ), 180, self.style_manager.get_confirm_dialog_style()["background"]["blur_radius"])
+        ]
+        
+        if not self.renderer.dirty_rects_enabled or self.modal_stack.top() != 'confirm':
+            self.modal_stack.render(screen, modals, self._render_desktop_background,
+                                    self._desktop_backdrop_key)
+            self.renderer.invalidate()
+            self.renderer.present()
+            return
+        
+        # 脏矩形模式：背景已冻结，只重绘并提交对话框区域
+        bounds = dialog.get_bounds(self.renderer.screen_width, self.renderer.screen_height)
+        screen.set_clip(bounds)
+        self.modal_stack.render(screen, modals, self._render_desktop_background,
+                                self._desktop_backdrop_key)
+        screen.set_clip(None)
+        self.renderer.invalidate()
+        self.renderer.present([bounds])
+    
     def _render_desktop_with_dialog(self):
         """渲染桌面内容（包含删除确认对话框）"""
+        if self.modal_stack and self.delete_confirm_dialog.is_visible():
+            self._render_dialog_modal()
+            return
+        
+        if self.renderer.dirty_rects_enabled:
+            self._render_desktop_dirty()
+            return
+        
         # 先渲染桌面内容（不刷新显示）
         self.renderer.render_background_only(self.apps, self.selected_app, "", show_title=False)
         
@@ -286,40 +462,61 @@ class FlyingDesktop:
             )
         
         # 最后刷新显示
-        pygame.display.flip()
+        self.renderer.present()
+    
+    def _render_desktop_dirty(self):
+        """脏矩形模式下渲染桌面，只提交变化的区域"""
+        overlay = None
+        overlay_bounds = None
+        if self.delete_confirm_dialog.is_visible():
+            def overlay():
+                self.delete_confirm_dialog.render(
+                    self.renderer.screen,
+                    self.renderer.large_font,
+                    self.renderer.medium_font,
+                    self.renderer.small_font
+                )
+            overlay_bounds = self.delete_confirm_dialog.get_bounds(
+                self.renderer.screen_width,
+                self.renderer.screen_height
+            )
+        
+        rects = self.renderer.render_desktop_dirty(
+            self.apps,
+            self.selected_app,
+            overlay=overlay,
+            overlay_state=self.delete_confirm_dialog.get_state(),
+            overlay_bounds=overlay_bounds
+        )
+        self.renderer.present(rects)
     
     def _render_no_apps_content(self):
         """渲染无应用内容（不包含显示刷新）"""
         self.renderer.screen.fill(self.renderer.BLACK)
         
         # 显示提示信息
-        text = self.renderer.large_font.render("没有找到可用的应用", True, self.renderer.WHITE)
-        text_rect = text.get_rect(center=(
-            self.renderer.screen_width // 2, 
-            self.renderer.screen_height // 2 - 60
-        ))
-        self.renderer.screen.blit(text, text_rect)
+        blit_text(
+            self.renderer.screen,
+            self.renderer.large_font,
+            "没有找到可用的应用",
+            self.renderer.WHITE,
+            center=(self.renderer.screen_width // 2, self.renderer.screen_height // 2 - self.style_manager.scaled(60))
+        )
         
         # 显示设置提示
-        hint_text = self.renderer.medium_font.render(
-            "已自动打开设置页面", 
-            True, 
-            self.renderer.GRAY
+        blit_text(
+            self.renderer.screen,
+            self.renderer.medium_font,
+            "已自动打开设置页面",
+            self.renderer.GRAY,
+            center=(self.renderer.screen_width // 2, self.renderer.screen_height // 2)
         )
-        hint_rect = hint_text.get_rect(center=(
-            self.renderer.screen_width // 2, 
-            self.renderer.screen_height // 2
-        ))
-        self.renderer.screen.blit(hint_text, hint_rect)
         
         # 显示添加应用提示
-        add_hint = self.renderer.small_font.render(
-            "请在设置中选择 '添加应用' 来添加 .desktop 或 .AppImage 文件", 
-            True, 
-            self.renderer.WHITE
+        blit_text(
+            self.renderer.screen,
+            self.renderer.small_font,
+            "请在设置中选择 '添加应用' 来添加 .desktop 或 .AppImage 文件",
+            self.renderer.WHITE,
+            center=(self.renderer.screen_width // 2, self.renderer.screen_height // 2 + self.style_manager.scaled(40))
         )
-        add_rect = add_hint.get_rect(center=(
-            self.renderer.screen_width // 2, 
-            self.renderer.screen_height // 2 + 40
-        ))
-        self.renderer.screen.blit(add_hint, add_rect)
@@ -13,6 +13,10 @@ import json
 import hashlib
 from pathlib import Path
 import tempfile
+from .svg_cache import get_svg_cache
+from .json_style_manager import get_style_manager
+from .icon_index import IconIndex
+from .icon_trigram import IconTrigramIndex, FUZZY_EXTENSIONS
 
 
 class DesktopParser:
@@ -25,6 +29,11 @@ class DesktopParser:
         # 应用注册表文件
         self.registry_file = self.cache_dir / "registry.json"
         self.applications = self._load_registry()
+        
+        # 图标索引（首次查找图标时加载，目录变化时自动重建）
+        self.icon_index = IconIndex()
+        self.icon_trigrams = IconTrigramIndex(self.icon_index)
+        self._registry_dirty = False
     
     def _load_registry(self):
         """加载应用注册表"""
@@ -193,6 +202,9 @@ class DesktopParser:
         app['desktop_file'] = str(cache_path)
         app['original_file'] = str(desktop_path)
         
+        # 预先栅格化SVG图标
+        self._prerender_icon(app)
+        
         # 添加到注册表
         self.applications.append(app)
         self._save_registry()
@@ -223,6 +235,9 @@ class DesktopParser:
         if not app:
             raise ValueError("无法解析AppImage文件")
         
+        # 预先栅格化SVG图标
+        self._prerender_icon(app)
+        
         # 添加到注册表
         self.applications.append(app)
         self._save_registry()
@@ -230,6 +245,17 @@ class DesktopParser:
         print(f"成功添加AppImage应用: {app['name']}")
         return app
     
+    def _prerender_icon(self, app):
+        """注册应用时把SVG图标栅格化到磁盘缓存
+
+        与应用列表相同，按渲染器绘制图标图片的尺寸经 resolve_icon 选择图标文件，
+        并按该尺寸栅格化，保证预渲染的正是之后要绘制的文件和尺寸。
+        """
+        icon_size = get_style_manager().get_app_icon_image_size()
+        icon_path = self.resolve_icon(app, icon_size)
+        if icon_path and icon_path.lower().endswith('.svg'):
+            get_svg_cache().rasterize(icon_path, icon_size)
+    
     def remove_application(self, app_id):
         """移除应用"""
         # app_id可以是应用名称或desktop文件路径
@@ -406,8 +432,35 @@ class DesktopParser:
         
         return exec_cmd
     
-    def get_icon_path(self, icon_name):
-        """获取图标路径"""
+    def resolve_icon(self, app, size):
+        """获取应用图标路径，结果按尺寸和主题保存在注册表中避免重复查找"""
+        icon_name = app.get('icon', '')
+        if not icon_name:
+            return None
+        
+        theme = self.icon_index.default_theme()
+        cached_path = app.get('icon_path')
+        if (cached_path and app.get('icon_path_size') == size and
+                app.get('icon_path_theme') == theme and Path(cached_path).exists()):
+            return cached_path
+        
+        icon_path = self.get_icon_path(icon_name, size, theme)
+        if (icon_path != cached_path or app.get('icon_path_size') != size or
+                app.get('icon_path_theme') != theme):
+            app['icon_path'] = icon_path
+            app['icon_path_size'] = size
+            app['icon_path_theme'] = theme
+            self._registry_dirty = True
+        return icon_path
+    
+    def flush_registry(self):
+        """保存resolve_icon更新过的注册表"""
+        if self._registry_dirty:
+            self._registry_dirty = False
+            self._save_registry()
+    
+    def get_icon_path(self, icon_name, size=None, theme=None):
+        """获取图标路径，指定size时按图标主题选择不小于size的最小图标"""
         if not icon_name:
             return None
         
@@ -422,6 +475,12 @@ class DesktopParser:
         if any(icon_name.lower().endswith(ext) for ext in extensions):
             return self._search_icon_file(icon_name)
         
+        # 按主题和尺寸查找
+        if size:
+            icon_file = self.icon_index.lookup_icon(icon_name, size, theme)
+            if icon_file:
+                return icon_file
+        
         # 尝试添加不同扩展名搜索，优先PNG
         for ext in extensions:
             icon_file = self._search_icon_file(f"{icon_name}{ext}")
@@ -434,60 +493,23 @@ class DesktopParser:
                 return icon_file
         
         # 最后尝试模糊搜索
-        return self._fuzzy_search_icon(icon_name)
+        return self._fuzzy_search_icon(icon_name, size, theme)
     
     def _search_icon_file(self, filename):
-        """在系统图标目录中搜索指定文件名"""
-        # 系统图标目录
-        icon_paths = [
-            Path("/usr/share/icons"),
-            Path("/usr/share/pixmaps"),
-            Path.home() / ".local/share/icons",
-            Path.home() / ".icons",
-            Path("/opt/apps"),  # 深度系统应用图标
-        ]
-        
-        for icon_path in icon_paths:
-            if not icon_path.exists():
-                continue
-            
-            # 直接查找
-            icon_file = icon_path / filename
-            if icon_file.exists():
-                return str(icon_file)
-            
-            # 在子目录中递归查找
-            for icon_file in icon_path.rglob(filename):
-                if icon_file.is_file():
-                    return str(icon_file)
-        
-        return None
+        """在系统图标目录中搜索指定文件名（通过图标索引）"""
+        return self.icon_index.find_file(filename)
     
-    def _fuzzy_search_icon(self, icon_name):
-        """模糊搜索图标"""
-        icon_paths = [
-            Path("/usr/share/icons"),
-            Path("/usr/share/pixmaps"),
-        ]
-        
-        extensions = ['.png', '.svg', '.xpm', '.ico']
-        
-        for icon_path in icon_paths:
-            if not icon_path.exists():
-                continue
-            
-            # 搜索包含图标名的文件
-            for ext in extensions:
-                pattern = f"*{icon_name}*{ext}"
-                for icon_file in icon_path.rglob(pattern):
-                    if icon_file.is_file():
-                        return str(icon_file)
-                
-                # 反向搜索：图标名包含在文件名中
-                pattern = f"*{ext}"
-                for icon_file in icon_path.rglob(pattern):
-                    if icon_file.is_file() and icon_name.lower() in icon_file.stem.lower():
-                        return str(icon_file)
+    def _fuzzy_search_icon(self, icon_name, size=None, theme=None):
+        """模糊搜索图标（通过三元组索引按相似度排序）"""
+        for stem in self.icon_trigrams.search(icon_name):
+            if size:
+                icon_file = self.icon_index.lookup_icon(stem, size, theme)
+                if icon_file:
+                    return icon_file
+            for ext in FUZZY_EXTENSIONS:
+                icon_file = self.icon_index.find_file(f"{stem}{ext}")
+                if icon_file:
+                    return icon_file
         
         return None
     
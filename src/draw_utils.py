@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+绘图工具模块
+用 NumPy surfarray 生成渐变、阴影和面板Surface，并按尺寸和颜色缓存
+"""
+
+import pygame
+
+from .surface_cache import SurfaceLRUCache
+from .surface_ingest import ingest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# 缓存的像素内存上限（字节），全屏渐变单张就有数MB，按条目数限制不可靠
+MAX_CACHED_BYTES = 16 * 1024 * 1024
+
+_surface_cache = SurfaceLRUCache(MAX_CACHED_BYTES)
+
+
+def _cached(key, build):
+    """按键缓存生成的Surface（按字节预算LRU淘汰）"""
+    surface = _surface_cache.get(key)
+    if surface is None:
+        surface = _surface_cache.put(key, build())
+    return surface
+
+
+def _finish(surface):
+    """转换为显示格式以加快绘制"""
+    return ingest(surface, "generated")
+
+
+def vertical_gradient(size, start_color, end_color, flip=False):
+    """竖直渐变Surface
+
+    第y行的颜色为 start + (end - start) * y // height（与逐行绘制的整数公式一致），
+    颜色为RGBA时生成带透明度的Surface。flip为True时上下翻转。
+    返回的Surface是共享的缓存，调用方不能修改。
+    """
+    size = (max(1, int(size[0])), max(1, int(size[1])))
+    start_color = tuple(start_color)
+    end_color = tuple(end_color)
+    key = ("gradient", size, start_color, end_color, flip)
+    return _cached(key, lambda: _build_gradient(size, start_color, end_color, flip))
+
+
+def _build_gradient(size, start_color, end_color, flip):
+    width, height = size
+    has_alpha = len(start_color) == 4
+    surface = pygame.Surface(size, pygame.SRCALPHA if has_alpha else 0, 32)
+
+    if np is not None:
+        rows = np.arange(height, dtype=np.int32)[:, None]
+        start = np.array(start_color, dtype=np.int32)[None, :]
+        delta = np.array(end_color, dtype=np.int32)[None, :] - start
+        # 整数向下取整除法，与原逐行公式逐像素一致
+        colors = (start + delta * rows // height).clip(0, 255).astype(np.uint8)
+        if flip:
+            colors = colors[::-1]
+        pygame.surfarray.blit_array(surface, np.broadcast_to(colors[None, :, :3], (width, height, 3)))
+        if has_alpha:
+            pygame.surfarray.pixels_alpha(surface)[:] = colors[:, 3][None, :]
+    else:
+        for y in range(height):
+            row = height - 1 - y if flip else y
+            color = tuple(max(0, min(255, s + (e - s) * row // height)) for s, e in zip(start_color, end_color))
+            pygame.draw.line(surface, color, (0, y), (width - 1, y))
+    return _finish(surface)
+
+
+def translucent_panel(size, color):
+    """纯色（可半透明）面板Surface，返回共享的缓存，调用方不能修改"""
+    size = (max(1, int(size[0])), max(1, int(size[1])))
+    color = tuple(color)
+    key = ("panel", size, color)
+
+    def build():
+        surface = pygame.Surface(size, pygame.SRCALPHA if len(color) == 4 else 0, 32)
+        surface.fill(color)
+        return _finish(surface)
+
+    return _cached(key, build)
+
+
+def drop_shadow(size, layers):
+    """多层矩形阴影Surface
+
+    layers 为 [(外扩像素, 透明度), ...]，各层叠加效果与逐层绘制半透明黑色矩形一致。
+    返回的Surface比size每边大出最大外扩像素，调用方按该偏移绘制。
+    """
+    size = (int(size[0]), int(size[1]))
+    layers = tuple((int(offset), int(alpha)) for offset, alpha in layers)
+    key = ("shadow", size, layers)
+    return _cached(key, lambda: _build_shadow(size, layers))
+
+
+def _build_shadow(size, layers):
+    margin = max(offset for offset, _ in layers)
+    width, height = size[0] + margin * 2, size[1] + margin * 2
+    surface = pygame.Surface((width, height), pygame.SRCALPHA, 32)
+    surface.fill((0, 0, 0, 0))
+
+    if np is not None:
+        # 按 1 - Π(1 - a) 合成各层覆盖区域的透明度
+        transparency = np.ones((width, height), dtype=np.float32)
+        for offset, alpha in layers:
+            inset = margin - offset
+            transparency[inset:width - inset, inset:height - inset] *= 1.0 - alpha / 255.0
+        pygame.surfarray.pixels_alpha(surface)[:] = ((1.0 - transparency) * 255.0 + 0.5).astype(np.uint8)
+    else:
+        for offset, alpha in layers:
+            inset = margin - offset
+            layer = pygame.Surface((width - inset * 2, height - inset * 2), pygame.SRCALPHA)
+            layer.fill((0, 0, 0, alpha))
+            surface.blit(layer, (inset, inset))
+    return _finish(surface)
+
+
+def clear_cache():
+    """清空缓存（显示模式变化时调用）"""
+    _surface_cache.clear()
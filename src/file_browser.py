@@ -8,6 +8,10 @@
 import pygame
 from pathlib import Path
 import os
+from .text_cache import blit_text
+from .json_style_manager import get_style_manager
+from .text_layout import get_text_layout
+from .draw_utils import vertical_gradient, translucent_panel
 
 
 class FileBrowser:
@@ -168,61 +172,60 @@ class FileBrowser:
             self.selected_index = (self.selected_index + 1) % len(all_items)
             self.audio.play('select')
     
-    def render(self, screen, font_large, font_medium, font_small):
-        """渲染现代化文件浏览器 - 完美对齐版本"""
+    def render(self, screen, font_large, font_medium, font_small, draw_overlay=True):
+        """渲染现代化文件浏览器 - 完美对齐版本
+        
+        draw_overlay为False时不绘制背景遮罩（由模态背景提供）
+        """
         screen_width = screen.get_width()
         screen_height = screen.get_height()
+        # 布局尺寸与字体一样按内部渲染分辨率缩放
+        px = get_style_manager().scaled
         
         # 绘制半透明背景遮罩
-        overlay = pygame.Surface((screen_width, screen_height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        screen.blit(overlay, (0, 0))
+        if draw_overlay:
+            screen.blit(translucent_panel((screen_width, screen_height), (0, 0, 0, 180)), (0, 0))
         
         # 计算主容器尺寸和位置
-        container_width = min(850, screen_width - 80)
-        container_height = screen_height - 100
+        container_width = min(px(850), screen_width - px(80))
+        container_height = screen_height - px(100)
         container_x = (screen_width - container_width) // 2
-        container_y = 50
+        container_y = px(50)
         
         # 绘制主容器背景
-        container_bg = pygame.Surface((container_width, container_height), pygame.SRCALPHA)
-        container_bg.fill((40, 42, 50, 245))
-        screen.blit(container_bg, (container_x, container_y))
+        screen.blit(translucent_panel((container_width, container_height), (40, 42, 50, 245)), (container_x, container_y))
         
         # 绘制容器边框和高光
-        pygame.draw.rect(screen, (120, 125, 140), (container_x, container_y, container_width, container_height), 2, border_radius=15)
-        pygame.draw.rect(screen, (160, 165, 180, 100), (container_x + 1, container_y + 1, container_width - 2, 3), border_radius=12)
+        pygame.draw.rect(screen, (120, 125, 140), (container_x, container_y, container_width, container_height), px(2), border_radius=px(15))
+        pygame.draw.rect(screen, (160, 165, 180, 100), (container_x + 1, container_y + 1, container_width - 2, px(3)), border_radius=px(12))
         
         # 绘制标题
-        title_y = container_y + 35
-        title_surface = font_large.render("选择应用文件", True, (255, 255, 255))
-        title_x = container_x + (container_width - title_surface.get_width()) // 2
-        screen.blit(title_surface, (title_x, title_y))
+        title_y = container_y + px(35)
+        blit_text(screen, font_large, "选择应用文件", (255, 255, 255),
+                  centerx=container_x + container_width // 2, top=title_y)
         
         # 绘制路径显示区域
-        path_area_y = title_y + 60
-        path_area_height = 40
-        path_area_x = container_x + 25
-        path_area_width = container_width - 50
+        path_area_y = title_y + px(60)
+        path_area_height = px(40)
+        path_area_x = container_x + px(25)
+        path_area_width = container_width - px(50)
         
         # 路径区域背景
-        path_bg = pygame.Surface((path_area_width, path_area_height), pygame.SRCALPHA)
-        path_bg.fill((55, 58, 65, 200))
-        screen.blit(path_bg, (path_area_x, path_area_y))
-        pygame.draw.rect(screen, (90, 95, 105), (path_area_x, path_area_y, path_area_width, path_area_height), 1, border_radius=8)
+        screen.blit(translucent_panel((path_area_width, path_area_height), (55, 58, 65, 200)), (path_area_x, path_area_y))
+        pygame.draw.rect(screen, (90, 95, 105), (path_area_x, path_area_y, path_area_width, path_area_height), 1, border_radius=px(8))
         
         # 路径文字
         path_text = f"当前路径: {self.current_path}"
         if len(str(self.current_path)) > 65:
             path_text = f"当前路径: ...{str(self.current_path)[-62:]}"
-        path_surface = font_small.render(path_text, True, (200, 205, 210))
-        path_text_y = path_area_y + (path_area_height - path_surface.get_height()) // 2
-        screen.blit(path_surface, (path_area_x + 15, path_text_y))
+        blit_text(screen, font_small, path_text, (200, 205, 210),
+                  x=path_area_x + px(15), centery=path_area_y + path_area_height // 2)
         
         # 计算文件列表区域
-        list_area_y = path_area_y + path_area_height + 25
-        list_area_height = container_height - (list_area_y - container_y) - 70
-        item_height = 48
+        list_area_y = path_area_y + path_area_height + px(25)
+        list_area_height = container_height - (list_area_y - container_y) - px(70)
+        item_height = px(48)
+        item_inset = px(3)  # 项目背景的上下留白
         visible_items = list_area_height // item_height
         
         # 获取所有文件项
@@ -245,60 +248,53 @@ class FileBrowser:
             is_selected = (item_index == self.selected_index)
             
             # 计算项目区域
-            item_x = container_x + 20
-            item_width = container_width - 40
+            item_x = container_x + px(20)
+            item_width = container_width - px(40)
+            item_rect = (item_x, item_y + item_inset, item_width, item_height - item_inset * 2)
             
             # 绘制项目背景
             if is_selected:
                 # 选中项背景 - 渐变效果
-                selected_bg = pygame.Surface((item_width, item_height - 6), pygame.SRCALPHA)
-                for j in range(item_height - 6):
-                    progress = j / (item_height - 6)
-                    r = int(65 + progress * 25)
-                    g = int(105 + progress * 25)
-                    b = int(200 - progress * 30)
-                    alpha = int(220 - progress * 40)
-                    pygame.draw.line(selected_bg, (r, g, b), (0, j), (item_width, j))
-                screen.blit(selected_bg, (item_x, item_y + 3))
+                selected_bg = vertical_gradient(item_rect[2:], (65, 105, 200), (90, 130, 170))
+                screen.blit(selected_bg, item_rect[:2])
                 
                 # 选中项边框
-                pygame.draw.rect(screen, (90, 140, 255), (item_x, item_y + 3, item_width, item_height - 6), 2, border_radius=10)
+                pygame.draw.rect(screen, (90, 140, 255), item_rect, px(2), border_radius=px(10))
                 text_color = (255, 255, 255)
             else:
                 # 未选中项背景
-                normal_bg = pygame.Surface((item_width, item_height - 6), pygame.SRCALPHA)
-                normal_bg.fill((50, 53, 60, 100))
-                screen.blit(normal_bg, (item_x, item_y + 3))
-                pygame.draw.rect(screen, (70, 75, 85), (item_x, item_y + 3, item_width, item_height - 6), 1, border_radius=10)
+                screen.blit(translucent_panel(item_rect[2:], (50, 53, 60, 100)), item_rect[:2])
+                pygame.draw.rect(screen, (70, 75, 85), item_rect, 1, border_radius=px(10))
                 text_color = (210, 215, 220)
             
             # 绘制文件类型图标
-            icon_x = item_x + 25
+            icon_x = item_x + px(25)
             icon_y = item_y + item_height // 2
-            icon_radius = 10
+            # 图标图形的基本单位
+            u = px(2)
             
             # 根据文件类型绘制不同图标
             if item['type'] == 'parent':
                 # 返回上级 - 左箭头
                 arrow_points = [
-                    (icon_x + 6, icon_y - 6),
-                    (icon_x - 6, icon_y),
-                    (icon_x + 6, icon_y + 6)
+                    (icon_x + 3 * u, icon_y - 3 * u),
+                    (icon_x - 3 * u, icon_y),
+                    (icon_x + 3 * u, icon_y + 3 * u)
                 ]
                 pygame.draw.polygon(screen, (255, 200, 100), arrow_points)
                 name_color = (255, 200, 100)
                 
             elif item['type'] in ['directory', 'common']:
                 # 文件夹 - 文件夹图标
-                pygame.draw.rect(screen, (255, 200, 100), (icon_x - 8, icon_y - 4, 16, 8), 2)
-                pygame.draw.rect(screen, (255, 200, 100), (icon_x - 4, icon_y - 8, 8, 4), 2)
+                pygame.draw.rect(screen, (255, 200, 100), (icon_x - 4 * u, icon_y - 2 * u, 8 * u, 4 * u), 2)
+                pygame.draw.rect(screen, (255, 200, 100), (icon_x - 2 * u, icon_y - 4 * u, 4 * u, 2 * u), 2)
                 name_color = (255, 200, 100)
                 
             elif item['type'] == 'file':
                 if item['extension'] == '.desktop':
                     # Desktop应用文件 - 应用图标
-                    pygame.draw.rect(screen, (100, 255, 150), (icon_x - 6, icon_y - 6, 12, 12), 2)
-                    pygame.draw.circle(screen, (100, 255, 150), (icon_x, icon_y), 3)
+                    pygame.draw.rect(screen, (100, 255, 150), (icon_x - 3 * u, icon_y - 3 * u, 6 * u, 6 * u), 2)
+                    pygame.draw.circle(screen, (100, 255, 150), (icon_x, icon_y), px(3))
                     name_color = (100, 255, 150)
                     
                 elif item['extension'] == '.appimage':
@@ -307,72 +303,57 @@ class FileBrowser:
                     hex_points = []
                     for k in range(6):
                         angle = k * math.pi / 3
-                        px = icon_x + 8 * math.cos(angle)
-                        py = icon_y + 8 * math.sin(angle)
-                        hex_points.append((px, py))
+                        hex_points.append((icon_x + 4 * u * math.cos(angle), icon_y + 4 * u * math.sin(angle)))
                     pygame.draw.polygon(screen, (100, 180, 255), hex_points, 2)
                     name_color = (100, 180, 255)
                     
                 else:
                     # 其他文件 - 文档图标
-                    pygame.draw.rect(screen, (200, 200, 200), (icon_x - 5, icon_y - 8, 10, 16), 2)
-                    pygame.draw.line(screen, (200, 200, 200), (icon_x - 3, icon_y - 4), (icon_x + 3, icon_y - 4))
-                    pygame.draw.line(screen, (200, 200, 200), (icon_x - 3, icon_y), (icon_x + 3, icon_y))
-                    pygame.draw.line(screen, (200, 200, 200), (icon_x - 3, icon_y + 4), (icon_x + 3, icon_y + 4))
+                    pygame.draw.rect(screen, (200, 200, 200), (icon_x - px(5), icon_y - 4 * u, px(10), 8 * u), 2)
+                    for line_y in (icon_y - 2 * u, icon_y, icon_y + 2 * u):
+                        pygame.draw.line(screen, (200, 200, 200), (icon_x - px(3), line_y), (icon_x + px(3), line_y))
                     name_color = (200, 200, 200)
             else:
                 # 未知类型 - 问号
-                pygame.draw.circle(screen, (150, 150, 150), (icon_x, icon_y), 8, 2)
+                pygame.draw.circle(screen, (150, 150, 150), (icon_x, icon_y), 4 * u, 2)
                 name_color = (150, 150, 150)
             
             # 绘制文件名 - 使用精确的垂直居中
-            name_text = item['name']
-            name_x = item_x + 60
-            max_text_width = item_width - 80
+            name_x = item_x + px(60)
+            max_text_width = item_width - px(80)
             
             # 文字截断处理
-            if font_small.size(name_text)[0] > max_text_width:
-                while font_small.size(name_text + "...")[0] > max_text_width and len(name_text) > 1:
-                    name_text = name_text[:-1]
-                name_text += "..."
+            name_text = get_text_layout().truncate(font_small, item['name'], max_text_width)
             
             # 渲染文字并精确居中
-            name_surface = font_small.render(name_text, True, name_color if not is_selected else text_color)
-            name_y = item_y + (item_height - name_surface.get_height()) // 2
-            screen.blit(name_surface, (name_x, name_y))
+            blit_text(screen, font_small, name_text, name_color if not is_selected else text_color,
+                      x=name_x, centery=item_y + item_height // 2)
         
         # 绘制滚动条
         if len(all_items) > visible_items:
-            scrollbar_x = container_x + container_width - 15
+            scrollbar_x = container_x + container_width - px(15)
             scrollbar_y = list_area_y
-            scrollbar_width = 6
+            scrollbar_width = px(6)
             scrollbar_height = list_area_height
             
             # 滚动条轨道
-            track_bg = pygame.Surface((scrollbar_width, scrollbar_height), pygame.SRCALPHA)
-            track_bg.fill((70, 75, 85, 150))
-            screen.blit(track_bg, (scrollbar_x, scrollbar_y))
-            pygame.draw.rect(screen, (90, 95, 105), (scrollbar_x, scrollbar_y, scrollbar_width, scrollbar_height), 1, border_radius=3)
+            screen.blit(translucent_panel((scrollbar_width, scrollbar_height), (70, 75, 85, 150)), (scrollbar_x, scrollbar_y))
+            pygame.draw.rect(screen, (90, 95, 105), (scrollbar_x, scrollbar_y, scrollbar_width, scrollbar_height), 1, border_radius=px(3))
             
             # 滚动条滑块
-            thumb_height = max(25, scrollbar_height * visible_items // len(all_items))
+            thumb_height = max(px(25), scrollbar_height * visible_items // len(all_items))
             thumb_y = scrollbar_y + (scrollbar_height - thumb_height) * self.scroll_offset // max(1, len(all_items) - visible_items)
             
-            thumb_bg = pygame.Surface((scrollbar_width - 2, thumb_height), pygame.SRCALPHA)
-            thumb_bg.fill((140, 145, 155, 220))
-            screen.blit(thumb_bg, (scrollbar_x + 1, thumb_y))
-            pygame.draw.rect(screen, (170, 175, 185), (scrollbar_x + 1, thumb_y, scrollbar_width - 2, thumb_height), 1, border_radius=2)
+            screen.blit(translucent_panel((scrollbar_width - 2, thumb_height), (140, 145, 155, 220)), (scrollbar_x + 1, thumb_y))
+            pygame.draw.rect(screen, (170, 175, 185), (scrollbar_x + 1, thumb_y, scrollbar_width - 2, thumb_height), 1, border_radius=px(2))
         
         # 绘制底部操作提示
-        footer_y = container_y + container_height - 45
-        footer_bg = pygame.Surface((container_width - 30, 35), pygame.SRCALPHA)
-        footer_bg.fill((30, 32, 38, 200))
-        screen.blit(footer_bg, (container_x + 15, footer_y))
-        pygame.draw.rect(screen, (60, 65, 75), (container_x + 15, footer_y, container_width - 30, 35), 1, border_radius=8)
+        footer_y = container_y + container_height - px(45)
+        footer_height = px(35)
+        screen.blit(translucent_panel((container_width - px(30), footer_height), (30, 32, 38, 200)), (container_x + px(15), footer_y))
+        pygame.draw.rect(screen, (60, 65, 75), (container_x + px(15), footer_y, container_width - px(30), footer_height), 1, border_radius=px(8))
         
         # 操作提示文字
         help_text = "↑↓ 选择文件  回车 确认选择  Backspace 返回上级  ESC 取消  支持 .desktop 和 .AppImage 文件"
-        help_surface = font_small.render(help_text, True, (160, 165, 175))
-        help_x = container_x + (container_width - help_surface.get_width()) // 2
-        help_y = footer_y + (35 - help_surface.get_height()) // 2
-        screen.blit(help_surface, (help_x, help_y))
+        blit_text(screen, font_small, help_text, (160, 165, 175),
+                  centerx=container_x + container_width // 2, centery=footer_y + footer_height // 2)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+帧调度模块
+画面静止时阻塞等待事件或下一个定时点，避免空闲时按固定帧率重绘
+"""
+
+import pygame
+
+
+class FrameScheduler:
+    """帧调度器
+
+    有动画进行或需要重绘时按帧率节拍运行；否则在 pygame.event.wait 中阻塞，
+    直到有新事件或最近的定时点（背景轮播、长按重复等）到达。
+    """
+
+    def __init__(self, fps=60, max_idle_wait=1000):
+        self.fps = fps
+        # 空闲时单次等待的上限（毫秒），保证轮询型状态（如手柄摇杆）最终被检查
+        self.max_idle_wait = max_idle_wait
+        self.clock = pygame.time.Clock()
+        self._redraw = True
+
+    def request_redraw(self):
+        """请求在本轮重绘"""
+        self._redraw = True
+
+    def wait_for_events(self, deadlines=(), animating=False):
+        """获取本轮要处理的事件
+
+        deadlines 为 pygame.time.get_ticks() 时间轴上的定时点（可以包含None），
+        animating 为True时不阻塞。
+        """
+        if animating or self._redraw:
+            return pygame.event.get()
+
+        now = pygame.time.get_ticks()
+        pending = [deadline for deadline in deadlines if deadline is not None]
+        timeout = min(pending) - now if pending else self.max_idle_wait
+        timeout = min(timeout, self.max_idle_wait)
+        if timeout <= 0:
+            # 定时点已到，本轮需要重绘
+            self._redraw = True
+            return pygame.event.get()
+
+        event = pygame.event.wait(timeout)
+        if event.type == pygame.NOEVENT:
+            # 等待超时：若是定时点到达则重绘
+            if pending and pygame.time.get_ticks() >= min(pending):
+                self._redraw = True
+            return []
+        return [event] + pygame.event.get()
+
+    def should_render(self, events=(), animating=False):
+        """本轮是否需要重绘"""
+        return self._redraw or animating or bool(events)
+
+    def frame_done(self):
+        """重绘完成，按帧率限制节拍"""
+        self._redraw = False
+        self.clock.tick(self.fps)
@@ -7,6 +7,7 @@
 
 import json
 from pathlib import Path
+from .text_cache import get_text_cache
 
 
 class I18n:
@@ -97,4 +98,6 @@ class I18n:
     def set_language(self, language):
         """设置语言"""
         self.language = language
-        self.load_translations()
\ No newline at end of file
+        self.load_translations()
+        # 已渲染的文字随语言失效
+        get_text_cache().clear()
\ No newline at end of file
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+图标图集模块
+把桌面上的应用图标打包进少量大Surface，每个图标只是其中的一个子矩形
+"""
+
+import math
+import pygame
+from .surface_ingest import ingest
+
+
+class AtlasPage:
+    """图集页：按固定槽位网格划分的一张Surface"""
+
+    def __init__(self, slot_size, cols, rows):
+        self.slot_size = slot_size
+        self.cols = cols
+        self.rows = rows
+        self.surface = ingest(pygame.Surface((cols * slot_size, rows * slot_size), pygame.SRCALPHA), "icon_atlas")
+        self.surface.fill((0, 0, 0, 0))
+        # 空闲槽位，按从左上到右下的顺序分配
+        self.free_slots = list(range(cols * rows - 1, -1, -1))
+
+    def slot_rect(self, slot):
+        """槽位在页面中的矩形"""
+        row, col = divmod(slot, self.cols)
+        return pygame.Rect(col * self.slot_size, row * self.slot_size, self.slot_size, self.slot_size)
+
+    def is_empty(self):
+        return len(self.free_slots) == self.cols * self.rows
+
+
+class IconAtlas:
+    """图标图集
+
+    所有图标按同一槽位尺寸打包。新增或移除单个应用时只占用或释放一个槽位，
+    槽位不足时追加新页面，整页空闲时释放该页面。
+    """
+
+    def __init__(self, slot_size, max_page_size=2048):
+        self.slot_size = slot_size
+        self.max_slots_per_side = max(1, max_page_size // slot_size)
+        self.pages = []
+        # key -> (页面, 槽位, 图标矩形)
+        self._regions = {}
+        # 图标路径 -> key，用于替换同一文件的旧版本
+        self._paths = {}
+
+    def __len__(self):
+        return len(self._regions)
+
+    def __contains__(self, key):
+        return key in self._regions
+
+    def keys(self):
+        return set(self._regions)
+
+    def get(self, key):
+        """获取图标所在的 (页面Surface, 子矩形)"""
+        region = self._regions.get(key)
+        if region is None:
+            return None
+        page, _, rect = region
+        return page.surface, rect
+
+    def build(self, entries):
+        """一次性重建图集，entries为 [(key, surface), ...]"""
+        self.clear()
+        entries = [(key, surface) for key, surface in entries if self._fits(surface)]
+        if entries:
+            self._add_page(len(entries))
+        for key, surface in entries:
+            self.add(key, surface)
+
+    def add(self, key, surface):
+        """把图标放入空闲槽位，必要时追加新页面"""
+        if not self._fits(surface):
+            return False
+
+        # 同一文件的旧版本（mtime或尺寸不同）先移除
+        old_key = self._paths.get(key[0])
+        if old_key is not None:
+            self.remove(old_key)
+
+        page = next((p for p in self.pages if p.free_slots), None)
+        if page is None:
+            # 按现有容量的一半扩容，避免逐个添加时产生大量小页面
+            page = self._add_page(max(4, len(self._regions) // 2))
+
+        slot = page.free_slots.pop()
+        slot_rect = page.slot_rect(slot)
+        page.surface.fill((0, 0, 0, 0), slot_rect)
+        # 槽位已清空，使用MAX混合以原样复制像素和透明度
+        page.surface.blit(surface, slot_rect.topleft, special_flags=pygame.BLEND_RGBA_MAX)
+
+        rect = pygame.Rect(slot_rect.topleft, surface.get_size())
+        self._regions[key] = (page, slot, rect)
+        self._paths[key[0]] = key
+        return True
+
+    def remove(self, key):
+        """释放图标占用的槽位"""
+        region = self._regions.pop(key, None)
+        if region is None:
+            return
+        page, slot, _ = region
+        if self._paths.get(key[0]) == key:
+            del self._paths[key[0]]
+
+        page.surface.fill((0, 0, 0, 0), page.slot_rect(slot))
+        page.free_slots.append(slot)
+        if page.is_empty():
+            self.pages.remove(page)
+
+    def retain(self, keys):
+        """只保留指定的图标，其余槽位释放"""
+        for key in [key for key in self._regions if key not in keys]:
+            self.remove(key)
+
+    def clear(self):
+        """清空图集"""
+        self.pages = []
+        self._regions.clear()
+        self._paths.clear()
+
+    def _fits(self, surface):
+        """图标是否能放入一个槽位"""
+        width, height = surface.get_size()
+        return width <= self.slot_size and height <= self.slot_size
+
+    def _add_page(self, slot_count):
+        """追加一页，页面尺寸按所需槽位数确定"""
+        cols = min(self.max_slots_per_side, max(1, math.ceil(math.sqrt(slot_count))))
+        rows = min(self.max_slots_per_side, max(1, math.ceil(slot_count / cols)))
+        page = AtlasPage(self.slot_size, cols, rows)
+        self.pages.append(page)
+        return page
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+图标缓存模块
+缓存解码并缩放后的图标Surface，避免每帧重复加载图片
+"""
+
+import os
+import pygame
+from .surface_cache import SurfaceLRUCache
+from .surface_ingest import ingest
+
+
+# 图标变体
+ICON_VARIANT_NORMAL = "normal"
+ICON_VARIANT_SELECTED = "selected"
+
+
+class IconNotReady(Exception):
+    """图标资源尚未就绪（例如正在后台生成），稍后重试而不记为失败"""
+
+
+def scale_icon(surface, target_size):
+    """按比例缩放图标，使其放入target_size见方的区域"""
+    original_width, original_height = surface.get_size()
+    if original_width <= 0 or original_height <= 0:
+        return None
+
+    scale = min(target_size / original_width, target_size / original_height)
+    new_width = max(1, int(original_width * scale))
+    new_height = max(1, int(original_height * scale))
+
+    if (new_width, new_height) == (original_width, original_height):
+        return surface
+    return pygame.transform.scale(surface, (new_width, new_height))
+
+
+class IconSurfaceCache:
+    """图标Surface缓存
+
+    缓存键为 (图标路径, 文件mtime, 目标尺寸, 变体)。文件修改后mtime变化，
+    旧条目自然失效；加载失败的图标也会被记录，避免每帧重试和刷日志。
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, mtime_check_interval=1000):
+        self._surfaces = SurfaceLRUCache(max_bytes)
+        # (路径, mtime) -> 失败原因
+        self._failed = {}
+        # 路径 -> (mtime, 上次检查时间)，限制stat频率
+        self._mtimes = {}
+        self.mtime_check_interval = mtime_check_interval
+
+    def _get_mtime(self, icon_path):
+        """获取图标文件mtime（按间隔节流），文件不存在时返回None"""
+        now = pygame.time.get_ticks()
+        cached = self._mtimes.get(icon_path)
+        if cached and now - cached[1] < self.mtime_check_interval:
+            return cached[0]
+
+        try:
+            mtime = os.stat(icon_path).st_mtime_ns
+        except OSError:
+            mtime = None
+
+        if cached and cached[0] != mtime:
+            # 文件已变化，清除该路径的旧条目
+            self.invalidate(icon_path)
+        self._mtimes[icon_path] = (mtime, now)
+        return mtime
+
+    def make_key(self, icon_path, target_size, variant=ICON_VARIANT_NORMAL):
+        """生成缓存键，文件不存在时返回None"""
+        mtime = self._get_mtime(icon_path)
+        if mtime is None:
+            return None
+        return (icon_path, mtime, target_size, variant)
+
+    def is_failed(self, key):
+        """该图标此前是否加载失败"""
+        return key is None or key[:2] in self._failed
+
+    def mark_failed(self, key, error):
+        """记录加载失败的图标，只在首次失败时输出日志"""
+        if key is None or key[:2] in self._failed:
+            return
+        self._failed[key[:2]] = str(error)
+        print(f"加载图标失败 {key[0]}: {error}")
+
+    def get(self, key):
+        """获取缓存的图标Surface"""
+        if key is None:
+            return None
+        surface = self._surfaces.get(key)
+        if surface is None and key[3] != ICON_VARIANT_NORMAL:
+            # 变体尚未生成时直接返回普通变体，不以变体键重复缓存（否则字节计数翻倍）
+            surface = self._surfaces.get(key[:3] + (ICON_VARIANT_NORMAL,))
+        return surface
+
+    def put(self, key, surface):
+        """缓存已缩放的图标Surface（转换为显示格式）"""
+        return self._surfaces.put(key, ingest(surface, "icon"))
+
+    def discard(self, key):
+        """移除单个缓存条目（例如图标已打包进图集）"""
+        self._surfaces.discard(key)
+
+    def invalidate(self, icon_path):
+        """清除指定路径的所有缓存条目和失败记录"""
+        self._surfaces.discard_where(lambda key: key[0] == icon_path)
+        for failed_key in [k for k in self._failed if k[0] == icon_path]:
+            del self._failed[failed_key]
+
+    def clear(self):
+        """清空缓存"""
+        self._surfaces.clear()
+        self._failed.clear()
+        self._mtimes.clear()
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+图标索引模块
+扫描系统图标目录建立 文件名→路径 索引并持久化到磁盘，替代逐次rglob搜索
+"""
+
+import configparser
+import json
+import os
+import time
+from pathlib import Path
+
+
+# 建立索引的图标扩展名
+ICON_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tga', '.xpm', '.ico', '.svg')
+
+# 主题查找时尝试的扩展名（按优先级排序）
+THEME_ICON_EXTENSIONS = ('.png', '.svg', '.xpm')
+
+# 索引格式版本，格式变化时递增以强制重建
+INDEX_VERSION = 3
+
+# 目录元数据字段下标：[主题, 尺寸, 类型, 最小尺寸, 最大尺寸, 阈值, 缩放]
+META_THEME, META_SIZE, META_TYPE, META_MIN, META_MAX, META_THRESHOLD, META_SCALE = range(7)
+
+
+def default_icon_roots():
+    """系统图标目录（按搜索优先级排序）"""
+    return [
+        Path("/usr/share/icons"),
+        Path("/usr/share/pixmaps"),
+        Path.home() / ".local/share/icons",
+        Path.home() / ".icons",
+        Path("/opt/apps"),  # 深度系统应用图标
+    ]
+
+
+def detect_icon_theme():
+    """读取GTK设置中的当前图标主题，未设置时返回hicolor"""
+    for settings_file in [
+        Path.home() / ".config/gtk-4.0/settings.ini",
+        Path.home() / ".config/gtk-3.0/settings.ini",
+        Path("/etc/gtk-3.0/settings.ini"),
+    ]:
+        if not settings_file.exists():
+            continue
+        try:
+            parser = configparser.ConfigParser(interpolation=None, strict=False)
+            parser.read(settings_file, encoding='utf-8')
+            theme = parser.get("Settings", "gtk-icon-theme-name", fallback="").strip().strip('"')
+            if theme:
+                return theme
+        except Exception as e:
+            print(f"读取图标主题设置失败 {settings_file}: {e}")
+    return "hicolor"
+
+
+def parse_index_theme(index_file):
+    """解析主题的 index.theme，返回 {"inherits": [...], "dirs": {子目录: 元数据}}"""
+    parser = configparser.ConfigParser(interpolation=None, strict=False)
+    parser.optionxform = str
+    parser.read(index_file, encoding='utf-8')
+
+    if not parser.has_section("Icon Theme"):
+        return None
+
+    section = parser["Icon Theme"]
+    inherits = [name.strip() for name in section.get("Inherits", "").split(',') if name.strip()]
+    directories = []
+    for key in ("Directories", "ScaledDirectories"):
+        for subdir in section.get(key, "").split(','):
+            subdir = subdir.strip()
+            if subdir and subdir not in directories:
+                directories.append(subdir)
+
+    dirs = {}
+    for subdir in directories:
+        if not parser.has_section(subdir):
+            continue
+        info = parser[subdir]
+        try:
+            size = int(info.get("Size", "0"))
+            dirs[subdir] = {
+                "size": size,
+                "type": info.get("Type", "Threshold"),
+                "min": int(info.get("MinSize", size)),
+                "max": int(info.get("MaxSize", size)),
+                "threshold": int(info.get("Threshold", "2")),
+                "scale": int(info.get("Scale", "1")),
+            }
+        except ValueError:
+            continue
+
+    return {"inherits": inherits, "dirs": dirs}
+
+
+class IconIndex:
+    """图标文件索引
+
+    索引记录每个目录的mtime；主题目录存在 icon-theme.cache 时只记录该缓存
+    文件的mtime。加载时逐项比对，任何一项变化都会触发重建。
+    """
+
+    def __init__(self, roots=None, index_file=None):
+        self.roots = [Path(root) for root in (roots or default_icon_roots())]
+        self.index_file = Path(index_file) if index_file else (
+            Path.home() / ".cache" / "flying-desktop" / "icon-index.json"
+        )
+        self._dirs = None
+        self._dir_meta = None
+        self._files = None
+        self._stamps = None
+        self._themes = None
+        self._generation = None
+        self._default_theme = None
+
+    def find_file(self, filename):
+        """按文件名查找图标，返回第一个存在的匹配路径"""
+        for path in self.find_all(filename):
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def find_all(self, filename):
+        """按文件名查找图标，返回所有匹配的路径"""
+        self._ensure_loaded()
+        return [os.path.join(self._dirs[i], filename) for i in self._files.get(filename, ())]
+
+    def lookup_icon(self, icon_name, size, theme=None):
+        """按XDG图标主题规范查找图标
+
+        依次在主题及其Inherits链（最后是hicolor）中查找，选择不小于size的
+        最小固定尺寸图标；没有足够大的固定尺寸时依次考虑可缩放图标和
+        较小的图标。主题中找不到时再查找未归属主题的目录（如pixmaps）。
+        """
+        self._ensure_loaded()
+        candidates = []
+        for ext_rank, ext in enumerate(THEME_ICON_EXTENSIONS):
+            for dir_index in self._files.get(f"{icon_name}{ext}", ()):
+                candidates.append((dir_index, ext, ext_rank))
+        if not candidates:
+            return None
+
+        for theme_name in self._theme_chain(theme or self.default_theme()):
+            best = None
+            for dir_index, ext, ext_rank in candidates:
+                meta = self._dir_meta[dir_index]
+                if meta is None or meta[META_THEME] != theme_name:
+                    continue
+                rank = _size_rank(meta, size) + (ext_rank,)
+                path = os.path.join(self._dirs[dir_index], f"{icon_name}{ext}")
+                if (best is None or rank < best[0]) and os.path.isfile(path):
+                    best = (rank, path)
+            if best:
+                return best[1]
+
+        # 未归属任何主题的目录，按索引顺序
+        for dir_index, ext, _ in candidates:
+            if self._dir_meta[dir_index] is None:
+                path = os.path.join(self._dirs[dir_index], f"{icon_name}{ext}")
+                if os.path.isfile(path):
+                    return path
+        return None
+
+    def default_theme(self):
+        """当前桌面使用的图标主题"""
+        if self._default_theme is None:
+            self._default_theme = detect_icon_theme()
+        return self._default_theme
+
+    def _theme_chain(self, theme):
+        """主题及其继承链，hicolor总在最后"""
+        chain = []
+        pending = [theme]
+        while pending:
+            name = pending.pop(0)
+            if name in chain or name not in self._themes:
+                continue
+            chain.append(name)
+            pending.extend(self._themes[name]["inherits"])
+        if "hicolor" in chain:
+            chain.remove("hicolor")
+        if "hicolor" in self._themes:
+            chain.append("hicolor")
+        return chain
+
+    def filenames(self):
+        """索引中的所有图标文件名"""
+        self._ensure_loaded()
+        return self._files.keys()
+
+    def generation(self):
+        """索引版本号，每次重建时更新，供派生索引判断是否过期"""
+        self._ensure_loaded()
+        return self._generation
+
+    def refresh(self):
+        """强制重建索引"""
+        self._build()
+        self._save()
+
+    def _ensure_loaded(self):
+        """首次使用时加载索引，缺失或过期则重建"""
+        if self._files is not None:
+            return
+        if self._load() and not self._is_stale():
+            return
+
+        print("正在建立图标索引...")
+        self.refresh()
+        print(f"图标索引已建立: {len(self._files)} 个文件名, {len(self._dirs)} 个目录")
+
+    def _load(self):
+        """从磁盘加载索引"""
+        if not self.index_file.exists():
+            return False
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION:
+                return False
+            if data.get("roots") != [str(root) for root in self.roots]:
+                return False
+            self._dirs = data["dirs"]
+            self._dir_meta = data["dir_meta"]
+            self._files = data["files"]
+            self._stamps = data["stamps"]
+            self._themes = data["themes"]
+            self._generation = data["generation"]
+            return True
+        except Exception as e:
+            print(f"加载图标索引失败: {e}")
+            return False
+
+    def _save(self):
+        """保存索引到磁盘"""
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.index_file.with_suffix(".tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "version": INDEX_VERSION,
+                    "generation": self._generation,
+                    "roots": [str(root) for root in self.roots],
+                    "stamps": self._stamps,
+                    "themes": self._themes,
+                    "dirs": self._dirs,
+                    "dir_meta": self._dir_meta,
+                    "files": self._files,
+                }, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_file, self.index_file)
+        except Exception as e:
+            print(f"保存图标索引失败: {e}")
+
+    def _is_stale(self):
+        """比对记录的目录/缓存文件mtime"""
+        for path, mtime in self._stamps.items():
+            if _mtime(path) != mtime:
+                return True
+        return False
+
+    def _build(self):
+        """扫描所有图标目录"""
+        self._dirs = []
+        self._dir_meta = []
+        self._files = {}
+        self._stamps = {}
+        self._themes = self._scan_themes()
+        self._generation = time.time_ns()
+
+        for root in self.roots:
+            root = str(root)
+            # 不存在的目录也记录，之后出现时触发重建
+            self._stamps[root] = _mtime(root)
+            if self._stamps[root] is None:
+                continue
+
+            visited = set()
+            for dirpath, dirnames, filenames in os.walk(root, followlinks=True):
+                # 防止符号链接造成循环
+                real_path = os.path.realpath(dirpath)
+                if real_path in visited:
+                    dirnames[:] = []
+                    continue
+                visited.add(real_path)
+                dirnames.sort()
+
+                self._stamp_directory(root, dirpath, filenames)
+                self._index_directory(root, dirpath, filenames)
+
+    def _scan_themes(self):
+        """解析所有根目录下各主题的 index.theme，同名主题合并"""
+        themes = {}
+        for root in self.roots:
+            if not root.is_dir():
+                continue
+            for theme_dir in sorted(root.iterdir()):
+                index_file = theme_dir / "index.theme"
+                if not index_file.is_file():
+                    continue
+                self._stamps[str(index_file)] = _mtime(str(index_file))
+                try:
+                    info = parse_index_theme(index_file)
+                except Exception as e:
+                    print(f"解析图标主题失败 {index_file}: {e}")
+                    continue
+                if info is None:
+                    continue
+                theme = themes.setdefault(theme_dir.name, {"inherits": info["inherits"], "dirs": {}})
+                for subdir, meta in info["dirs"].items():
+                    theme["dirs"].setdefault(subdir, meta)
+        return themes
+
+    def _directory_meta(self, root, dirpath):
+        """目录的主题元数据，不属于任何主题目录时返回None"""
+        relative = os.path.relpath(dirpath, root)
+        if relative == '.' or os.sep not in relative:
+            return None
+        theme_name, subdir = relative.split(os.sep, 1)
+        theme = self._themes.get(theme_name)
+        if theme is None:
+            return None
+        info = theme["dirs"].get(subdir.replace(os.sep, '/'))
+        if info is None:
+            return None
+        return [theme_name, info["size"], info["type"], info["min"],
+                info["max"], info["threshold"], info["scale"]]
+
+    def _stamp_directory(self, root, dirpath, filenames):
+        """记录目录的失效标记"""
+        if os.path.dirname(dirpath) == root and "icon-theme.cache" in filenames:
+            # 主题目录有缓存文件时，以缓存文件mtime代表整个主题
+            cache_file = os.path.join(dirpath, "icon-theme.cache")
+            self._stamps[cache_file] = _mtime(cache_file)
+            self._stamps[dirpath] = _mtime(dirpath)
+            return
+
+        if self._covered_by_theme_cache(root, dirpath):
+            return
+        self._stamps[dirpath] = _mtime(dirpath)
+
+    def _covered_by_theme_cache(self, root, dirpath):
+        """目录是否位于带 icon-theme.cache 的主题中"""
+        relative = os.path.relpath(dirpath, root)
+        if relative == '.':
+            return False
+        theme_dir = os.path.join(root, relative.split(os.sep, 1)[0])
+        return os.path.join(theme_dir, "icon-theme.cache") in self._stamps
+
+    def _index_directory(self, root, dirpath, filenames):
+        """把目录中的图标文件加入索引"""
+        dir_index = None
+        for filename in sorted(filenames):
+            if not filename.lower().endswith(ICON_EXTENSIONS):
+                continue
+            if dir_index is None:
+                dir_index = len(self._dirs)
+                self._dirs.append(dirpath)
+                self._dir_meta.append(self._directory_meta(root, dirpath))
+            self._files.setdefault(filename, []).append(dir_index)
+
+
+def _size_rank(meta, size):
+    """目录尺寸与目标尺寸的匹配程度，值越小越合适
+
+    不小于目标尺寸的固定尺寸目录最优（越接近越好），其次是可缩放目录，
+    最后是偏小的目录（越大越好）。
+    """
+    scale = meta[META_SCALE] or 1
+    if meta[META_TYPE] == "Scalable":
+        if meta[META_MAX] * scale >= size:
+            return (1, 0)
+        return (2, size - meta[META_MAX] * scale)
+
+    nominal = meta[META_SIZE] * scale
+    if meta[META_TYPE] == "Threshold" and abs(nominal - size) <= meta[META_THRESHOLD] * scale:
+        return (0, 0)
+    if nominal >= size:
+        return (0, nominal - size)
+    return (2, size - nominal)
+
+
+def _mtime(path):
+    """获取路径的mtime（纳秒），不存在时返回None"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+图标异步加载模块
+在线程池中解码和缩放图标，完成后通过pygame事件通知主线程
+"""
+
+import itertools
+import queue
+import threading
+import pygame
+from .icon_cache import IconNotReady, scale_icon
+
+
+# 图标加载完成事件
+ICON_LOADED_EVENT = pygame.USEREVENT + 1
+
+
+class AsyncIconLoader:
+    """图标异步加载器
+
+    请求进入有界优先队列（数值越小越优先），队列已满时直接丢弃，
+    调用方在下一帧会重新请求。加载结果通过 ICON_LOADED_EVENT 事件投递，
+    由主线程转换为显示格式并放入图标缓存。
+
+    loader 以 (图标路径, 目标尺寸) 调用，返回原始图标Surface。
+    loader 抛出 IconNotReady（SVG仍在后台栅格化）时不投递事件，请求按
+    图标路径暂存，直到 retry 被调用后重新入队；暂存期间仍视为正在加载。
+    """
+
+    def __init__(self, loader, workers=2, max_queue=64):
+        self.loader = loader
+        self._queue = queue.PriorityQueue(maxsize=max_queue)
+        self._sequence = itertools.count()
+        # 已排队或正在加载的请求：key -> 优先级
+        self._pending = {}
+        # 等待图标就绪的请求：图标路径 -> {key: 优先级}
+        self._parked = {}
+        self._lock = threading.Lock()
+        self._running = True
+
+        self._workers = []
+        for i in range(max(1, workers)):
+            worker = threading.Thread(target=self._worker_loop, name=f"icon-loader-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def request(self, key, priority=0):
+        """请求加载图标，key为图标缓存键 (路径, mtime, 尺寸, 变体)"""
+        with self._lock:
+            queued_priority = self._pending.get(key)
+            if queued_priority is not None and queued_priority <= priority:
+                return True
+            if key in self._parked.get(key[0], ()):
+                # 图标就绪前重新入队只会再次得到IconNotReady
+                return True
+            try:
+                self._queue.put_nowait((priority, next(self._sequence), key))
+            except queue.Full:
+                return False
+            self._pending[key] = priority
+            return True
+
+    def is_pending(self, key):
+        """该图标是否正在排队或加载"""
+        with self._lock:
+            return key in self._pending
+
+    def complete(self, key):
+        """主线程处理完加载事件后调用"""
+        with self._lock:
+            self._pending.pop(key, None)
+
+    def retry(self, icon_path):
+        """图标文件已就绪（如SVG栅格化完成），重新加载暂存的请求
+
+        可以在任意线程中调用。
+        """
+        with self._lock:
+            parked = self._parked.pop(icon_path, None)
+            if not parked or not self._running:
+                return
+            for key, priority in parked.items():
+                try:
+                    self._queue.put_nowait((priority, next(self._sequence), key))
+                except queue.Full:
+                    # 放弃该请求，调用方在下一帧会重新请求
+                    self._pending.pop(key, None)
+
+    def _park(self, key):
+        """暂存尚未就绪的请求"""
+        with self._lock:
+            priority = self._pending.get(key)
+            if priority is not None:
+                self._parked.setdefault(key[0], {})[key] = priority
+
+    def _unpark(self, key):
+        """取消暂存"""
+        with self._lock:
+            parked = self._parked.get(key[0])
+            if parked is not None:
+                parked.pop(key, None)
+                if not parked:
+                    del self._parked[key[0]]
+
+    def _load(self, key):
+        """解码并缩放图标"""
+        raw_surface = self.loader(key[0], key[2])
+        if raw_surface is None:
+            raise ValueError("无法解码图标")
+        surface = scale_icon(raw_surface, key[2])
+        if surface is None:
+            raise ValueError("图标尺寸无效")
+        return surface
+
+    def _worker_loop(self):
+        """工作线程：按优先级取出请求并加载"""
+        while self._running:
+            try:
+                priority, _, key = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if key is None:
+                break
+
+            with self._lock:
+                # 同一图标可能以更高优先级重复入队，只处理一次
+                if self._pending.get(key) != priority:
+                    continue
+
+            surface = None
+            error = None
+            try:
+                surface = self._load(key)
+            except IconNotReady:
+                # 先暂存再检查一次：图标若恰好在暂存前就绪，retry 已经错过
+                self._park(key)
+                try:
+                    surface = self._load(key)
+                except IconNotReady:
+                    continue
+                except Exception as e:
+                    error = str(e)
+                self._unpark(key)
+            except Exception as e:
+                error = str(e)
+
+            try:
+                pygame.event.post(pygame.event.Event(
+                    ICON_LOADED_EVENT, key=key, surface=surface, error=error
+                ))
+            except pygame.error:
+                # 事件系统已关闭
+                break
+
+    def shutdown(self):
+        """停止工作线程"""
+        self._running = False
+        for _ in self._workers:
+            try:
+                self._queue.put_nowait((-1, next(self._sequence), None))
+            except queue.Full:
+                pass
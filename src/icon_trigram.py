@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+图标模糊匹配模块
+基于图标文件名主干的三元组(trigram)索引，替代遍历文件系统的模糊搜索
+"""
+
+import json
+import os
+from pathlib import Path
+
+
+# 参与模糊匹配的图标扩展名
+FUZZY_EXTENSIONS = ('.png', '.svg', '.xpm', '.ico')
+
+# 索引格式版本
+TRIGRAM_VERSION = 1
+
+
+def trigrams(text):
+    """文本的三元组集合（不足三个字符时返回整体）"""
+    text = text.lower()
+    if len(text) < 3:
+        return {text} if text else set()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class IconTrigramIndex:
+    """图标名三元组索引
+
+    与图标索引存放在同一目录，记录所基于的图标索引版本号，
+    图标索引重建后自动随之重建。
+    """
+
+    def __init__(self, icon_index, index_file=None):
+        self.icon_index = icon_index
+        self.index_file = Path(index_file) if index_file else (
+            icon_index.index_file.with_name("icon-trigrams.json")
+        )
+        self._stems = None
+        self._postings = None
+
+    def search(self, icon_name, limit=10):
+        """查找包含icon_name的图标名主干，按相似度从高到低返回"""
+        self._ensure_loaded()
+        query = icon_name.lower()
+        if not query:
+            return []
+
+        query_grams = trigrams(query)
+        if len(query) >= 3:
+            # 候选项必须包含查询的全部三元组，取最短的倒排列表求交集
+            postings = sorted((self._postings.get(gram, []) for gram in query_grams), key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                candidates.intersection_update(posting)
+                if not candidates:
+                    return []
+        else:
+            candidates = range(len(self._stems))
+
+        matches = []
+        for stem_index in candidates:
+            stem = self._stems[stem_index]
+            lowered = stem.lower()
+            if query not in lowered:
+                continue
+            stem_grams = trigrams(lowered)
+            similarity = len(query_grams & stem_grams) / len(query_grams | stem_grams)
+            matches.append((-similarity, len(stem), stem))
+
+        matches.sort()
+        return [stem for _, _, stem in matches[:limit]]
+
+    def _ensure_loaded(self):
+        """加载索引，缺失或与图标索引版本不一致时重建"""
+        if self._stems is not None:
+            return
+        generation = self.icon_index.generation()
+        if self._load(generation):
+            return
+        self._build()
+        self._save(generation)
+
+    def _load(self, generation):
+        """从磁盘加载索引"""
+        if not self.index_file.exists():
+            return False
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != TRIGRAM_VERSION or data.get("generation") != generation:
+                return False
+            self._stems = data["stems"]
+            self._postings = data["postings"]
+            return True
+        except Exception as e:
+            print(f"加载图标模糊索引失败: {e}")
+            return False
+
+    def _save(self, generation):
+        """保存索引到磁盘"""
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.index_file.with_suffix(".tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "version": TRIGRAM_VERSION,
+                    "generation": generation,
+                    "stems": self._stems,
+                    "postings": self._postings,
+                }, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_file, self.index_file)
+        except Exception as e:
+            print(f"保存图标模糊索引失败: {e}")
+
+    def _build(self):
+        """从图标索引的文件名建立三元组倒排表"""
+        stems = set()
+        for filename in self.icon_index.filenames():
+            stem, ext = os.path.splitext(filename)
+            if ext.lower() in FUZZY_EXTENSIONS and stem:
+                stems.add(stem)
+
+        self._stems = sorted(stems)
+        self._postings = {}
+        for stem_index, stem in enumerate(self._stems):
+            for gram in trigrams(stem):
+                self._postings.setdefault(gram, []).append(stem_index)
@@ -210,6 +210,14 @@ class InputHandler:
         
         return actions
     
+    def next_hold_deadline(self):
+        """下一次长按重复的时间点，没有按住的按键时返回None"""
+        deadlines = []
+        for key, start_time in self.key_hold_start_time.items():
+            repeat_time = self.last_repeat_time.get(key, start_time) + self.repeat_delay
+            deadlines.append(max(start_time + self.long_press_threshold, repeat_time))
+        return min(deadlines) if deadlines else None
+    
     def handle_joystick_hold(self, current_time):
         """处理手柄摇杆长按"""
         actions = []
@@ -11,6 +11,21 @@ from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Any, Union
 import math
 
+from .animation import get_easing, interpolate
+
+
+# 样式中表示像素尺寸的键，其数值（含嵌套字典中的数值，如 border_width.normal）
+# 由 get_xxx_style 按 ui_scale 缩放；字号不在其中，由 get_font 缩放
+PIXEL_KEYS = frozenset({
+    "size", "width", "height", "min_width", "max_width", "spacing", "text_spacing",
+    "padding", "margin", "margin_left", "margin_right", "margin_bottom",
+    "border_width", "border_radius", "blur_radius", "item_height",
+    "start_y", "y_start", "position", "x", "y"
+})
+
+# 图标图片与图块背景框之间的边距（像素）
+APP_ICON_MARGIN = 20
+
 
 class JSONStyleManager:
     """JSON样式管理器"""
@@ -21,6 +36,11 @@ class JSONStyleManager:
         self.current_theme = "dark"
         self.screen_width = 1920
         self.screen_height = 1080
+        # 样式中像素值（字号、尺寸、间距）的缩放比例，内部渲染分辨率低于输出分辨率时小于1
+        self.ui_scale = 1.0
+        
+        # 样式版本号，样式、主题或屏幕尺寸变化时递增，供缓存判断是否失效
+        self.version = 0
         
         # 字体缓存
         self.font_cache = {}
@@ -36,6 +56,7 @@ class JSONStyleManager:
     
     def load_styles(self):
         """加载样式配置"""
+        self.version += 1
         try:
             if Path(self.config_file).exists():
                 with open(self.config_file, 'r', encoding='utf-8') as f:
@@ -138,8 +159,15 @@ class JSONStyleManager:
             y = cat_y + 60 + row * (50 + item_spacing)
             return x, y, item_width, 50
     
+    def get_animation_timing(self, animation_name: str) -> Tuple[float, str]:
+        """获取动画的时长（秒）和缓动曲线，未配置时使用全局动画时长和 ease"""
+        animation_config = self.styles.get("animations", {}).get(animation_name, {})
+        default_duration = self.styles.get("global", {}).get("animation_duration", 0.2)
+        return (animation_config.get("duration", default_duration),
+                animation_config.get("easing", "ease"))
+    
     def get_animation_value(self, animation_name: str, progress: float) -> Dict[str, Any]:
-        """获取动画效果值"""
+        """获取动画效果值，progress为线性时间进度(0~1)，按动画的缓动曲线插值"""
         animations = self.styles.get("animations", {})
         animation_config = animations.get(animation_name, {})
         
@@ -148,6 +176,7 @@ class JSONStyleManager:
         
         from_values = animation_config.get("from", {})
         to_values = animation_config.get("to", {})
+        eased = get_easing(animation_config.get("easing", "ease"))(max(0.0, min(1.0, progress)))
         result = {}
         
         for key in from_values.keys():
@@ -155,22 +184,54 @@ class JSONStyleManager:
                 start_val = from_values[key]
                 end_val = to_values[key]
                 
-                # 简单的线性插值
-                if isinstance(start_val, (int, float)) and isinstance(end_val, (int, float)):
-                    result[key] = start_val + (end_val - start_val) * progress
-                # 这里可以添加更多类型的插值支持
+                # 名称以rect结尾的 [x, y, w, h] 按矩形插值，其余按数值或颜色插值，
+                # 无法插值的值（如transform字符串）在结束时跳变
+                if key.endswith("rect"):
+                    start_val, end_val = pygame.Rect(start_val), pygame.Rect(end_val)
+                result[key] = interpolate(start_val, end_val, eased)
         
         return result
     
-    def set_screen_size(self, width: int, height: int):
-        """设置屏幕尺寸，用于响应式布局"""
+    def set_screen_size(self, width: int, height: int, ui_scale: float = None):
+        """设置屏幕尺寸，用于响应式布局
+        
+        ui_scale 为样式像素值的缩放比例（内部渲染分辨率 / 输出分辨率），
+        为None时保持不变。
+        """
         self.screen_width = width
         self.screen_height = height
+        if ui_scale is not None:
+            self.ui_scale = ui_scale
+        self.version += 1
+    
+    def scaled(self, value: int) -> int:
+        """按 ui_scale 缩放样式中的像素值（正值不小于1，0和负值照常缩放）"""
+        if self.ui_scale == 1.0:
+            return value
+        result = int(round(value * self.ui_scale))
+        return max(1, result) if value > 0 else result
+    
+    def scale_pixels(self, config: Any, pixel: bool = False) -> Any:
+        """返回像素尺寸按 ui_scale 缩放后的样式副本
+        
+        键在 PIXEL_KEYS 中的数值及其下嵌套字典中的数值被缩放，
+        颜色、百分比字符串和字号保持原值。
+        """
+        if isinstance(config, dict):
+            return {key: self.scale_pixels(value, pixel or key in PIXEL_KEYS)
+                    for key, value in config.items()}
+        if pixel and isinstance(config, (int, float)) and not isinstance(config, bool):
+            return self.scaled(config)
+        return config
     
     def set_theme(self, theme: str):
         """设置当前主题"""
         if theme in self.styles.get("themes", {}):
             self.current_theme = theme
+            self.version += 1
+            # 已渲染的文字颜色随主题失效
+            from .text_cache import get_text_cache
+            get_text_cache().clear()
             print(f"主题已切换为: {theme}")
         else:
             print(f"主题 {theme} 不存在，使用默认主题")
@@ -193,7 +254,8 @@ class JSONStyleManager:
             return (255, 255, 255, 255)
     
     def get_font(self, font_size: int, font_family: str = None) -> pygame.font.Font:
-        """获取字体对象"""
+        """获取字体对象（字号按 ui_scale 缩放）"""
+        font_size = self.scaled(font_size)
         key = f"{font_size}_{font_family}"
         if key not in self.font_cache:
             if font_family:
@@ -209,7 +271,7 @@ class JSONStyleManager:
         """获取emoji字体，自动进行大小补偿"""
         # 获取emoji字体大小映射
         size_mapping = self.styles.get("emoji", {}).get("size_compensation", {})
-        emoji_size = size_mapping.get(str(base_font_size), base_font_size + 8)
+        emoji_size = self.scaled(size_mapping.get(str(base_font_size), base_font_size + 8))
         
         key = f"emoji_{emoji_size}"
         if key not in self.emoji_font_cache:
@@ -252,13 +314,13 @@ class JSONStyleManager:
         return default_value
     
     def get_settings_style(self) -> Dict[str, Any]:
-        """获取设置页面样式"""
+        """获取设置页面样式（像素尺寸已按 ui_scale 缩放，字号保持原值）"""
         settings_config = self.styles.get("settings_page", {})
         
         # 应用响应式布局
         settings_config = self._apply_responsive_layout("settings_page", settings_config)
         
-        return {
+        return self.scale_pixels({
             "background": {
                 "color": self.get_color(settings_config.get("background", {}).get("color", [0, 0, 0, 200])),
                 "blur_radius": settings_config.get("background", {}).get("blur_radius", 0)
@@ -287,16 +349,16 @@ class JSONStyleManager:
             },
             "dropdown": settings_config.get("dropdown", {}),
             "instructions": settings_config.get("instructions", {})
-        }
+        })
     
     def get_desktop_style(self) -> Dict[str, Any]:
-        """获取桌面样式"""
+        """获取桌面样式（像素尺寸已按 ui_scale 缩放，字号保持原值）"""
         desktop_config = self.styles.get("desktop", {})
         
         # 应用响应式布局
         desktop_config = self._apply_responsive_layout("desktop", desktop_config)
         
-        return {
+        return self.scale_pixels({
             "app_icon": {
                 "size": desktop_config.get("app_icon", {}).get("size", 200),
                 "spacing": desktop_config.get("app_icon", {}).get("spacing", 100),
@@ -316,16 +378,33 @@ class JSONStyleManager:
             },
             "title": desktop_config.get("title", {}),
             "instructions": desktop_config.get("instructions", {})
-        }
+        })
+    
+    def get_app_icon_image_size(self) -> int:
+        """图块内图标图片的尺寸：图块尺寸减去两侧边距（已按 ui_scale 缩放）
+        
+        渲染器按该尺寸缩放图标，选择图标文件和预渲染SVG时也使用它。
+        """
+        icon_size = self.get_desktop_style()["app_icon"]["size"]
+        return icon_size - self.scaled(APP_ICON_MARGIN) * 2
     
     def get_file_browser_style(self) -> Dict[str, Any]:
-        """获取文件浏览器样式"""
+        """获取文件浏览器样式（像素尺寸已按 ui_scale 缩放，字号保持原值）"""
         file_browser_config = self.styles.get("file_browser", {})
-        return {
+        return self.scale_pixels({
             "background": file_browser_config.get("background", {}),
             "path_display": file_browser_config.get("path_display", {}),
             "file_item": file_browser_config.get("file_item", {})
-        }
+        })
+    
+    def get_confirm_dialog_style(self) -> Dict[str, Any]:
+        """获取确认对话框样式（像素尺寸已按 ui_scale 缩放，字号保持原值）"""
+        dialog_config = self.styles.get("confirm_dialog", {})
+        return self.scale_pixels({
+            "background": {
+                "blur_radius": dialog_config.get("background", {}).get("blur_radius", 0)
+            }
+        })
     
     def _apply_responsive_layout(self, section: str, config: Dict[str, Any]) -> Dict[str, Any]:
         """应用响应式布局到配置"""
@@ -345,6 +424,19 @@ class JSONStyleManager:
                 "animation_duration": 0.2,
                 "transition_speed": 0.1
             },
+            "animations": {
+                "selection": {
+                    "from": {"highlight": 0},
+                    "to": {"highlight": 1},
+                    "duration": 0.15,
+                    "easing": "ease-out"
+                },
+                "wallpaperTransition": {
+                    "from": {"opacity": 0},
+                    "to": {"opacity": 1},
+                    "easing": "cubic-bezier(0.65, 0, 0.35, 1)"
+                }
+            },
             "themes": {
                 "dark": {
                     "primary_color": [100, 150, 255],
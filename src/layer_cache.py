@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+图层缓存模块
+缓存预合成的静态界面图层，内容不变时直接整体绘制
+"""
+
+import pygame
+
+from .surface_ingest import ingest, PREMULTIPLY_SUPPORTED
+
+
+class Layer:
+    """预合成图层：一张透明Surface及其在屏幕上的位置"""
+
+    def __init__(self, rect):
+        self.rect = pygame.Rect(rect)
+        self.surface = ingest(pygame.Surface(self.rect.size, pygame.SRCALPHA), "layer")
+        self.surface.fill((0, 0, 0, 0))
+        self.premultiplied = False
+
+    def to_local(self, position):
+        """屏幕坐标转换为图层内坐标"""
+        return position[0] - self.rect.x, position[1] - self.rect.y
+
+    def premultiply(self):
+        """内容绘制完成后预乘透明度，之后以 BLEND_PREMULTIPLIED 绘制
+        （pygame 不支持预乘时保持原样，仍按普通透明度绘制）"""
+        if not self.premultiplied and PREMULTIPLY_SUPPORTED:
+            self.surface = self.surface.premul_alpha()
+            self.premultiplied = True
+
+    def compose(self, layer):
+        """把另一个图层叠加到本图层
+
+        本图层已预乘时，layer 先预乘再以 BLEND_PREMULTIPLIED 叠加，结果保持预乘，
+        不需要再次预乘；否则按普通透明度叠加。
+        """
+        position = self.to_local(layer.rect.topleft)
+        if self.premultiplied:
+            layer.premultiply()
+            self.surface.blit(layer.surface, position, special_flags=pygame.BLEND_PREMULTIPLIED)
+        else:
+            self.surface.blit(layer.surface, position)
+
+    def draw(self, screen):
+        flags = pygame.BLEND_PREMULTIPLIED if self.premultiplied else 0
+        screen.blit(self.surface, self.rect.topleft, special_flags=flags)
+
+
+class LayerCache:
+    """按名称缓存图层
+
+    每个图层附带一个内容键，键变化时重新构建。整体失效（应用列表、语言、
+    样式变化）时调用 clear。
+    """
+
+    def __init__(self):
+        # 名称 -> (内容键, 图层)
+        self._layers = {}
+
+    def get(self, name, key, build):
+        """获取图层，不存在或内容键变化时调用build()重建（build可返回None）"""
+        entry = self._layers.get(name)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+        layer = build()
+        self._layers[name] = (key, layer)
+        return layer
+
+    def invalidate(self, name):
+        """使单个图层失效"""
+        self._layers.pop(name, None)
+
+    def clear(self):
+        """使所有图层失效"""
+        self._layers.clear()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+模态背景模块
+模态界面打开时冻结下层画面，把遮罩（和可选的模糊）烘焙进一张缓存Surface
+"""
+
+import pygame
+
+from .blur import blur_surface
+
+
+class ModalStack:
+    """模态界面栈
+
+    每层模态界面在打开时截取其下方的完整画面，烘焙遮罩后作为该层的背景，
+    直到该层关闭前一直复用；每帧只需绘制背景和最上层界面自身的面板。
+    """
+
+    def __init__(self):
+        # [(名称, 背景Surface), ...]，从下到上
+        self._layers = []
+
+    def is_open(self):
+        """是否有打开的模态界面"""
+        return bool(self._layers)
+
+    def top(self):
+        """最上层模态界面的名称"""
+        return self._layers[-1][0] if self._layers else None
+
+    def invalidate(self):
+        """丢弃所有冻结的背景（下层内容变化时调用），下一帧重新截取"""
+        self._layers = []
+
+    def render(self, screen, modals, draw_base, base_key=None):
+        """绘制模态界面栈
+
+        modals 为从下到上的 [(名称, 绘制面板的函数, 遮罩透明度, 模糊半径), ...]，
+        draw_base 绘制最底层的桌面画面。base_key 在 draw_base 之后调用，返回
+        桌面画面的内容键（画面在变化时返回None），用于复用最底层的模糊结果。
+        返回本帧是否重新截取了背景。
+        """
+        # 保留仍然打开的底部各层，其余重新截取
+        keep = 0
+        while (keep < len(self._layers) and keep < len(modals)
+               and self._layers[keep][0] == modals[keep][0]
+               and self._layers[keep][1].get_size() == screen.get_size()):
+            keep += 1
+        del self._layers[keep:]
+
+        rebuilt = keep < len(modals)
+        for i in range(keep, len(modals)):
+            name, _, dim_alpha, blur_radius = modals[i]
+            key = None
+            if i == 0:
+                draw_base()
+                if base_key is not None:
+                    key = base_key()
+            else:
+                screen.blit(self._layers[i - 1][1], (0, 0))
+                modals[i - 1][1]()
+            self._layers.append((name, self._bake(screen, dim_alpha, blur_radius, key)))
+
+        if modals:
+            screen.blit(self._layers[-1][1], (0, 0))
+            modals[-1][1]()
+        return rebuilt
+
+    def _bake(self, screen, dim_alpha, blur_radius, key=None):
+        """截取当前画面并烘焙模糊和遮罩（key 见 blur_surface）"""
+        if blur_radius > 0:
+            # 模糊结果可能来自模糊模块的缓存，复制后再烘焙遮罩
+            backdrop = blur_surface(screen, blur_radius, key).copy()
+        else:
+            backdrop = screen.copy()
+        if dim_alpha > 0:
+            # 等价于叠加透明度为dim_alpha的黑色遮罩
+            keep = 255 - dim_alpha
+            backdrop.fill((keep, keep, keep), special_flags=pygame.BLEND_RGB_MULT)
+        return backdrop
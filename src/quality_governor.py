@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+画质调节模块
+根据最近一段时间的实测帧时间逐级降低或恢复视觉效果
+"""
+
+from collections import deque
+
+
+# 画质等级，数值越大效果越少
+QUALITY_FULL = 0                # 全部效果
+QUALITY_NO_CROSSFADE = 1        # 背景切换不做渐变过渡
+QUALITY_NO_DROPDOWN_EFFECTS = 2 # 下拉框不绘制阴影和渐变
+QUALITY_NO_TILE_LABELS = 3      # 未选中的图块不绘制文字
+QUALITY_LOW_RESOLUTION = 4      # 降低内部渲染分辨率
+
+QUALITY_LEVEL_NAMES = {
+    QUALITY_FULL: "全部效果",
+    QUALITY_NO_CROSSFADE: "关闭背景渐变过渡",
+    QUALITY_NO_DROPDOWN_EFFECTS: "关闭下拉框阴影和渐变",
+    QUALITY_NO_TILE_LABELS: "隐藏未选中图块的文字",
+    QUALITY_LOW_RESOLUTION: "降低内部渲染分辨率",
+}
+
+# 最低档内部渲染分辨率比例的下限：界面尺寸随分辨率等比缩小，
+# 再低时设置页、文件浏览器和确认对话框的小字号只剩几个像素，放大后难以辨认
+MIN_LOW_RENDER_SCALE = 0.5
+
+
+class QualityGovernor:
+    """画质调节器
+
+    记录最近 window 帧的渲染耗时（只统计实际重绘的帧，不含空闲等待）。
+    窗口填满后平均耗时超过帧预算的 degrade_ratio 倍时降低一级，低于
+    restore_ratio 倍时恢复一级；每次调整后清空窗口并等待 cooldown 毫秒，
+    以免在两个等级之间来回切换。
+    """
+
+    def __init__(self, fps=60, window=30, degrade_ratio=1.25, restore_ratio=0.6,
+                 cooldown=3000, max_level=QUALITY_LOW_RESOLUTION):
+        self.budget = 1000.0 / max(1, fps)
+        self.degrade_ratio = degrade_ratio
+        self.restore_ratio = restore_ratio
+        self.cooldown = cooldown
+        self.max_level = max_level
+        self.level = QUALITY_FULL
+
+        self._frame_times = deque(maxlen=max(1, window))
+        self._last_change = None
+
+    def record(self, frame_ms, now):
+        """记录一帧的渲染耗时（毫秒），等级变化时返回新等级，否则返回None"""
+        if self._last_change is not None and now - self._last_change < self.cooldown:
+            return None
+        self._frame_times.append(frame_ms)
+        if len(self._frame_times) < self._frame_times.maxlen:
+            return None
+
+        average = sum(self._frame_times) / len(self._frame_times)
+        if average > self.budget * self.degrade_ratio and self.level < self.max_level:
+            new_level = self.level + 1
+        elif average < self.budget * self.restore_ratio and self.level > QUALITY_FULL:
+            new_level = self.level - 1
+        else:
+            return None
+
+        print(f"画质等级 {self.level} -> {new_level}（{QUALITY_LEVEL_NAMES[new_level]}），"
+              f"平均帧时间 {average:.1f}ms，帧预算 {self.budget:.1f}ms")
+        self.level = new_level
+        self._frame_times.clear()
+        self._last_change = now
+        return new_level
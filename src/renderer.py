@@ -5,46 +5,57 @@
 负责界面绘制和显示
 """
 
+import math
+
 import pygame
 from pathlib import Path
 from .json_style_manager import get_style_manager
+from .icon_cache import IconSurfaceCache, IconNotReady, ICON_VARIANT_NORMAL, ICON_VARIANT_SELECTED
+from .svg_cache import get_svg_cache
+from .icon_loader import AsyncIconLoader
+from .icon_atlas import IconAtlas
+from .text_cache import blit_text, get_text_cache
+from .text_layout import get_text_layout
+from .layer_cache import Layer, LayerCache
+from .draw_utils import vertical_gradient
+from .wallpaper_prefetch import WallpaperPrefetcher, expand_wallpaper_paths
+from .wallpaper_cache import get_wallpaper_cache
+from .animated_wallpaper import AnimatedWallpaper, DEFAULT_FPS, DEFAULT_BUFFER_FRAMES
+from .text_backend import register_font, set_text_backend, text_rect
+from .surface_ingest import ingest, print_ingest_stats, PREMULTIPLY_SUPPORTED
+from .animation import Animator, lerp, lerp_color
+from .blur import clear_blur_cache
 
 
 class Renderer:
     """渲染器"""
     
+    # 桌面底部的操作说明
+    INSTRUCTIONS = [
+        "使用方向键或手柄左摇杆选择应用",
+        "按确认键(A键/回车)启动应用",
+        "按Tab键或Y键打开设置",
+        "按Del键删除选中的应用",
+        "按ESC键退出桌面"
+    ]
+    
     def __init__(self, config):
         self.config = config
         
         # 初始化pygame显示（必须在获取显示信息之前）
         pygame.init()
         
-        # 初始化样式管理器
-        self.style_manager = get_style_manager()
-        self.style_manager.set_screen_size(
-            pygame.display.Info().current_w, 
-            pygame.display.Info().current_h
-        )
-        
         # 隐藏鼠标光标
         if config.get("desktop.hide_mouse", True):
             pygame.mouse.set_visible(False)
         
-        # 获取屏幕分辨率
-        info = pygame.display.Info()
-        self.screen_width = info.current_w
-        self.screen_height = info.current_h
-        
-        # 设置显示模式
-        if config.get("desktop.fullscreen", True):
-            self.screen = pygame.display.set_mode(
-                (self.screen_width, self.screen_height), 
-                pygame.FULLSCREEN
-            )
-        else:
-            self.screen = pygame.display.set_mode(
-                (self.screen_width, self.screen_height)
-            )
+        # 设置显示模式并确定内部渲染分辨率
+        self._init_display()
+        
+        # 初始化样式管理器（响应式布局按内部渲染分辨率计算，样式像素值按
+        # 内部渲染分辨率与输出分辨率之比缩放）
+        self.style_manager = get_style_manager()
+        self.style_manager.set_screen_size(self.screen_width, self.screen_height, self._ui_scale())
         
         pygame.display.set_caption(config.get("desktop.title", "Flying Desktop"))
         
@@ -55,26 +66,192 @@ class Renderer:
         self.LIGHT_BLUE = self.style_manager.get_color("highlight_color")
         self.GRAY = self.style_manager.get_color("secondary_color")
         
+        # 文字后端：font（默认）或 freetype
+        set_text_backend(config.get("desktop.text_backend", "font"))
+        
+        # 字体和图标尺寸
+        self._init_ui_metrics()
+        
+        # 图标缓存（按字节预算LRU淘汰）
+        icon_cache_mb = config.get("desktop.icon_cache_mb", 32)
+        self.icon_cache = IconSurfaceCache(max_bytes=icon_cache_mb * 1024 * 1024)
+        
+        # 图标异步加载器（线程池解码，加载完成前显示文字图标）
+        self.icon_loader = AsyncIconLoader(
+            self._load_icon_surface,
+            workers=config.get("desktop.icon_loader_threads", 2),
+            max_queue=config.get("desktop.icon_loader_queue", 64)
+        )
+        # SVG栅格化完成后重新加载等待中的图标
+        get_svg_cache().add_listener(lambda svg_path, size: self.icon_loader.retry(svg_path))
+        
+        # 图标图集（应用列表变化时增量打包）
+        self.icon_atlas = None
+        if config.get("desktop.icon_atlas", True):
+            self.icon_atlas = IconAtlas(self._icon_target_size())
+        self._apps = None
+        self._atlas_paths = set()
+        
+        # 脏矩形模式：只重绘并提交变化的区域
+        self.dirty_rects_enabled = config.get("desktop.dirty_rects", False)
+        self._full_redraw = True
+        self._last_frame = None
+        self._dirty_icon_paths = set()
+        # 图标加载完成的次数，画面内容键的一部分（见 backdrop_key）
+        self._icon_generation = 0
+        
+        # 静态界面图层缓存（标题、操作说明、未选中的图块）
+        self.layers = LayerCache() if config.get("desktop.retained_layers", True) else None
+        # 直接绘制到屏幕的图层预乘透明度，以 BLEND_PREMULTIPLIED 绘制
+        # （纹理渲染后端的画布按非预乘透明度上传，pygame 2.1.4 以下没有
+        # Surface.premul_alpha，这两种情况不使用）
+        self.premultiplied_layers = (config.get("desktop.premultiplied_alpha", False)
+                                     and self.display_surface is not None
+                                     and PREMULTIPLY_SUPPORTED)
+        self._layer_apps = None
+        self._layer_version = None
+        
+        # 画质调节器控制的效果开关
+        self.crossfade_enabled = True
+        self.show_unselected_labels = True
+        
+        # 按时间推进的动画（选中高亮、背景过渡），时长和缓动曲线来自 styles.json
+        self.animator = Animator()
+        self._selection_target = None
+        self._selection_from = None
+        self._highlight = 1.0
+        
+        # 加载背景
+        self.load_background()
+    
+    def _init_ui_metrics(self):
+        """按样式和当前缩放比例加载字体、计算图标尺寸（内部渲染分辨率变化时重新调用）"""
         # 字体设置 - 使用样式管理器获取字体大小
         desktop_style = self.style_manager.get_desktop_style()
         app_icon_style = desktop_style.get("app_icon", {})
         
         # 获取字体大小配置
         title_font_size = desktop_style.get("title", {}).get("font_size", 96)
-        icon_font_size = app_icon_style.get("icon", {}).get("font_size", 96)
         name_font_size = app_icon_style.get("name", {}).get("font_size", 48)
         desc_font_size = app_icon_style.get("description", {}).get("font_size", 32)
         
-        self.large_font = self._load_font(title_font_size)
-        self.medium_font = self._load_font(name_font_size)
-        self.small_font = self._load_font(desc_font_size)
+        self.large_font = self._load_font(self._px(title_font_size))
+        self.medium_font = self._load_font(self._px(name_font_size))
+        self.small_font = self._load_font(self._px(desc_font_size))
         
-        # 图标设置 - 使用样式管理器获取尺寸
+        # 图标设置 - 使用样式管理器获取尺寸（已按内部渲染分辨率缩放）
         self.icon_size = app_icon_style.get("size", 200)
         self.icon_spacing = app_icon_style.get("spacing", 100)
+    
+    def _px(self, value):
+        """按内部渲染分辨率缩放样式中的像素值"""
+        return self.style_manager.scaled(value)
+    
+    def _ui_scale(self):
+        """样式像素值的缩放比例：内部渲染分辨率 / 输出分辨率"""
+        output_width, output_height = self.output_size
+        return min(self.screen_width / output_width, self.screen_height / output_height)
+    
+    def _init_display(self):
+        """设置显示模式
         
-        # 加载背景
-        self.load_background()
+        输出分辨率取 display.width/height（为0时使用显示器原生分辨率）。
+        display.render_width/render_height 指定更低的内部渲染分辨率时，界面绘制到
+        该尺寸的Surface上：display.render_scaling 为 "sdl" 时使用 pygame.SCALED
+        由SDL缩放，否则每次提交时缩放到显示Surface（"smooth" 平滑、"fast" 最近邻）。
+        """
+        output_size, render_size = self._display_sizes()
+        self.output_size = output_size
+        flags = pygame.FULLSCREEN if self.config.get("desktop.fullscreen", True) else 0
+        self.sdl_scaled = False
+        
+        if render_size == output_size:
+            self.display_surface = pygame.display.set_mode(output_size, flags)
+            self.screen = self.display_surface
+        elif self.render_scaling == "sdl":
+            self.display_surface = pygame.display.set_mode(render_size, flags | pygame.SCALED)
+            self.screen = self.display_surface
+            self.sdl_scaled = True
+        else:
+            self.display_surface = pygame.display.set_mode(output_size, flags)
+            self.screen = ingest(pygame.Surface(render_size), "screen")
+        
+        self.screen_width, self.screen_height = self.screen.get_size()
+        self.base_render_size = (self.screen_width, self.screen_height)
+        if self.screen is not self.display_surface:
+            print(f"内部渲染分辨率: {self.screen_width}x{self.screen_height} -> {output_size[0]}x{output_size[1]}")
+    
+    def _display_sizes(self):
+        """根据配置计算 (输出分辨率, 内部渲染分辨率)"""
+        info = pygame.display.Info()
+        output_size = (
+            self.config.get("display.width", 0) or info.current_w,
+            self.config.get("display.height", 0) or info.current_h
+        )
+        render_size = (
+            self.config.get("display.render_width", 0) or output_size[0],
+            self.config.get("display.render_height", 0) or output_size[1]
+        )
+        self.render_scaling = self.config.get("display.render_scaling", "smooth")
+        return output_size, render_size
+    
+    def _resize_screen(self, size):
+        """按新的内部渲染分辨率重建绘制目标"""
+        if size == self.display_surface.get_size():
+            self.screen = self.display_surface
+        else:
+            self.screen = ingest(pygame.Surface(size), "screen")
+    
+    def set_render_scale(self, scale):
+        """运行时按比例调整内部渲染分辨率（相对于配置的分辨率），返回是否生效
+        
+        pygame.SCALED 模式下需要重建窗口，不支持运行时调整。
+        """
+        if self.sdl_scaled:
+            return False
+        
+        size = (max(1, int(self.base_render_size[0] * scale)), max(1, int(self.base_render_size[1] * scale)))
+        if size == self.screen.get_size():
+            return False
+        self._resize_screen(size)
+        self.screen_width, self.screen_height = size
+        print(f"内部渲染分辨率调整为: {size[0]}x{size[1]}")
+        
+        # 依赖屏幕尺寸的状态全部重建：字体、图标尺寸和按图标尺寸打包的图集
+        self.style_manager.set_screen_size(self.screen_width, self.screen_height, self._ui_scale())
+        self._init_ui_metrics()
+        if self.icon_atlas is not None:
+            self.icon_atlas = IconAtlas(self._icon_target_size())
+            self._apps = None
+            self._atlas_paths = set()
+        if self.layers:
+            self.layers.clear()
+        self.invalidate()
+        self._rescale_backgrounds()
+        return True
+    
+    def _rescale_backgrounds(self):
+        """从配置分辨率的背景原图重新缩放到新的内部渲染分辨率
+        
+        不重新解码壁纸，也不重启轮播计时、预取和动态背景；壁纸始终按配置的
+        分辨率解码和缓存，使用时再缩放到当前分辨率（见 _fit_background）。
+        """
+        self.current_background = self._fit_background(self._current_source)
+        self.next_background = self._fit_background(self._next_source)
+        # 旧尺寸的混合缓冲区和预合成的过渡帧作废，过渡中改为实时混合
+        self._blend_buffer = None
+        self._blend_alpha = None
+        self._transition_frames = []
+        self._transition_frames_ready = 0
+        if self.animated_background is not None:
+            self.animated_background.set_size((self.screen_width, self.screen_height))
+    
+    def _fit_background(self, surface):
+        """背景尺寸与当前内部渲染分辨率不同时（画质调节降低了分辨率）缩放到当前分辨率"""
+        size = (self.screen_width, self.screen_height)
+        if surface.get_size() == size:
+            return surface
+        return pygame.transform.smoothscale(surface, size)
     
     def _load_font(self, size):
         """加载支持中文的字体"""
@@ -106,7 +283,7 @@ class Renderer:
             try:
                 font = pygame.font.Font(font_path, size)
                 print(f"成功加载配置字体: {font_path}")
-                return font
+                return register_font(font, font_path, size)
             except Exception as e:
                 print(f"无法加载配置的字体 {font_path}: {e}")
         
@@ -116,7 +293,7 @@ class Renderer:
                 if Path(font_path).exists():
                     font = pygame.font.Font(font_path, size)
                     print(f"成功加载中文字体文件: {font_path}")
-                    return font
+                    return register_font(font, font_path, size)
             except Exception as e:
                 print(f"字体文件加载失败 {font_path}: {e}")
                 continue
@@ -126,7 +303,7 @@ class Renderer:
             try:
                 font = pygame.font.SysFont(font_name, size)
                 print(f"成功加载系统字体: {font_name}")
-                return font
+                return register_font(font, pygame.font.match_font(font_name), size)
             except Exception as e:
                 print(f"系统字体加载失败 {font_name}: {e}")
                 continue
@@ -135,7 +312,7 @@ class Renderer:
         try:
             font = pygame.font.SysFont("sans-serif", size)
             print("使用系统默认sans-serif字体")
-            return font
+            return register_font(font, pygame.font.match_font("sans-serif"), size)
         except Exception as e:
             print(f"sans-serif字体加载失败: {e}")
         
@@ -143,114 +320,201 @@ class Renderer:
         try:
             font = pygame.font.Font(None, size)
             print("警告: 使用pygame默认字体，可能不支持中文显示")
-            return font
+            return register_font(font, None, size)
         except Exception as e:
             print(f"默认字体加载失败: {e}")
             raise Exception("无法加载任何字体")
     
     def load_background(self):
         """初始化背景系统，支持轮播和渐变过渡"""
+        # 重新初始化时停止旧的动态背景解码线程
+        if getattr(self, "animated_background", None) is not None:
+            self.animated_background.stop()
+        
         # 背景轮播相关属性
-        self.background_images = []
+        self.wallpapers = WallpaperPrefetcher([], self.base_render_size)
         self.current_bg_index = 0
         self.next_bg_index = 0
         self.background_transition_time = 0
         self.background_duration = self.config.get("desktop.background_duration", 10000)  # 10秒
         self.transition_duration = self.config.get("desktop.transition_duration", 2000)   # 2秒过渡
+        # 过渡开始时预先合成的中间帧数，0表示逐帧实时混合
+        self.transition_frames = max(0, int(self.config.get("desktop.transition_frames", 0)))
         self.last_bg_change = pygame.time.get_ticks()
         
         # 当前背景和下一个背景的Surface
-        self.current_background = pygame.Surface((self.screen_width, self.screen_height))
-        self.next_background = pygame.Surface((self.screen_width, self.screen_height))
+        self.current_background = self._new_background_surface()
+        self.next_background = self._new_background_surface()
+        # 对应的配置分辨率原图，内部渲染分辨率未降低时就是背景本身
+        self._current_source = self.current_background
+        self._next_source = self.next_background
+        
+        # 过渡混合用的缓冲区，在多次过渡之间复用，避免逐帧分配全屏Surface
+        self._blend_buffer = None
+        self._blend_alpha = None
+        self._transition_frames = []
+        self._transition_frames_ready = 0
         
-        # 加载所有可用的背景图片
+        # 动态背景（配置后代替静态背景轮播）
+        self.animated_background = self._create_animated_background()
+        
+        # 收集背景图片路径，只加载第一张可用的背景
         self._load_background_images()
         
         # 设置初始背景
-        if self.background_images:
-            self._set_background(0)
-        else:
+        if not self._set_background(0):
             self._create_gradient_background(self.current_background)
     
     def _load_background_images(self):
-        """加载所有可用的背景图片"""
-        bg_images = self.config.get("desktop.background_images", [])
+        """收集所有可用的背景图片路径（条目可以是目录），图片本身按需加载"""
+        bg_images = list(self.config.get("desktop.background_images", []))
         
         # 添加默认背景到列表
         default_bg = self.config.get("desktop.background_image", "assets/backgrounds/default.png")
         if default_bg not in bg_images:
             bg_images.insert(0, default_bg)
         
-        # 过滤存在的背景图片并加载
-        for img_path in bg_images:
-            path = Path(img_path)
-            if path.exists():
-                try:
-                    bg_image = pygame.image.load(str(path))
-                    scaled_image = pygame.transform.scale(bg_image, (self.screen_width, self.screen_height))
-                    self.background_images.append(scaled_image)
-                    print(f"背景图片加载成功: {path}")
-                except Exception as e:
-                    print(f"背景图片加载失败 {path}: {e}")
-        
-        if not self.background_images:
+        paths = expand_wallpaper_paths(bg_images)
+        cache = get_wallpaper_cache() if self.config.get("desktop.wallpaper_cache", True) else None
+        # 按配置的内部渲染分辨率解码和缓存，画质调节改变分辨率时不需要重新解码
+        self.wallpapers = WallpaperPrefetcher(paths, self.base_render_size, cache)
+        
+        if not paths:
             print("未找到可用的背景图片，将使用渐变背景")
     
     def _set_background(self, index):
-        """设置指定索引的背景"""
-        if 0 <= index < len(self.background_images):
-            self.current_background.blit(self.background_images[index], (0, 0))
-        else:
-            self._create_gradient_background(self.current_background)
+        """从指定索引开始加载第一张可用的背景作为当前背景，全部失败时返回False"""
+        count = len(self.wallpapers)
+        for offset in range(count):
+            candidate = (index + offset) % count
+            surface = self.wallpapers.load(candidate)
+            if surface is not None:
+                self._current_source = ingest(surface, "wallpaper", alpha=False)
+                self.current_background = self._fit_background(self._current_source)
+                self.current_bg_index = candidate
+                clear_blur_cache()
+                self._prefetch_next_background()
+                return True
+        if count:
+            print("未找到可用的背景图片，将使用渐变背景")
+        return False
+    
+    def _create_animated_background(self):
+        """根据 desktop.animated_background（帧目录或帧文件列表）创建动态背景"""
+        frames = self.config.get("desktop.animated_background")
+        if not frames:
+            return None
+        if isinstance(frames, str):
+            frames = [frames]
+        paths = expand_wallpaper_paths(frames)
+        if not paths:
+            print(f"动态背景没有可用的帧: {frames}")
+            return None
+        animated = AnimatedWallpaper(
+            paths,
+            (self.screen_width, self.screen_height),
+            fps=self.config.get("desktop.animated_background_fps", DEFAULT_FPS),
+            buffer_frames=self.config.get("desktop.animated_background_buffer", DEFAULT_BUFFER_FRAMES)
+        )
+        animated.start()
+        print(f"动态背景: {len(paths)} 帧")
+        return animated
+    
+    def _has_rotation(self):
+        """是否有多张背景需要轮播"""
+        return self.animated_background is None and len(self.wallpapers) > 1
+    
+    def _prefetch_next_background(self):
+        """在后台预取下一张背景，同时释放其他已预取的背景"""
+        if not self._has_rotation():
+            return
+        self.next_bg_index = (self.current_bg_index + 1) % len(self.wallpapers)
+        self.wallpapers.request(self.next_bg_index)
+    
+    def _next_background_ready(self):
+        """下一张背景是否已预取完成（失败的背景会被跳过并预取再下一张）"""
+        for _ in range(len(self.wallpapers)):
+            if self.next_bg_index == self.current_bg_index:
+                return False
+            if self.wallpapers.is_failed(self.next_bg_index):
+                self.next_bg_index = (self.next_bg_index + 1) % len(self.wallpapers)
+                self.wallpapers.request(self.next_bg_index)
+                continue
+            return not self.wallpapers.is_pending(self.next_bg_index)
+        return False
+    
+    def on_wallpaper_loaded(self, event):
+        """背景预取完成事件（主线程调用），唤醒后由 update_background 开始过渡"""
+        if event.index != self.next_bg_index:
+            return
+        if self.wallpapers.is_failed(event.index):
+            # 跳过失败的背景
+            self._next_background_ready()
     
     def _create_gradient_background(self, surface):
         """创建渐变背景"""
-        for y in range(self.screen_height):
-            color_value = int(20 + (y / self.screen_height) * 60)
-            color = (color_value, color_value, color_value + 20)
-            pygame.draw.line(surface, color, (0, y), (self.screen_width, y))
-    
-    def _ease_in_out_cubic(self, t):
-        """缓入缓出三次方函数"""
-        if t < 0.5:
-            return 4 * t * t * t
-        else:
-            p = 2 * t - 2
-            return 1 + p * p * p / 4
+        gradient = vertical_gradient((self.screen_width, self.screen_height), (20, 20, 40), (80, 80, 100))
+        surface.blit(gradient, (0, 0))
     
     def update_background(self):
         """更新背景轮播和过渡效果"""
-        if not self.background_images or len(self.background_images) <= 1:
+        if self.animated_background is not None:
+            # 动态背景的第一帧解码完成前先显示静态背景
+            frame = self.animated_background.update(pygame.time.get_ticks())
+            return frame if frame is not None else self.current_background
+        
+        if not self._has_rotation():
             return self.current_background
         
-        current_time = pygame.time.get_ticks()
+        current_time = self.animator.now()
         time_since_change = current_time - self.last_bg_change
         
-        # 检查是否需要开始过渡到下一个背景
-        if time_since_change >= self.background_duration and self.background_transition_time == 0:
+        # 检查是否需要开始过渡到下一个背景（下一张背景尚未预取完成时继续等待）
+        if (time_since_change >= self.background_duration and self.background_transition_time == 0
+                and self._next_background_ready()):
+            next_surface = self.wallpapers.take(self.next_bg_index)
+            if next_surface is None:
+                # 预取结果已被释放，重新预取
+                self.wallpapers.request(self.next_bg_index)
+                return self.current_background
             # 开始过渡
-            self.next_bg_index = (self.current_bg_index + 1) % len(self.background_images)
-            self._set_background_to_surface(self.next_background, self.next_bg_index)
+            self._next_source = ingest(next_surface, "wallpaper", alpha=False)
+            self.next_background = self._fit_background(self._next_source)
             self.background_transition_time = current_time
+            easing = self.style_manager.get_animation_timing("wallpaperTransition")[1]
+            self.animator.start("wallpaper", 0.0, 1.0, self.transition_duration, easing, current_time)
+            self._blend_alpha = None
+            self._precompute_transition_frames()
             print(f"开始背景过渡: {self.current_bg_index} -> {self.next_bg_index}")
         
         # 处理过渡动画
         if self.background_transition_time > 0:
             transition_elapsed = current_time - self.background_transition_time
             
-            if transition_elapsed >= self.transition_duration:
+            if transition_elapsed >= self.transition_duration or not self.crossfade_enabled:
                 # 过渡完成
                 self.current_bg_index = self.next_bg_index
-                self.current_background.blit(self.next_background, (0, 0))
+                self.current_background, self.next_background = self.next_background, self.current_background
+                self._current_source, self._next_source = self._next_source, self._current_source
                 self.background_transition_time = 0
+                self.animator.stop("wallpaper")
                 self.last_bg_change = current_time
+                clear_blur_cache()
                 print(f"背景过渡完成，当前背景: {self.current_bg_index}")
+                self._prefetch_next_background()
             else:
-                # 计算过渡进度 (0.0 到 1.0)
-                progress = transition_elapsed / self.transition_duration
-                eased_progress = self._ease_in_out_cubic(progress)
+                # 按时间计算缓动后的过渡进度 (0.0 到 1.0)
+                eased_progress = self.animator.progress("wallpaper", current_time)
                 
-                # 创建混合背景
+                if self._transition_frames_ready:
+                    # 使用预先合成的中间帧
+                    count = self._transition_frames_ready
+                    index = min(count - 1, int(eased_progress * (count + 1)) - 1)
+                    if index < 0:
+                        return self.current_background
+                    return self._transition_frames[index]
+                
+                # 混合到复用的缓冲区
                 blended_bg = self._blend_backgrounds(
                     self.current_background, 
                     self.next_background, 
@@ -260,29 +524,87 @@ class Renderer:
         
         return self.current_background
     
-    def _set_background_to_surface(self, surface, index):
-        """将指定索引的背景设置到指定surface"""
-        if 0 <= index < len(self.background_images):
-            surface.blit(self.background_images[index], (0, 0))
-        else:
-            self._create_gradient_background(surface)
+    def is_animating(self):
+        """是否有需要逐帧刷新的动画（背景过渡、选中高亮）"""
+        return self.background_transition_time > 0 or self.animator.is_active()
+    
+    def backdrop_key(self, apps, selected_app):
+        """描述当前桌面画面（render_background_only 的结果）的内容键
+        
+        模态背景按它复用模糊结果；背景过渡、选中高亮动画或动态背景播放中
+        画面在变化，返回None。
+        """
+        if self.is_animating() or self.animated_background is not None:
+            return None
+        return (self.current_bg_index, self.screen.get_size(), selected_app,
+                [dict(app) for app in apps], self._icon_generation,
+                get_text_cache().generation, self.style_manager.version,
+                self.show_unselected_labels)
     
-    def _blend_backgrounds(self, bg1, bg2, alpha):
-        """混合两个背景，alpha为0-1之间的值"""
-        # 创建临时surface用于混合
-        blended = pygame.Surface((self.screen_width, self.screen_height))
+    def next_background_deadline(self):
+        """下一次背景切换的时间点，不轮播时返回None
         
-        # 先绘制第一个背景
-        blended.blit(bg1, (0, 0))
+        时间点已过但下一张背景仍在预取时也返回None，由预取完成事件唤醒主循环。
+        播放动态背景时返回下一帧的时间点。
+        """
+        if self.animated_background is not None:
+            return self.animated_background.next_deadline()
+        if not self._has_rotation():
+            return None
+        deadline = self.last_bg_change + self.background_duration
+        if deadline <= pygame.time.get_ticks() and self.background_transition_time == 0 \
+                and not self._next_background_ready():
+            return None
+        return deadline
+    
+    def _new_background_surface(self):
+        """创建一张与屏幕格式相同的全屏Surface"""
+        return ingest(pygame.Surface((self.screen_width, self.screen_height)), "background")
+    
+    def _blend_backgrounds(self, bg1, bg2, alpha, target=None):
+        """混合两个背景，alpha为0-1之间的值
+        
+        结果写入target（默认为复用的混合缓冲区）并返回，不分配新的Surface。
+        混合缓冲区的内容在下一次调用时会被覆盖。
+        """
+        alpha_value = max(0, min(255, int(255 * alpha)))
+        if target is None:
+            if self._blend_buffer is None or self._blend_buffer.get_size() != bg1.get_size():
+                self._blend_buffer = self._new_background_surface()
+                self._blend_alpha = None
+            target = self._blend_buffer
+            # 透明度取整后与上一帧相同时直接复用
+            if alpha_value == self._blend_alpha:
+                return target
+            self._blend_alpha = alpha_value
+        
+        # 先绘制第一个背景，再以整体透明度叠加第二个背景
+        target.blit(bg1, (0, 0))
+        bg2.set_alpha(alpha_value)
+        target.blit(bg2, (0, 0))
+        bg2.set_alpha(None)
         
-        # 创建带透明度的第二个背景
-        temp_surface = bg2.copy()
-        temp_surface.set_alpha(int(255 * alpha))
+        return target
+    
+    def _precompute_transition_frames(self):
+        """过渡开始时一次性合成所有中间帧（desktop.transition_frames > 0 时）
+        
+        中间帧的Surface在多次过渡之间复用，只在首次或屏幕尺寸变化时分配。
+        """
+        self._transition_frames_ready = 0
+        count = self.transition_frames
+        if count <= 0:
+            return
         
-        # 混合绘制
-        blended.blit(temp_surface, (0, 0))
+        size = self.current_background.get_size()
+        if len(self._transition_frames) != count or self._transition_frames[0].get_size() != size:
+            self._transition_frames = [self._new_background_surface() for _ in range(count)]
         
-        return blended
+        for i, frame in enumerate(self._transition_frames):
+            # 中间帧均匀分布在缓动后的进度上，两端由当前和下一张背景本身表示
+            self._blend_backgrounds(self.current_background, self.next_background,
+                                    (i + 1) / (count + 1), target=frame)
+        self._transition_frames_ready = count
     
     def calculate_positions(self, app_count):
         """计算应用图标位置"""
@@ -297,8 +619,14 @@ class Renderer:
             positions.append((x, y))
         return positions
     
-    def draw_app_icon(self, app, position, is_selected):
-        """绘制应用图标"""
+    def draw_app_icon(self, app, position, is_selected, surface=None, highlight=None):
+        """绘制应用图标，surface为None时绘制到屏幕
+        
+        highlight 为图块背景和边框的选中程度（0为未选中样式，1为选中样式），
+        None时按 is_selected 取0或1；选中切换动画期间取中间值。
+        """
+        if surface is None:
+            surface = self.screen
         x, y = position
         
         # 从样式管理器获取桌面样式配置
@@ -311,186 +639,544 @@ class Renderer:
         selected_color = background_style.get("selected", [150, 200, 255])
         border_normal = background_style.get("border_color", {}).get("normal", [128, 128, 128])
         border_selected = background_style.get("border_color", {}).get("selected", [255, 255, 255])
-        border_width_normal = background_style.get("border_width", {}).get("normal", 2)
-        border_width_selected = background_style.get("border_width", {}).get("selected", 4)
-        border_radius = background_style.get("border_radius", 20)
+        border_width_normal = background_style.get("border_width", {}).get("normal", self._px(2))
+        border_width_selected = background_style.get("border_width", {}).get("selected", self._px(4))
+        border_radius = background_style.get("border_radius", self._px(20))
         
-        # 图标背景
-        color = self.style_manager.get_color(selected_color) if is_selected else self.style_manager.get_color(normal_color)
-        border_color = self.style_manager.get_color(border_selected) if is_selected else self.style_manager.get_color(border_normal)
-        border_width = border_width_selected if is_selected else border_width_normal
+        # 图标背景（按选中程度在未选中和选中样式之间插值）
+        if highlight is None:
+            highlight = 1.0 if is_selected else 0.0
+        get_color = self.style_manager.get_color
+        color = lerp_color(get_color(normal_color), get_color(selected_color), highlight)
+        border_color = lerp_color(get_color(border_normal), get_color(border_selected), highlight)
+        border_width = max(0, round(lerp(border_width_normal, border_width_selected, highlight)))
         
         # 绘制圆角矩形背景
         icon_rect = pygame.Rect(x, y, self.icon_size, self.icon_size)
-        pygame.draw.rect(self.screen, color, icon_rect, border_radius=border_radius)
-        pygame.draw.rect(self.screen, border_color, icon_rect, border_width, border_radius=border_radius)
+        pygame.draw.rect(surface, color, icon_rect, border_radius=border_radius)
+        pygame.draw.rect(surface, border_color, icon_rect, border_width, border_radius=border_radius)
         
         # 尝试绘制图片图标
         icon_image_path = app.get("icon_image")
-        if icon_image_path and self._draw_icon_image(icon_image_path, x, y):
+        if icon_image_path and self._draw_icon_image(icon_image_path, x, y, is_selected, surface):
             # 图片图标绘制成功，不需要绘制文字图标
             pass
         else:
             # 绘制文字图标作为备选
-            icon_text = self.large_font.render(app["icon_text"], True, self.WHITE)
-            text_rect = icon_text.get_rect(center=(x + self.icon_size // 2, y + self.icon_size // 2))
-            self.screen.blit(icon_text, text_rect)
+            blit_text(surface, self.large_font, app["icon_text"], self.WHITE,
+                      center=(x + self.icon_size // 2, y + self.icon_size // 2))
         
         # 绘制应用名称（调整位置和字体大小，支持emoji）
-        if isinstance(app["name"], str) and app["name"].startswith("️"):
-            # 处理emoji占位逻辑
-            emoji_text = self.small_font.render(app["name"], True, self.WHITE)
-            emoji_rect = emoji_text.get_rect(center=(x + self.icon_size // 2, y + self.icon_size // 2 - 5))
-            self.screen.blit(emoji_text, emoji_rect)
-        else:
-            # 正常文字绘制
-            name_text = self.medium_font.render(app["name"], True, self.WHITE)
-            name_rect = name_text.get_rect(center=(x + self.icon_size // 2, y + self.icon_size // 2 + 15))
-            self.screen.blit(name_text, name_rect)
+        # 画质调节器可能要求隐藏未选中图块的文字
+        if is_selected or self.show_unselected_labels:
+            if isinstance(app["name"], str) and app["name"].startswith("️"):
+                # 处理emoji占位逻辑
+                blit_text(surface, self.small_font, app["name"], self.WHITE,
+                          center=(x + self.icon_size // 2, y + self.icon_size // 2 - self._px(5)))
+            else:
+                # 正常文字绘制
+                blit_text(surface, self.medium_font, app["name"], self.WHITE,
+                          center=(x + self.icon_size // 2, y + self.icon_size // 2 + self._px(15)))
         
         # 如果选中，显示描述
         if is_selected:
-            desc_text = self.small_font.render(app["description"], True, self.WHITE)
-            desc_rect = desc_text.get_rect(center=(x + self.icon_size // 2, y + self.icon_size + 65))
-            self.screen.blit(desc_text, desc_rect)
+            blit_text(surface, self.small_font, app["description"], self.WHITE,
+                      center=(x + self.icon_size // 2, y + self.icon_size + self._px(65)))
     
-    def _draw_icon_image(self, icon_path, x, y):
-        """绘制图片图标"""
-        try:
-            icon_surface = None
-            
-            # 检查是否是SVG文件
-            if icon_path.lower().endswith('.svg'):
-                icon_surface = self._load_svg_icon(icon_path)
-            else:
-                # 加载普通图片
-                icon_surface = pygame.image.load(icon_path)
-            
-            if not icon_surface:
-                return False
-            
-            # 计算缩放尺寸，保持图标在背景框内，留出边距
-            icon_margin = 20  # 图标与背景框的边距
-            target_size = self.icon_size - icon_margin * 2
-            
-            # 获取原始尺寸
-            original_width, original_height = icon_surface.get_size()
-            
-            # 计算缩放比例，保持宽高比
-            scale_x = target_size / original_width
-            scale_y = target_size / original_height
-            scale = min(scale_x, scale_y)
-            
-            # 计算新尺寸
-            new_width = int(original_width * scale)
-            new_height = int(original_height * scale)
-            
-            # 缩放图片
-            scaled_icon = pygame.transform.scale(icon_surface, (new_width, new_height))
-            
-            # 计算居中位置
-            icon_x = x + (self.icon_size - new_width) // 2
-            icon_y = y + (self.icon_size - new_height) // 2
-            
-            # 绘制图标
-            self.screen.blit(scaled_icon, (icon_x, icon_y))
-            
+    def _icon_target_size(self):
+        """图标图片的目标尺寸，保持图标在背景框内，留出边距"""
+        return self.style_manager.get_app_icon_image_size()
+    
+    def set_apps(self, apps):
+        """应用列表变化时同步图标图集，只打包新增的图标、释放移除的图标"""
+        self._apps = apps
+        if self.icon_atlas is None:
+            return
+        
+        target_size = self._icon_target_size()
+        keys = set()
+        for app in apps:
+            icon_path = app.get("icon_image")
+            if icon_path:
+                key = self.icon_cache.make_key(icon_path, target_size, ICON_VARIANT_NORMAL)
+                if key is not None:
+                    keys.add(key)
+        self._atlas_paths = {key[0] for key in keys}
+        self.icon_atlas.retain(keys)
+        
+        # 已解码的图标直接打包，其余等待异步加载完成
+        ready = []
+        for key in keys - self.icon_atlas.keys():
+            surface = self.icon_cache.get(key)
+            if surface is not None:
+                ready.append((key, surface))
+        if len(self.icon_atlas) == 0:
+            self.icon_atlas.build(ready)
+        else:
+            for key, surface in ready:
+                self.icon_atlas.add(key, surface)
+        for key, _ in ready:
+            if key in self.icon_atlas:
+                self.icon_cache.discard(key)
+    
+    def request_icons(self, apps, selected_app):
+        """按与选中项的距离排序请求加载图标，选中项及其相邻项优先"""
+        count = len(apps)
+        target_size = self._icon_target_size()
+        for i, app in enumerate(apps):
+            icon_path = app.get("icon_image")
+            if not icon_path:
+                continue
+            key = self.icon_cache.make_key(icon_path, target_size, ICON_VARIANT_NORMAL)
+            if self.icon_cache.is_failed(key) or self._has_icon(key):
+                continue
+            distance = abs(i - selected_app)
+            distance = min(distance, count - distance)
+            self.icon_loader.request(key, priority=distance)
+    
+    def on_icon_loaded(self, event):
+        """处理图标加载完成事件（主线程）"""
+        self.icon_loader.complete(event.key)
+        if event.surface is not None:
+            self.icon_cache.put(event.key, event.surface)
+            # 当前应用列表中的图标放入图集
+            if self.icon_atlas is not None and event.key[0] in self._atlas_paths:
+                surface = self.icon_cache.get(event.key)
+                if surface is not None and self.icon_atlas.add(event.key, surface):
+                    self.icon_cache.discard(event.key)
+        elif event.error:
+            self.icon_cache.mark_failed(event.key, event.error)
+        # 使用该图标的图块需要重绘（加载失败时改为文字图标）
+        self._icon_generation += 1
+        self._dirty_icon_paths.add(event.key[0])
+        self._invalidate_icon_layers(event.key[0])
+    
+    def _draw_icon_image(self, icon_path, x, y, is_selected=False, surface=None):
+        """绘制图片图标，尚未加载完成时请求异步加载并返回False"""
+        if surface is None:
+            surface = self.screen
+        target_size = self._icon_target_size()
+        variant = ICON_VARIANT_SELECTED if is_selected else ICON_VARIANT_NORMAL
+        
+        normal_key = self.icon_cache.make_key(icon_path, target_size, ICON_VARIANT_NORMAL)
+        if self.icon_cache.is_failed(normal_key):
+            return False
+        
+        # 优先从图集绘制子矩形
+        region = self.icon_atlas.get(normal_key) if self.icon_atlas is not None else None
+        if region is not None:
+            atlas_surface, area = region
+            icon_x = x + (self.icon_size - area.width) // 2
+            icon_y = y + (self.icon_size - area.height) // 2
+            surface.blit(atlas_surface, (icon_x, icon_y), area)
             return True
-            
-        except Exception as e:
-            print(f"加载图标失败 {icon_path}: {e}")
+        
+        scaled_icon = self.icon_cache.get(normal_key[:3] + (variant,))
+        if scaled_icon is None:
+            # 后台只加载普通变体，其他变体由缓存派生
+            if not self.icon_loader.is_pending(normal_key):
+                self.icon_loader.request(normal_key)
             return False
+        
+        # 计算居中位置
+        new_width, new_height = scaled_icon.get_size()
+        icon_x = x + (self.icon_size - new_width) // 2
+        icon_y = y + (self.icon_size - new_height) // 2
+        
+        # 绘制图标
+        surface.blit(scaled_icon, (icon_x, icon_y))
+        return True
     
-    def _load_svg_icon(self, svg_path):
-        """加载SVG图标并转换为pygame surface"""
-        try:
-            import cairosvg
-            import io
-            from PIL import Image
-            
-            # 将SVG转换为PNG数据，设置超时
-            png_data = cairosvg.svg2png(
-                url=svg_path, 
-                output_width=128, 
-                output_height=128,
-                unsafe=True  # 允许不安全的SVG
-            )
-            
-            # 使用PIL加载PNG数据
-            pil_image = Image.open(io.BytesIO(png_data))
-            
-            # 转换为RGBA模式
-            if pil_image.mode != 'RGBA':
-                pil_image = pil_image.convert('RGBA')
-            
-            # 转换为pygame surface
-            pygame_image = pygame.image.fromstring(
-                pil_image.tobytes(), pil_image.size, 'RGBA'
-            )
-            
-            return pygame_image
-            
-        except Exception as e:
-            print(f"SVG图标加载失败 {svg_path}: {e}")
-            # 尝试寻找同名的PNG图标
-            png_path = svg_path.replace('.svg', '.png')
-            if Path(png_path).exists():
-                try:
-                    return pygame.image.load(png_path)
-                except:
-                    pass
-            return None
+    def _has_icon(self, key):
+        """图标是否已在图集或缓存中"""
+        if self.icon_atlas is not None and key in self.icon_atlas:
+            return True
+        return self.icon_cache.get(key) is not None
     
-    def draw_instructions(self):
-        """绘制操作说明"""
-        instructions = [
-            "使用方向键或手柄左摇杆选择应用",
-            "按确认键(A键/回车)启动应用",
-            "按Tab键或Y键打开设置",
-            "按Del键删除选中的应用",
-            "按ESC键退出桌面"
-        ]
+    def _load_icon_surface(self, icon_path, size):
+        """加载原始图标图片，SVG按目标尺寸栅格化"""
+        # 检查是否是SVG文件
+        if icon_path.lower().endswith('.svg'):
+            return self._load_svg_icon(icon_path, size)
+        # 加载普通图片
+        return pygame.image.load(icon_path)
+    
+    def _load_svg_icon(self, svg_path, size):
+        """加载SVG图标的栅格化缓存（渲染时不调用cairosvg）"""
+        png_path = get_svg_cache().lookup(svg_path, size)
+        if png_path:
+            return pygame.image.load(png_path)
+        
+        # 正在后台栅格化，先显示文字图标
+        if not get_svg_cache().is_failed(svg_path, size):
+            raise IconNotReady(svg_path)
         
-        y_start = self.screen_height - 180
-        for i, instruction in enumerate(instructions):
-            text = self.small_font.render(instruction, True, self.WHITE)
-            text_rect = text.get_rect(center=(self.screen_width // 2, y_start + i * 25))
-            self.screen.blit(text, text_rect)
+        # 栅格化失败时尝试寻找同名的PNG图标
+        png_path = svg_path.replace('.svg', '.png')
+        if Path(png_path).exists():
+            try:
+                return pygame.image.load(png_path)
+            except:
+                pass
+        return None
+    
+    def draw_instructions(self, surface=None, offset=(0, 0)):
+        """绘制操作说明，offset为surface左上角的屏幕坐标"""
+        if surface is None:
+            surface = self.screen
+        y_start = self.screen_height - self._px(180)
+        for i, instruction in enumerate(self.INSTRUCTIONS):
+            blit_text(surface, self.small_font, instruction, self.WHITE,
+                      center=(self.screen_width // 2 - offset[0], y_start + i * self._px(25) - offset[1]))
     
     def render_frame(self, apps, selected_app, title="", show_title=True):
         """渲染一帧"""
         self._render_desktop_content(apps, selected_app, title, show_title)
         
         # 更新显示
-        pygame.display.flip()
+        self.present()
     
     def render_background_only(self, apps, selected_app, title="", show_title=False):
         """只渲染桌面内容，不刷新显示（用于设置页面背景）"""
         self._render_desktop_content(apps, selected_app, title, show_title)
+        self.invalidate()
     
     def _render_desktop_content(self, apps, selected_app, title="", show_title=True):
         """渲染桌面内容（不包含显示刷新）"""
-        # 更新并绘制背景（包含轮播和过渡效果）
+        # 更新背景（包含轮播和过渡效果）
         current_bg = self.update_background()
-        self.screen.blit(current_bg, (0, 0))
+        self._prepare_apps(apps, selected_app)
+        self._draw_desktop(current_bg, apps, selected_app, title, show_title)
+    
+    def _prepare_apps(self, apps, selected_app):
+        """同步图标图集并请求加载图标"""
+        # 应用列表变化时同步图标图集
+        if apps is not self._apps:
+            self.set_apps(apps)
+        
+        # 按优先级请求尚未加载的图标
+        self.request_icons(apps, selected_app)
+        self._update_selection(selected_app)
+    
+    def _update_selection(self, selected_app):
+        """选中项变化时开始高亮过渡，并取得本帧的高亮进度"""
+        now = self.animator.now()
+        if selected_app != self._selection_target:
+            if self._selection_target is not None:
+                duration, easing = self.style_manager.get_animation_timing("selection")
+                self.animator.start("selection", 0.0, 1.0, duration * 1000, easing, now)
+                self._selection_from = self._selection_target
+            self._selection_target = selected_app
+        
+        self._highlight = self.animator.value("selection", 1.0, now)
+        if not self.animator.is_active("selection"):
+            # 过渡结束（本帧以结束状态绘制）
+            self._selection_from = None
+    
+    def _fading_selection(self, apps, selected_app):
+        """正在淡出选中样式的上一个选中项，没有时返回None"""
+        index = self._selection_from
+        if index is None or index == selected_app or not 0 <= index < len(apps):
+            return None
+        return index
+    
+    def _draw_desktop(self, current_bg, apps, selected_app, title="", show_title=True):
+        """绘制背景、图标和操作说明"""
+        self._draw_background(current_bg)
+        
+        if self.layers is not None:
+            self._draw_desktop_layers(apps, selected_app, title if show_title else "")
+            return
         
         # 绘制标题（如果需要）
         if show_title and title:
-            title_text = self.large_font.render(title, True, self.WHITE)
-            title_rect = title_text.get_rect(center=(self.screen_width // 2, 100))
-            self.screen.blit(title_text, title_rect)
+            blit_text(self.screen, self.large_font, title, self.WHITE,
+                      center=(self.screen_width // 2, self._px(100)))
         
         # 计算图标位置
         positions = self.calculate_positions(len(apps))
         
-        # 绘制应用图标
+        # 绘制应用图标（选中切换过渡期间新旧选中项按进度插值）
+        fading = self._fading_selection(apps, selected_app)
         for i, app in enumerate(apps):
             is_selected = (i == selected_app)
-            self.draw_app_icon(app, positions[i], is_selected)
+            if is_selected:
+                highlight = self._highlight
+            elif i == fading:
+                highlight = 1.0 - self._highlight
+            else:
+                highlight = None
+            self.draw_app_icon(app, positions[i], is_selected, highlight=highlight)
         
         # 绘制操作说明
         self.draw_instructions()
     
+    def _draw_background(self, current_bg):
+        """绘制桌面背景"""
+        self.screen.blit(current_bg, (0, 0))
+    
+    def flatten_background(self):
+        """确保背景已绘制进 screen（截取画面前调用，软件渲染时背景总是已绘制）"""
+    
+    def _draw_desktop_layers(self, apps, selected_app, title):
+        """用缓存图层绘制桌面：标题、未选中图块条、实时绘制的选中图块、操作说明"""
+        # 应用列表、语言或样式变化时所有图层失效
+        version = (get_text_cache().generation, self.style_manager.version)
+        if apps is not self._layer_apps or version != self._layer_version:
+            self.layers.clear()
+            self._layer_apps = apps
+            self._layer_version = version
+        
+        positions = self.calculate_positions(len(apps))
+        
+        if title:
+            title_layer = self.layers.get("title", title, lambda: self._build_title_layer(title))
+            title_layer.draw(self.screen)
+        
+        # 选中切换过渡期间，上一个选中项也不放进图块条，与选中项一起实时绘制
+        fading = self._fading_selection(apps, selected_app)
+        strip = self.layers.get("strip", (selected_app, fading),
+                                lambda: self._build_strip_layer(apps, positions, (selected_app, fading)))
+        if strip is not None:
+            strip.draw(self.screen)
+        
+        if fading is not None:
+            self.draw_app_icon(apps[fading], positions[fading], False, highlight=1.0 - self._highlight)
+        if 0 <= selected_app < len(apps):
+            self.draw_app_icon(apps[selected_app], positions[selected_app], True, highlight=self._highlight)
+        
+        self.layers.get("instructions", None, self._build_instructions_layer).draw(self.screen)
+    
+    def _build_title_layer(self, title):
+        """标题图层"""
+        title_rect = text_rect(self.large_font, title, center=(self.screen_width // 2, self._px(100)))
+        layer = Layer(title_rect)
+        blit_text(layer.surface, self.large_font, title, self.WHITE, topleft=(0, 0))
+        return self._finish_layer(layer)
+    
+    def _build_instructions_layer(self):
+        """操作说明图层"""
+        y_start = self.screen_height - self._px(180)
+        bounds = None
+        for i, instruction in enumerate(self.INSTRUCTIONS):
+            rect = text_rect(self.small_font, instruction,
+                             center=(self.screen_width // 2, y_start + i * self._px(25)))
+            bounds = rect if bounds is None else bounds.union(rect)
+        layer = Layer(bounds)
+        self.draw_instructions(layer.surface, layer.rect.topleft)
+        return self._finish_layer(layer)
+    
+    def _build_strip_layer(self, apps, positions, excluded):
+        """未选中图块条：由各图块的缓存图层合成，excluded 中的图块（选中项）留空"""
+        screen_rect = self.screen.get_rect()
+        tiles = []
+        for i, app in enumerate(apps):
+            if i in excluded:
+                continue
+            tile = self.layers.get(("tile", i), None,
+                                   lambda: self._build_tile_layer(app, positions[i]))
+            if tile.rect.colliderect(screen_rect):
+                tiles.append(tile)
+        if not tiles:
+            return None
+        
+        bounds = tiles[0].rect.unionall([tile.rect for tile in tiles[1:]]).clip(screen_rect)
+        strip = Layer(bounds)
+        # 预乘时空图块条直接标记为预乘（全透明像素预乘前后相同），图块按预乘叠加，
+        # 避免合成后再预乘一次使透明度被计算两次
+        strip.premultiplied = self.premultiplied_layers
+        for tile in tiles:
+            strip.compose(tile)
+        return strip
+    
+    def _finish_layer(self, layer):
+        """图层内容绘制完成（按配置预乘透明度）"""
+        if self.premultiplied_layers:
+            layer.premultiply()
+        return layer
+    
+    def _build_tile_layer(self, app, position):
+        """单个未选中图块的图层"""
+        layer = Layer(self._tile_footprint(app, position, False))
+        self.draw_app_icon(app, layer.to_local(position), False, layer.surface)
+        return layer
+    
+    def _invalidate_icon_layers(self, icon_path):
+        """图标加载完成后，使用该图标的图块图层失效"""
+        if self.layers is None or self._layer_apps is None:
+            return
+        changed = False
+        for i, app in enumerate(self._layer_apps):
+            if app.get("icon_image") == icon_path:
+                self.layers.invalidate(("tile", i))
+                changed = True
+        if changed:
+            self.layers.invalidate("strip")
+    
+    def invalidate(self):
+        """下一帧整屏重绘（切换视图等情况）"""
+        self._full_redraw = True
+    
+    def render_desktop_dirty(self, apps, selected_app, overlay=None, overlay_state=None, overlay_bounds=None):
+        """按脏矩形渲染桌面，返回需要提交的区域列表，None表示整屏刷新
+        
+        overlay为绘制在桌面之上的回调（如确认对话框），overlay_state变化时
+        只重绘overlay_bounds区域；overlay出现或消失时整屏重绘。
+        """
+        current_bg = self.update_background()
+        self._prepare_apps(apps, selected_app)
+        
+        frame = {
+            "apps": apps,
+            "selected": selected_app,
+            "highlight": (self._selection_from, self._highlight),
+            "background": (self.current_bg_index, self.background_transition_time,
+                           self.animated_background.frame_number() if self.animated_background else None),
+            "text_generation": get_text_cache().generation,
+            "overlay_visible": overlay is not None,
+            "overlay_state": overlay_state,
+        }
+        last = self._last_frame
+        self._last_frame = frame
+        
+        full = (
+            self._full_redraw
+            or last is None
+            or self.background_transition_time > 0
+            or any(frame[name] != last[name] for name in ("background", "text_generation", "overlay_visible"))
+            or apps is not last["apps"]
+        )
+        if full:
+            self._full_redraw = False
+            self._dirty_icon_paths.clear()
+            self._draw_desktop(current_bg, apps, selected_app, show_title=False)
+            if overlay is not None:
+                overlay()
+            return None
+        
+        rects = []
+        positions = self.calculate_positions(len(apps))
+        if selected_app != last["selected"] or frame["highlight"] != last["highlight"]:
+            # 新旧选中项（包括过渡中淡出的上一个选中项）
+            indices = {last["selected"], selected_app, last["highlight"][0], self._selection_from}
+            for index in sorted(index for index in indices if index is not None):
+                if 0 <= index < len(apps):
+                    # 以选中状态计算占用区域，覆盖描述文字和选中边框
+                    rects.append(self._tile_footprint(apps[index], positions[index], True))
+        if self._dirty_icon_paths:
+            for i, app in enumerate(apps):
+                if app.get("icon_image") in self._dirty_icon_paths:
+                    rects.append(pygame.Rect(positions[i], (self.icon_size, self.icon_size)))
+            self._dirty_icon_paths.clear()
+        if overlay is not None and overlay_state != last["overlay_state"] and overlay_bounds is not None:
+            rects.append(pygame.Rect(overlay_bounds))
+        
+        screen_rect = self.screen.get_rect()
+        rects = [rect.clip(screen_rect) for rect in rects]
+        rects = [rect for rect in rects if rect.width > 0 and rect.height > 0]
+        
+        # 在裁剪区域内重绘完整的桌面层次，保证与整屏绘制的结果一致
+        for rect in rects:
+            self.screen.set_clip(rect)
+            self._draw_desktop(current_bg, apps, selected_app, show_title=False)
+            if overlay is not None:
+                overlay()
+        self.screen.set_clip(None)
+        return rects
+    
+    def _tile_footprint(self, app, position, is_selected):
+        """图块绘制时占用的屏幕区域（包括超出图块的名称和描述文字）"""
+        x, y = position
+        center_x = x + self.icon_size // 2
+        layout = get_text_layout()
+        footprint = pygame.Rect(x, y, self.icon_size, self.icon_size)
+        
+        texts = [(self.medium_font, app["name"], y + self.icon_size // 2 + self._px(15))]
+        if is_selected:
+            texts.append((self.small_font, app["description"], y + self.icon_size + self._px(65)))
+        for font, text, center_y in texts:
+            text_rect = pygame.Rect(0, 0, layout.text_width(font, text), font.get_height())
+            text_rect.center = (center_x, center_y)
+            footprint.union_ip(text_rect)
+        
+        # 留出字形溢出和抗锯齿的余量
+        return footprint.inflate(8, 8)
+    
+    def present(self, rects=None):
+        """把绘制结果提交到屏幕，rects为None时整屏刷新"""
+        if self.screen is not self.display_surface:
+            if rects is not None and not rects:
+                return
+            # 内部分辨率渲染：缩放到显示Surface，有脏矩形时只缩放这些区域
+            if rects is None:
+                output_size = self.display_surface.get_size()
+                if self.render_scaling == "fast":
+                    pygame.transform.scale(self.screen, output_size, self.display_surface)
+                else:
+                    pygame.transform.smoothscale(self.screen, output_size, self.display_surface)
+            else:
+                rects = [self._present_scaled_rect(rect) for rect in rects]
+                rects = [rect for rect in rects if rect is not None]
+        
+        if rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
+    
+    def _present_scaled_rect(self, rect):
+        """把内部分辨率的一个区域缩放到显示Surface的对应区域，返回显示坐标的区域
+        
+        区域对齐到两种分辨率像素边界重合的位置，使局部缩放与整屏缩放的采样位置
+        一致；平滑缩放时源区域再向外多取一圈像素，只写回中间部分，
+        边缘的插值与整屏缩放取到相同的相邻像素。
+        """
+        bounds = self.screen.get_rect()
+        inner = self._align_to_output(pygame.Rect(rect)).clip(bounds)
+        if not inner.width or not inner.height:
+            return None
+        outer = inner
+        if self.render_scaling != "fast":
+            outer = self._align_to_output(inner.inflate(4, 4)).clip(bounds)
+        
+        target = self._to_output_rect(inner)
+        outer_target = self._to_output_rect(outer)
+        area = self.screen.subsurface(outer)
+        if self.render_scaling == "fast":
+            scaled = pygame.transform.scale(area, outer_target.size)
+        else:
+            scaled = pygame.transform.smoothscale(area, outer_target.size)
+        self.display_surface.blit(scaled, target, target.move(-outer_target.x, -outer_target.y))
+        return target
+    
+    def _align_to_output(self, rect):
+        """把内部坐标的区域向外扩展到与显示像素边界重合的位置
+        
+        两种分辨率的比例约分后分母过大（边界很少重合）时不对齐，局部缩放的
+        边缘可能与整屏缩放相差不到一个像素。
+        """
+        output_width, output_height = self.display_surface.get_size()
+        step_x = self.screen_width // math.gcd(self.screen_width, output_width)
+        step_y = self.screen_height // math.gcd(self.screen_height, output_height)
+        if step_x > 8 or step_y > 8:
+            return rect
+        left = rect.left - rect.left % step_x
+        top = rect.top - rect.top % step_y
+        right = -(-rect.right // step_x) * step_x
+        bottom = -(-rect.bottom // step_y) * step_y
+        return pygame.Rect(left, top, right - left, bottom - top)
+    
+    def _to_output_rect(self, rect):
+        """内部渲染坐标的区域换算为显示坐标（向外取整）"""
+        output_width, output_height = self.display_surface.get_size()
+        rect = pygame.Rect(rect)
+        left = rect.left * output_width // self.screen_width
+        top = rect.top * output_height // self.screen_height
+        right = -(-rect.right * output_width // self.screen_width)
+        bottom = -(-rect.bottom * output_height // self.screen_height)
+        return pygame.Rect(left, top, right - left, bottom - top)
+    
     def cleanup(self):
         """清理资源"""
+        self.icon_loader.shutdown()
+        print_ingest_stats()
         pygame.quit()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SDL2纹理渲染模块
+基于 pygame._sdl2.video 的渲染后端：背景以纹理保存，过渡混合和缩放由SDL渲染器完成
+"""
+
+import os
+
+import pygame
+
+from .renderer import Renderer
+
+try:
+    from pygame._sdl2.video import Window, Renderer as SDLRenderer, Texture
+except ImportError:
+    Window = SDLRenderer = Texture = None
+
+
+class TextureRenderer(Renderer):
+    """纹理渲染器
+
+    与 Renderer 接口相同。界面仍在CPU上绘制到内部分辨率的透明 screen，
+    提交时只把变化的区域上传到界面纹理；背景（当前和下一张、动态背景的当前帧）
+    各自保存为纹理，只在内容变化时上传。screen 的背景区域始终保持透明，
+    提交时先绘制背景纹理（过渡期间按透明度叠加两张），再叠加界面纹理并缩放到
+    窗口。硬件加速渲染器不可用时使用SDL软件渲染器。
+    """
+
+    def _init_display(self):
+        """创建SDL窗口和渲染器"""
+        if Window is None:
+            raise RuntimeError("当前pygame不支持 pygame._sdl2.video")
+
+        output_size, render_size = self._display_sizes()
+        self.output_size = output_size
+        self.window = Window(
+            self.config.get("desktop.title", "Flying Desktop"),
+            size=output_size,
+            fullscreen=self.config.get("desktop.fullscreen", True)
+        )
+        self.sdl_renderer = self._create_sdl_renderer()
+
+        self.display_surface = None
+        self.sdl_scaled = False
+        self._screen_texture = None
+        self._resize_screen(render_size)
+        self.screen_width, self.screen_height = self.screen.get_size()
+        self.base_render_size = (self.screen_width, self.screen_height)
+
+        # 背景纹理：名称 -> (Surface, 内容版本, 纹理)
+        self._background_textures = {}
+        # 本帧绘制在界面下面的背景Surface及其内容版本（None表示背景已绘制进screen）
+        self._frame_background = None
+        self._frame_background_version = None
+        # 本帧由GPU绘制的背景过渡进度（None表示没有过渡）
+        self._gpu_crossfade = None
+        self._pending_crossfade = None
+        # 表示"背景由GPU绘制"的占位Surface
+        self._gpu_background = pygame.Surface((1, 1))
+
+    def _create_sdl_renderer(self):
+        """优先使用硬件加速渲染器，失败时使用软件渲染器"""
+        vsync = self.config.get("display.vsync", True)
+        try:
+            renderer = SDLRenderer(self.window, accelerated=1, vsync=vsync)
+            print("SDL2纹理渲染后端: 硬件加速")
+            return renderer
+        except Exception as e:
+            print(f"硬件加速渲染器不可用，使用SDL软件渲染器: {e}")
+        return SDLRenderer(self.window, accelerated=0)
+
+    def _new_texture(self, size):
+        """创建可逐帧更新的纹理（缩放方式由创建时的SDL提示决定）"""
+        os.environ["SDL_RENDER_SCALE_QUALITY"] = "nearest" if self.render_scaling == "fast" else "linear"
+        texture = Texture(self.sdl_renderer, size, streaming=True)
+        texture.blend_mode = pygame.BLENDMODE_BLEND
+        return texture
+
+    def _resize_screen(self, size):
+        """重建透明的界面画布和对应的纹理"""
+        self.screen = pygame.Surface(size, pygame.SRCALPHA)
+        self.screen.fill((0, 0, 0, 0))
+        self._screen_texture = self._new_texture(size)
+        self._background_textures = {}
+
+    def load_background(self):
+        """背景过渡由GPU混合，不需要预先合成中间帧"""
+        super().load_background()
+        self.transition_frames = 0
+
+    def _blend_backgrounds(self, bg1, bg2, alpha, target=None):
+        """实时过渡时只记录进度，实际混合在提交时由SDL完成"""
+        if target is not None:
+            return super()._blend_backgrounds(bg1, bg2, alpha, target)
+        self._pending_crossfade = alpha
+        return self._gpu_background
+
+    def _draw_background(self, current_bg):
+        """背景区域清空为透明，记录提交时要在界面下面绘制的背景"""
+        self.screen.fill((0, 0, 0, 0))
+        if current_bg is self._gpu_background:
+            self._gpu_crossfade = self._pending_crossfade
+            self._frame_background = None
+        else:
+            self._gpu_crossfade = None
+            self._frame_background = current_bg
+            # 动态背景的帧在同一个Surface中原地更新，以帧号区分内容
+            animated = self.animated_background
+            self._frame_background_version = animated.frame_number() \
+                if animated is not None and current_bg is not self.current_background else None
+
+    def flatten_background(self):
+        """把背景用CPU合成进screen（截取画面用于模态背景前调用）"""
+        if self._gpu_crossfade is not None:
+            background = super()._blend_backgrounds(self.current_background, self.next_background, self._gpu_crossfade)
+            # 混合缓冲区将被修改，不能再按透明度复用
+            self._blend_alpha = None
+        elif self._frame_background is not None:
+            background = self._frame_background.copy()
+        else:
+            return
+        background.blit(self.screen, (0, 0))
+        self.screen.blit(background, (0, 0))
+        self._gpu_crossfade = None
+        self._frame_background = None
+
+    def _background_texture(self, name, surface, version=None):
+        """获取背景纹理，Surface或内容版本变化时重新上传"""
+        entry = self._background_textures.get(name)
+        if entry is None or entry[2].width != surface.get_width() or entry[2].height != surface.get_height():
+            entry = (None, None, self._new_texture(surface.get_size()))
+        if entry[0] is not surface or entry[1] != version:
+            entry[2].update(surface)
+            entry = (surface, version, entry[2])
+        self._background_textures[name] = entry
+        return entry[2]
+
+    def present(self, rects=None):
+        """上传变化的区域并由SDL合成、缩放到窗口"""
+        if rects is not None and not rects:
+            return
+
+        if rects is None:
+            self._screen_texture.update(self.screen)
+        else:
+            bounds = self.screen.get_rect()
+            for rect in rects:
+                area = pygame.Rect(rect).clip(bounds)
+                if area.width and area.height:
+                    self._screen_texture.update(self.screen.subsurface(area), area)
+
+        renderer = self.sdl_renderer
+        renderer.draw_color = (0, 0, 0, 255)
+        renderer.clear()
+        if self._gpu_crossfade is not None:
+            current = self._background_texture("current", self.current_background)
+            following = self._background_texture("next", self.next_background)
+            current.alpha = 255
+            current.draw()
+            following.alpha = max(0, min(255, int(255 * self._gpu_crossfade)))
+            following.draw()
+        elif self._frame_background is not None:
+            background = self._background_texture(
+                "current", self._frame_background, self._frame_background_version)
+            background.alpha = 255
+            background.draw()
+        self._screen_texture.draw()
+        renderer.present()
+
+
+def create_renderer(config):
+    """按 display.backend 创建渲染器："software"（默认）或 "sdl2"，失败时回退到软件渲染"""
+    if config.get("display.backend", "software") == "sdl2":
+        try:
+            return TextureRenderer(config)
+        except Exception as e:
+            print(f"SDL2纹理渲染后端初始化失败，使用软件渲染: {e}")
+    return Renderer(config)
@@ -10,6 +10,9 @@ from pathlib import Path
 from .font_detector import FontDetector
 from .file_browser import FileBrowser
 from .json_style_manager import get_style_manager
+from .text_cache import blit_text
+from .text_layout import get_text_layout
+from .draw_utils import vertical_gradient, translucent_panel, drop_shadow
 
 
 class SettingsPage:
@@ -82,6 +85,8 @@ class SettingsPage:
         self.selected_item = 0
         self.in_option_select = False
         self.selected_option = 0
+        # 下拉框阴影和渐变（画质调节器可关闭）
+        self.dropdown_effects = True
         
         # 从样式管理器获取颜色定义
         self.BLACK = (0, 0, 0)
@@ -312,16 +317,27 @@ class SettingsPage:
         overlay.fill((0, 0, 0))
         screen.blit(overlay, (0, 0))
         
+        self.render_panel(screen, font_large, font_medium, font_small)
+        
+        # 如果在文件浏览器模式，绘制文件浏览器
+        if self.in_file_browser and self.file_browser:
+            self.file_browser.render(screen, font_large, font_medium, font_small)
+    
+    def render_panel(self, screen, font_large, font_medium, font_small):
+        """渲染设置内容（不含背景遮罩和文件浏览器）"""
+        screen_width = screen.get_width()
+        screen_height = screen.get_height()
+        # 布局尺寸与字体一样按内部渲染分辨率缩放
+        px = self.style_manager.scaled
+        
         # 绘制设置标题
-        title_text = font_large.render(self.i18n.t('settings'), True, self.WHITE)
-        title_rect = title_text.get_rect(center=(screen_width // 2, 80))
-        screen.blit(title_text, title_rect)
+        blit_text(screen, font_large, self.i18n.t('settings'), self.WHITE, center=(screen_width // 2, px(80)))
         
         # 设置项布局参数
-        start_y = 160
-        item_height = 60
-        item_spacing = 8
-        content_width = min(800, screen_width - 200)
+        start_y = px(160)
+        item_height = px(60)
+        item_spacing = px(8)
+        content_width = min(px(800), screen_width - px(200))
         content_x = (screen_width - content_width) // 2
         
         # 记录下拉框信息
@@ -338,7 +354,7 @@ class SettingsPage:
             # 记录需要绘制下拉框的项目
             if is_selected and self.in_option_select and item['type'] not in ['toggle', 'action']:
                 dropdown_item = item
-                dropdown_y = y + item_height + 5
+                dropdown_y = y + item_height + px(5)
         
         # 绘制操作说明
         self._render_instructions(screen, font_small, screen_width, screen_height)
@@ -346,13 +362,10 @@ class SettingsPage:
         # 最后绘制下拉框（确保在最上层）
         if dropdown_item:
             self._render_dropdown(screen, font_small, dropdown_item, dropdown_y, content_x, content_width)
-        
-        # 如果在文件浏览器模式，绘制文件浏览器
-        if self.in_file_browser and self.file_browser:
-            self.file_browser.render(screen, font_large, font_medium, font_small)
     
     def _render_setting_item(self, screen, font, item, x, y, width, height, is_selected):
         """渲染单个设置项"""
+        px = self.style_manager.scaled
         # 背景颜色
         if is_selected:
             bg_color = (60, 100, 180, 200)  # 半透明蓝色
@@ -364,19 +377,17 @@ class SettingsPage:
             text_color = (220, 220, 220)
         
         # 绘制背景（使用半透明surface）
-        item_surface = pygame.Surface((width, height), pygame.SRCALPHA)
-        item_surface.fill(bg_color)
-        screen.blit(item_surface, (x, y))
+        screen.blit(translucent_panel((width, height), bg_color), (x, y))
         
         # 绘制边框
-        border_width = 2 if is_selected else 1
-        pygame.draw.rect(screen, border_color, (x, y, width, height), border_width, border_radius=8)
+        border_width = px(2) if is_selected else 1
+        pygame.draw.rect(screen, border_color, (x, y, width, height), border_width, border_radius=px(8))
         
         # 绘制美观的几何图标
         if 'icon' in item:
-            icon_x = x + 20
+            icon_x = x + px(20)
             icon_y = y + height // 2
-            icon_size = 8  # 图标尺寸
+            icon_size = px(8)  # 图标尺寸
             
             # 根据不同的emoji绘制对应的几何图标
             if item['icon'] == '➕':  # 添加应用
@@ -387,7 +398,7 @@ class SettingsPage:
             elif item['icon'] == '📺':  # 分辨率
                 # 绘制显示器
                 pygame.draw.rect(screen, text_color, (icon_x - icon_size, icon_y - icon_size//2, icon_size*2, icon_size), 2)
-                pygame.draw.rect(screen, text_color, (icon_x - 2, icon_y + icon_size//2 + 1, 4, 2))
+                pygame.draw.rect(screen, text_color, (icon_x - px(2), icon_y + icon_size//2 + 1, px(4), px(2)))
                 
             elif item['icon'] == '🌐':  # 语言
                 # 绘制地球
@@ -412,31 +423,28 @@ class SettingsPage:
             elif item['icon'] == '🔊':  # 音效
                 # 绘制扬声器
                 speaker_points = [
-                    (icon_x - icon_size//2, icon_y - 3),
-                    (icon_x - 2, icon_y - 3),
-                    (icon_x + 2, icon_y - 5),
-                    (icon_x + 2, icon_y + 5),
-                    (icon_x - 2, icon_y + 3),
-                    (icon_x - icon_size//2, icon_y + 3)
+                    (icon_x - icon_size//2, icon_y - px(3)),
+                    (icon_x - px(2), icon_y - px(3)),
+                    (icon_x + px(2), icon_y - px(5)),
+                    (icon_x + px(2), icon_y + px(5)),
+                    (icon_x - px(2), icon_y + px(3)),
+                    (icon_x - icon_size//2, icon_y + px(3))
                 ]
                 pygame.draw.polygon(screen, text_color, speaker_points)
                 # 音波
-                pygame.draw.arc(screen, text_color, (icon_x + 1, icon_y - 6, 8, 12), -0.5, 0.5, 2)
-                pygame.draw.arc(screen, text_color, (icon_x + 3, icon_y - 8, 10, 16), -0.4, 0.4, 2)
+                pygame.draw.arc(screen, text_color, (icon_x + px(1), icon_y - px(6), px(8), px(12)), -0.5, 0.5, 2)
+                pygame.draw.arc(screen, text_color, (icon_x + px(3), icon_y - px(8), px(10), px(16)), -0.4, 0.4, 2)
                 
             else:
                 # 默认圆点
-                pygame.draw.circle(screen, text_color, (icon_x, icon_y), 3)
+                pygame.draw.circle(screen, text_color, (icon_x, icon_y), px(3))
         
         # 绘制设置项名称
-        name_x = x + 50
-        name_text = font.render(self.i18n.t(item['key']), True, text_color)
-        name_rect = name_text.get_rect(centery=y + height // 2)
-        name_rect.x = name_x
-        screen.blit(name_text, name_rect)
+        name_x = x + px(50)
+        blit_text(screen, font, self.i18n.t(item['key']), text_color, x=name_x, centery=y + height // 2)
         
         # 绘制当前值
-        value_x = x + width - 20
+        value_x = x + width - px(20)
         if item['type'] == 'action':
             value_text = "→"
             value_color = (100, 200, 255)
@@ -452,10 +460,7 @@ class SettingsPage:
                 value_text = str(item['current'])
             value_color = text_color
         
-        value_surface = font.render(value_text, True, value_color)
-        value_rect = value_surface.get_rect(centery=y + height // 2)
-        value_rect.right = value_x
-        screen.blit(value_surface, value_rect)
+        blit_text(screen, font, value_text, value_color, right=value_x, centery=y + height // 2)
     
     def _render_instructions(self, screen, font, screen_width, screen_height):
         """渲染操作说明"""
@@ -465,52 +470,49 @@ class SettingsPage:
             instructions = ["↑↓: 选择", "回车: 进入", "ESC: 返回", "Ctrl+S: 保存"]
         
         # 背景
-        inst_height = len(instructions) * 25 + 20
-        inst_y = screen_height - inst_height - 20
-        inst_surface = pygame.Surface((screen_width, inst_height), pygame.SRCALPHA)
-        inst_surface.fill((0, 0, 0, 100))
-        screen.blit(inst_surface, (0, inst_y))
+        px = self.style_manager.scaled
+        line_height = px(25)
+        inst_height = len(instructions) * line_height + px(20)
+        inst_y = screen_height - inst_height - px(20)
+        screen.blit(translucent_panel((screen_width, inst_height), (0, 0, 0, 100)), (0, inst_y))
         
         # 文字
         for i, instruction in enumerate(instructions):
-            text = font.render(instruction, True, (200, 200, 200))
-            text_rect = text.get_rect(center=(screen_width // 2, inst_y + 15 + i * 25))
-            screen.blit(text, text_rect)
+            blit_text(screen, font, instruction, (200, 200, 200),
+                      center=(screen_width // 2, inst_y + px(15) + i * line_height))
     
     def _render_dropdown(self, screen, font, item, y, content_x, content_width):
         """渲染现代化下拉选择框"""
         options = item['options']
-        option_height = 42  # 增加高度让选项更舒适
-        padding = 12
+        px = self.style_manager.scaled
+        option_height = px(42)  # 增加高度让选项更舒适
+        padding = px(12)
+        inset = px(8)  # 选项背景的左右缩进
         dropdown_height = len(options) * option_height + padding * 2
-        dropdown_width = min(450, content_width - 80)  # 稍微增加宽度
+        dropdown_width = min(px(450), content_width - px(80))  # 稍微增加宽度
         dropdown_x = content_x + (content_width - dropdown_width) // 2
         
         # 确保不超出屏幕
         screen_height = screen.get_height()
-        if y + dropdown_height > screen_height - 50:
-            y = screen_height - dropdown_height - 50
-        
-        # 绘制多层阴影效果
-        for i in range(3):
-            shadow_alpha = 30 - i * 8
-            shadow_offset = 3 + i
-            shadow_surface = pygame.Surface((dropdown_width + shadow_offset * 2, dropdown_height + shadow_offset * 2), pygame.SRCALPHA)
-            shadow_surface.fill((0, 0, 0, shadow_alpha))
-            screen.blit(shadow_surface, (dropdown_x - shadow_offset, y - shadow_offset))
-        
-        # 绘制主背景（渐变效果）
-        dropdown_surface = pygame.Surface((dropdown_width, dropdown_height), pygame.SRCALPHA)
-        # 创建渐变背景
-        for i in range(dropdown_height):
-            alpha = 240 - (i * 20 // dropdown_height)  # 从上到下渐变
-            color = (45 + i * 10 // dropdown_height, 45 + i * 10 // dropdown_height, 55 + i * 10 // dropdown_height, alpha)
-            pygame.draw.line(dropdown_surface, color[:3], (0, i), (dropdown_width, i))
-        screen.blit(dropdown_surface, (dropdown_x, y))
+        if y + dropdown_height > screen_height - px(50):
+            y = screen_height - dropdown_height - px(50)
+        
+        if self.dropdown_effects:
+            # 绘制多层阴影效果
+            shadow_layers = [(px(3 + i), 30 - i * 8) for i in range(3)]
+            shadow_margin = max(offset for offset, _ in shadow_layers)
+            screen.blit(drop_shadow((dropdown_width, dropdown_height), shadow_layers),
+                        (dropdown_x - shadow_margin, y - shadow_margin))
+            
+            # 绘制主背景（渐变效果，从上到下变亮）
+            dropdown_surface = vertical_gradient((dropdown_width, dropdown_height), (45, 45, 55), (55, 55, 65))
+            screen.blit(dropdown_surface, (dropdown_x, y))
+        else:
+            screen.fill((50, 50, 60), (dropdown_x, y, dropdown_width, dropdown_height))
         
         # 绘制边框和高光
-        pygame.draw.rect(screen, (140, 140, 140), (dropdown_x, y, dropdown_width, dropdown_height), 2, border_radius=10)
-        pygame.draw.rect(screen, (180, 180, 180, 100), (dropdown_x + 1, y + 1, dropdown_width - 2, 2), border_radius=8)  # 顶部高光
+        pygame.draw.rect(screen, (140, 140, 140), (dropdown_x, y, dropdown_width, dropdown_height), px(2), border_radius=px(10))
+        pygame.draw.rect(screen, (180, 180, 180, 100), (dropdown_x + 1, y + 1, dropdown_width - 2, px(2)), border_radius=px(8))  # 顶部高光
         
         # 绘制选项
         for i, option in enumerate(options):
@@ -521,23 +523,26 @@ class SettingsPage:
             # 选项背景
             if is_selected:
                 # 选中项：现代化渐变背景
-                sel_surface = pygame.Surface((dropdown_width - 16, option_height - 4), pygame.SRCALPHA)
-                for j in range(option_height - 4):
-                    alpha = 180 - j * 2
-                    color = (80 + j, 120 + j, 255 - j * 2, alpha)
-                    pygame.draw.line(sel_surface, color[:3], (0, j), (dropdown_width - 16, j))
-                screen.blit(sel_surface, (dropdown_x + 8, option_y + 2))
+                sel_height = option_height - px(4)
+                if self.dropdown_effects:
+                    sel_surface = vertical_gradient(
+                        (dropdown_width - inset * 2, sel_height),
+                        (80, 120, 255),
+                        (80 + sel_height, 120 + sel_height, 255 - sel_height * 2)
+                    )
+                    screen.blit(sel_surface, (dropdown_x + inset, option_y + px(2)))
+                else:
+                    screen.fill((100, 140, 215), (dropdown_x + inset, option_y + px(2), dropdown_width - inset * 2, sel_height))
                 
                 # 选中项边框
-                pygame.draw.rect(screen, (120, 160, 255), (dropdown_x + 8, option_y + 2, dropdown_width - 16, option_height - 4), 1, border_radius=6)
+                pygame.draw.rect(screen, (120, 160, 255), (dropdown_x + inset, option_y + px(2), dropdown_width - inset * 2, option_height - px(4)), 1, border_radius=px(6))
                 text_color = self.WHITE
                 
             elif is_current:
                 # 当前值：淡绿色背景
-                cur_surface = pygame.Surface((dropdown_width - 16, option_height - 4), pygame.SRCALPHA)
-                cur_surface.fill((80, 150, 80, 100))
-                screen.blit(cur_surface, (dropdown_x + 8, option_y + 2))
-                pygame.draw.rect(screen, (100, 200, 100), (dropdown_x + 8, option_y + 2, dropdown_width - 16, option_height - 4), 1, border_radius=6)
+                screen.blit(translucent_panel((dropdown_width - inset * 2, option_height - px(4)), (80, 150, 80, 100)),
+                            (dropdown_x + inset, option_y + px(2)))
+                pygame.draw.rect(screen, (100, 200, 100), (dropdown_x + inset, option_y + px(2), dropdown_width - inset * 2, option_height - px(4)), 1, border_radius=px(6))
                 text_color = (240, 240, 240)
             else:
                 text_color = (200, 200, 200)
@@ -551,55 +556,41 @@ class SettingsPage:
                 option_text = option
             
             # 限制文字长度，避免溢出
-            max_text_width = dropdown_width - 60
-            text_surface = font.render(option_text, True, text_color)
-            if text_surface.get_width() > max_text_width:
-                # 截断文字并添加省略号
-                truncated_text = option_text
-                while font.render(truncated_text + "...", True, text_color).get_width() > max_text_width and len(truncated_text) > 1:
-                    truncated_text = truncated_text[:-1]
-                text_surface = font.render(truncated_text + "...", True, text_color)
-            
-            text_rect = text_surface.get_rect()
-            text_rect.x = dropdown_x + 20
-            text_rect.centery = option_y + option_height // 2
-            screen.blit(text_surface, text_rect)
+            max_text_width = dropdown_width - px(60)
+            option_text = get_text_layout().truncate(font, option_text, max_text_width)
+            blit_text(screen, font, option_text, text_color,
+                      x=dropdown_x + px(20), centery=option_y + option_height // 2)
             
             # 状态指示器
-            indicator_x = dropdown_x + dropdown_width - 25
+            indicator_x = dropdown_x + dropdown_width - px(25)
+            indicator_radius = px(6)
             indicator_y = option_y + option_height // 2
             
             if is_current:
                 # 当前值：实心圆
-                pygame.draw.circle(screen, (100, 255, 100), (indicator_x, indicator_y), 6)
-                pygame.draw.circle(screen, (80, 200, 80), (indicator_x, indicator_y), 6, 2)
+                pygame.draw.circle(screen, (100, 255, 100), (indicator_x, indicator_y), indicator_radius)
+                pygame.draw.circle(screen, (80, 200, 80), (indicator_x, indicator_y), indicator_radius, 2)
                 # 添加勾选标记
-                pygame.draw.line(screen, (255, 255, 255), (indicator_x - 3, indicator_y), (indicator_x - 1, indicator_y + 2), 2)
-                pygame.draw.line(screen, (255, 255, 255), (indicator_x - 1, indicator_y + 2), (indicator_x + 3, indicator_y - 2), 2)
+                pygame.draw.line(screen, (255, 255, 255), (indicator_x - px(3), indicator_y), (indicator_x - px(1), indicator_y + px(2)), 2)
+                pygame.draw.line(screen, (255, 255, 255), (indicator_x - px(1), indicator_y + px(2)), (indicator_x + px(3), indicator_y - px(2)), 2)
             elif is_selected:
                 # 选中项：空心圆
-                pygame.draw.circle(screen, (150, 200, 255), (indicator_x, indicator_y), 6, 2)
+                pygame.draw.circle(screen, (150, 200, 255), (indicator_x, indicator_y), indicator_radius, 2)
             
             # 分隔线（除了最后一项）
             if i < len(options) - 1:
                 line_y = option_y + option_height - 1
                 pygame.draw.line(screen, (80, 80, 80, 150), 
-                               (dropdown_x + 15, line_y), (dropdown_x + dropdown_width - 15, line_y))
+                               (dropdown_x + px(15), line_y), (dropdown_x + dropdown_width - px(15), line_y))
         
         # 绘制滚动提示（如果选项很多）
-        if len(options) > 8:
+        if len(options) > 8 and self.dropdown_effects:
             # 顶部渐变遮罩
-            top_mask = pygame.Surface((dropdown_width, 15), pygame.SRCALPHA)
-            for i in range(15):
-                alpha = i * 17
-                pygame.draw.line(top_mask, (50, 50, 60, alpha), (0, i), (dropdown_width, i))
+            top_mask = vertical_gradient((dropdown_width, px(15)), (50, 50, 60, 0), (50, 50, 60, 255))
             screen.blit(top_mask, (dropdown_x, y))
             
             # 底部渐变遮罩
-            bottom_mask = pygame.Surface((dropdown_width, 15), pygame.SRCALPHA)
-            for i in range(15):
-                alpha = (14 - i) * 17
-                pygame.draw.line(bottom_mask, (50, 50, 60, alpha), (0, i), (dropdown_width, i))
-            screen.blit(bottom_mask, (dropdown_x, y + dropdown_height - 15))
+            bottom_mask = vertical_gradient((dropdown_width, px(15)), (50, 50, 60, 0), (50, 50, 60, 255), flip=True)
+            screen.blit(bottom_mask, (dropdown_x, y + dropdown_height - px(15)))
     
 
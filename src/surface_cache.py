@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Surface缓存模块
+提供按字节预算进行LRU淘汰的Surface缓存
+"""
+
+from collections import OrderedDict
+
+
+def surface_bytes(surface):
+    """估算Surface占用的像素内存字节数"""
+    return surface.get_pitch() * surface.get_height()
+
+
+class SurfaceLRUCache:
+    """按字节预算淘汰的LRU Surface缓存"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        # key -> (surface, 字节数)，按最近使用顺序排列
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        """获取缓存的Surface，命中时标记为最近使用"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, surface):
+        """缓存Surface，超出预算时淘汰最久未使用的条目"""
+        self.discard(key)
+        size = surface_bytes(surface)
+        # 单个条目超出总预算时不缓存
+        if size > self.max_bytes:
+            return surface
+
+        self._entries[key] = (surface, size)
+        self.total_bytes += size
+        self._evict()
+        return surface
+
+    def discard(self, key):
+        """移除指定条目"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry[1]
+
+    def discard_where(self, predicate):
+        """移除所有满足条件的条目"""
+        for key in [key for key in self._entries if predicate(key)]:
+            self.discard(key)
+
+    def clear(self):
+        """清空缓存"""
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def _evict(self):
+        """按LRU顺序淘汰，直到回到预算以内"""
+        while self.total_bytes > self.max_bytes and self._entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self.total_bytes -= size
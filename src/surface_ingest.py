@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Surface导入模块
+所有载入或新建的Surface统一在这里转换为显示格式（可选预乘透明度），并按类别计数
+"""
+
+import pygame
+
+
+# 类别 -> 已转换的Surface数量
+_converted = {}
+# 类别 -> 保留原格式的数量
+_unconverted = {}
+
+# Surface.premul_alpha 需要 pygame 2.1.4 及以上，旧版本不预乘透明度
+PREMULTIPLY_SUPPORTED = hasattr(pygame.Surface, "premul_alpha")
+
+# 没有显示Surface时的目标格式（不透明, 带透明度），首次使用时创建
+_texture_formats = None
+
+
+def _texture_format(alpha):
+    """没有显示Surface（纹理渲染后端）时的目标格式：与SDL流式纹理相同的
+    32位 XRGB8888 / ARGB8888，上传纹理时不需要再转换"""
+    global _texture_formats
+    if _texture_formats is None:
+        _texture_formats = (pygame.Surface((1, 1), 0, 32), pygame.Surface((1, 1), pygame.SRCALPHA, 32))
+    return _texture_formats[1 if alpha else 0]
+
+
+def target_format(alpha=False):
+    """返回目标格式的1x1参考Surface：有显示Surface时为显示格式，否则为纹理格式
+
+    在主线程取得后可交给工作线程，以 ingest(..., target=参考Surface) 在线程中
+    转换（按参考Surface转换不访问显示）。
+    """
+    display = pygame.display.get_surface()
+    if display is None:
+        return _texture_format(alpha)
+    if alpha:
+        return pygame.Surface((1, 1), pygame.SRCALPHA, 32)
+    return pygame.Surface((1, 1), 0, display)
+
+
+def _has_format(surface, reference):
+    """surface的像素格式和透明度是否与参考Surface相同"""
+    return (surface.get_bitsize() == reference.get_bitsize()
+            and surface.get_masks() == reference.get_masks()
+            and bool(surface.get_flags() & pygame.SRCALPHA) == bool(reference.get_flags() & pygame.SRCALPHA))
+
+
+def ingest(surface, kind, alpha=None, premultiply=False, target=None):
+    """把surface转换为显示格式（没有显示Surface时为纹理格式）并返回
+
+    kind 为统计用的类别名（如 "wallpaper"、"icon"、"text"）。alpha 为None时
+    按surface自身是否带透明度（SRCALPHA或colorkey）决定用 convert_alpha 还是 convert。
+    target 为 target_format() 返回的参考Surface时按它转换（可在工作线程调用）。
+    surface 已经是目标格式时不转换，直接返回。
+    premultiply 为True时对带透明度的结果预乘透明度，调用方需以
+    BLEND_PREMULTIPLIED 绘制；PREMULTIPLY_SUPPORTED 为False时忽略。
+    """
+    if alpha is None:
+        alpha = bool(surface.get_flags() & pygame.SRCALPHA) or surface.get_colorkey() is not None
+
+    reference = target if target is not None else target_format(alpha)
+    if _has_format(surface, reference):
+        # 已经是目标格式（如按显示格式缓存的背景）
+        _unconverted[kind] = _unconverted.get(kind, 0) + 1
+    elif target is not None or pygame.display.get_surface() is None:
+        surface = surface.convert(reference)
+        _converted[kind] = _converted.get(kind, 0) + 1
+    else:
+        surface = surface.convert_alpha() if alpha else surface.convert()
+        _converted[kind] = _converted.get(kind, 0) + 1
+
+    if premultiply and alpha and PREMULTIPLY_SUPPORTED:
+        surface = surface.premul_alpha()
+    return surface
+
+
+def get_ingest_stats():
+    """返回 (已转换数量, 已是目标格式的数量)，均为 类别 -> 数量 的字典"""
+    return dict(_converted), dict(_unconverted)
+
+
+def print_ingest_stats():
+    """输出各类别的转换统计"""
+    converted, unconverted = get_ingest_stats()
+    for kind in sorted(set(converted) | set(unconverted)):
+        print(f"Surface导入 {kind}: 已转换 {converted.get(kind, 0)}，无需转换 {unconverted.get(kind, 0)}")
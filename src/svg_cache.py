@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SVG栅格化缓存模块
+在应用注册时把SVG图标栅格化为PNG并持久化到磁盘，渲染循环只读取PNG
+"""
+
+import hashlib
+import os
+import queue
+import threading
+from pathlib import Path
+
+
+# 默认栅格化尺寸（像素）
+DEFAULT_RASTER_SIZE = 128
+
+
+class SvgRasterCache:
+    """SVG栅格化磁盘缓存
+
+    缓存文件名由源路径哈希、源文件mtime和像素尺寸组成，源文件变化后
+    旧文件自然失效，并在后台线程中惰性重建。
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = Path(cache_dir) if cache_dir else Path.home() / ".cache" / "flying-desktop" / "icons"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # 后台重建队列
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._failed = set()
+        self._lock = threading.Lock()
+        self._worker = None
+        # 后台栅格化完成（成功或失败）时的回调
+        self._listeners = []
+
+    def add_listener(self, callback):
+        """注册后台栅格化完成的回调 callback(svg_path, size)，在后台线程中调用"""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def _source_hash(self, svg_path):
+        """源路径哈希"""
+        return hashlib.md5(str(svg_path).encode()).hexdigest()[:16]
+
+    def cache_path(self, svg_path, size=DEFAULT_RASTER_SIZE):
+        """获取SVG对应的缓存PNG路径，源文件不存在时返回None"""
+        try:
+            mtime = os.stat(svg_path).st_mtime_ns
+        except OSError:
+            return None
+        return self.cache_dir / f"{self._source_hash(svg_path)}_{mtime}_{size}.png"
+
+    def lookup(self, svg_path, size=DEFAULT_RASTER_SIZE):
+        """查找已栅格化的PNG，缺失或过期时安排后台重建并返回None"""
+        png_path = self.cache_path(svg_path, size)
+        if png_path is None:
+            return None
+        if png_path.exists():
+            return str(png_path)
+
+        self.rasterize_async(svg_path, size)
+        return None
+
+    def is_failed(self, svg_path, size=DEFAULT_RASTER_SIZE):
+        """该SVG是否栅格化失败"""
+        png_path = self.cache_path(svg_path, size)
+        with self._lock:
+            return png_path is None or png_path in self._failed
+
+    def rasterize(self, svg_path, size=DEFAULT_RASTER_SIZE):
+        """同步栅格化SVG（注册应用时调用），返回PNG路径"""
+        png_path = self.cache_path(svg_path, size)
+        if png_path is None:
+            return None
+        if png_path.exists():
+            return str(png_path)
+
+        try:
+            import cairosvg
+
+            # 先写临时文件再重命名，避免渲染线程读到不完整的PNG
+            tmp_path = png_path.with_suffix(f".{threading.get_ident()}.tmp")
+            cairosvg.svg2png(
+                url=str(svg_path),
+                write_to=str(tmp_path),
+                output_width=size,
+                output_height=size,
+                unsafe=True  # 允许不安全的SVG
+            )
+            os.replace(tmp_path, png_path)
+            self._remove_stale(svg_path, png_path)
+            print(f"SVG图标已栅格化: {svg_path} -> {png_path}")
+            return str(png_path)
+        except Exception as e:
+            print(f"SVG图标栅格化失败 {svg_path}: {e}")
+            with self._lock:
+                self._failed.add(png_path)
+            return None
+
+    def rasterize_async(self, svg_path, size=DEFAULT_RASTER_SIZE):
+        """在后台线程中栅格化SVG"""
+        task = (str(svg_path), size)
+        with self._lock:
+            if task in self._pending:
+                return
+            if self.cache_path(svg_path, size) in self._failed:
+                return
+            self._pending.add(task)
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._worker_loop, name="svg-raster", daemon=True
+                )
+                self._worker.start()
+            self._queue.put(task)
+
+    def _worker_loop(self):
+        """后台栅格化线程"""
+        while True:
+            try:
+                svg_path, size = self._queue.get(timeout=5)
+            except queue.Empty:
+                # 空闲一段时间后退出，下次有任务时重新启动
+                with self._lock:
+                    if self._queue.empty():
+                        self._worker = None
+                        return
+                continue
+            try:
+                self.rasterize(svg_path, size)
+            finally:
+                with self._lock:
+                    self._pending.discard((svg_path, size))
+                    listeners = list(self._listeners)
+            for callback in listeners:
+                callback(svg_path, size)
+
+    def _remove_stale(self, svg_path, current_path):
+        """删除同一源文件、同一尺寸的过期缓存"""
+        size = current_path.stem.rsplit('_', 1)[-1]
+        for cached in self.cache_dir.glob(f"{self._source_hash(svg_path)}_*_{size}.png"):
+            if cached != current_path:
+                try:
+                    cached.unlink()
+                except OSError:
+                    pass
+
+
+# 全局SVG栅格化缓存实例
+_global_svg_cache = None
+
+def get_svg_cache():
+    """获取全局SVG栅格化缓存实例"""
+    global _global_svg_cache
+    if _global_svg_cache is None:
+        _global_svg_cache = SvgRasterCache()
+    return _global_svg_cache
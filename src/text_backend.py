@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文字渲染后端模块
+可选的 pygame.freetype 后端，用 render_to 把字形直接绘制到目标Surface
+"""
+
+import weakref
+from collections import OrderedDict
+
+import pygame
+
+
+# 可选的文字后端名称
+TEXT_BACKEND_FONT = "font"
+TEXT_BACKEND_FREETYPE = "freetype"
+
+# pygame字体 -> (字体文件路径, 字号)，由 Renderer._load_font 登记
+_font_sources = weakref.WeakKeyDictionary()
+
+
+def register_font(font, path, size):
+    """登记字体的来源，供其他后端按同一文件和字号加载"""
+    if not path:
+        # pygame.font 加载内置默认字体时会把字号缩小为0.6875倍
+        size = max(1, int(size * 0.6875))
+    _font_sources[font] = (str(path) if path else None, size)
+    return font
+
+
+class FreetypeTextBackend:
+    """pygame.freetype 文字后端
+
+    每个已登记的 pygame 字体对应一个 freetype 字体，字形由 freetype 内部缓存。
+    绘制时不创建中间Surface，直接 render_to 到屏幕；
+    排版区域与 font.render 生成的Surface一致（宽度为文字宽度，高度为行高）。
+    """
+
+    def __init__(self, max_extents=4096):
+        import pygame.freetype
+        if not pygame.freetype.get_init():
+            pygame.freetype.init()
+        self._freetype = pygame.freetype
+        self._fonts = weakref.WeakKeyDictionary()
+        # (freetype字体, 文本) -> 文字宽度
+        self._widths = OrderedDict()
+        self.max_extents = max_extents
+
+    def blit(self, surface, font, text, color, antialias=True, **rect_kwargs):
+        """绘制文字，返回绘制区域；字体未登记时返回None由调用方回退"""
+        ft_font = self._get_font(font)
+        if ft_font is None:
+            return None
+
+        rect = self.text_rect(font, text, **rect_kwargs)
+
+        if text:
+            ft_font.antialiased = antialias
+            # origin模式下目标坐标为基线原点
+            ft_font.render_to(surface, (rect.x, rect.y + font.get_ascent()), text, color)
+        return rect
+
+    def text_rect(self, font, text, **rect_kwargs):
+        """文字的排版区域（不绘制）；字体未登记时返回None由调用方回退"""
+        ft_font = self._get_font(font)
+        if ft_font is None:
+            return None
+
+        # 行高和基线沿用pygame字体的度量，保证两种后端的排版位置一致
+        rect = pygame.Rect(0, 0, self._text_width(ft_font, text), font.get_height())
+        for name, value in rect_kwargs.items():
+            setattr(rect, name, value)
+        return rect
+
+    def _get_font(self, font):
+        """获取与pygame字体对应的freetype字体"""
+        ft_font = self._fonts.get(font)
+        if ft_font is not None:
+            return ft_font
+
+        source = _font_sources.get(font)
+        if source is None:
+            return None
+        path, size = source
+        try:
+            ft_font = self._freetype.Font(path, size)
+        except Exception as e:
+            print(f"freetype加载字体失败 {path}: {e}")
+            # 记录失败，之后该字体直接回退到font后端
+            _font_sources.pop(font, None)
+            return None
+        ft_font.origin = True
+        ft_font.kerning = True
+        self._fonts[font] = ft_font
+        return ft_font
+
+    def _text_width(self, ft_font, text):
+        """文字宽度（带缓存）"""
+        if not text:
+            return 0
+        key = (ft_font, text)
+        width = self._widths.get(key)
+        if width is None:
+            bounds = ft_font.get_rect(text)
+            width = max(0, bounds.right)
+            self._widths[key] = width
+            if len(self._widths) > self.max_extents:
+                self._widths.popitem(last=False)
+        else:
+            self._widths.move_to_end(key)
+        return width
+
+
+# 当前文字后端，None表示使用 pygame.font
+_active_backend = None
+
+def set_text_backend(name):
+    """按名称切换文字后端，freetype不可用时回退到font后端"""
+    global _active_backend
+    _active_backend = None
+    if name == TEXT_BACKEND_FREETYPE:
+        try:
+            _active_backend = FreetypeTextBackend()
+            print("使用freetype文字后端")
+        except Exception as e:
+            print(f"freetype文字后端不可用，使用默认后端: {e}")
+    elif name != TEXT_BACKEND_FONT:
+        print(f"未知的文字后端: {name}，使用默认后端")
+    return _active_backend
+
+
+def get_text_backend():
+    """获取当前文字后端（默认后端返回None）"""
+    return _active_backend
+
+
+def text_rect(font, text, **rect_kwargs):
+    """按当前文字后端的度量返回文字的排版区域（不渲染文字）
+
+    rect_kwargs同 Surface.get_rect 的定位参数，结果与 blit_text 绘制的区域一致。
+    """
+    if _active_backend is not None:
+        rect = _active_backend.text_rect(font, text, **rect_kwargs)
+        if rect is not None:
+            return rect
+    rect = pygame.Rect((0, 0), font.size(text))
+    for name, value in rect_kwargs.items():
+        setattr(rect, name, value)
+    return rect
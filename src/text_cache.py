@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文本缓存模块
+缓存 font.render 生成的文字Surface，供所有界面共享
+"""
+
+from .surface_cache import SurfaceLRUCache
+from .text_backend import get_text_backend
+from .surface_ingest import ingest
+
+
+class TextSurfaceCache:
+    """文字Surface缓存
+
+    缓存键为 (字体对象, 文本, 颜色, 抗锯齿)。切换语言或主题时清空；
+    generation 在每次清空时递增，依赖文字内容的其他缓存可据此判断是否失效。
+    """
+
+    def __init__(self, max_bytes=16 * 1024 * 1024):
+        self._surfaces = SurfaceLRUCache(max_bytes)
+        self.generation = 0
+
+    def render(self, font, text, color, antialias=True):
+        """获取渲染好的文字Surface"""
+        key = (font, text, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            surface = ingest(font.render(text, antialias, color), "text", alpha=True)
+            self._surfaces.put(key, surface)
+        return surface
+
+    def clear(self):
+        """清空缓存（语言或主题变化时调用）"""
+        self._surfaces.clear()
+        self.generation += 1
+
+
+def blit_text(surface, font, text, color, antialias=True, **rect_kwargs):
+    """绘制文字，rect_kwargs同 Surface.get_rect 的定位参数，返回绘制区域
+
+    启用freetype后端时直接绘制到目标Surface，否则绘制缓存的文字Surface。
+    """
+    backend = get_text_backend()
+    if backend is not None:
+        text_rect = backend.blit(surface, font, text, color, antialias, **rect_kwargs)
+        if text_rect is not None:
+            return text_rect
+    text_surface = get_text_cache().render(font, text, color, antialias)
+    text_rect = text_surface.get_rect(**rect_kwargs)
+    surface.blit(text_surface, text_rect)
+    return text_rect
+
+
+# 全局文字缓存实例
+_global_text_cache = None
+
+def get_text_cache():
+    """获取全局文字缓存实例"""
+    global _global_text_cache
+    if _global_text_cache is None:
+        _global_text_cache = TextSurfaceCache()
+    return _global_text_cache
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文本排版模块
+基于字形宽度缓存的截断与换行，避免为测量文字反复渲染
+"""
+
+import unicodedata
+import weakref
+from bisect import bisect_right
+from collections import OrderedDict
+
+
+ELLIPSIS = "..."
+
+
+def is_wide_char(char):
+    """是否为中日韩等可在任意字符间断行的宽字符"""
+    return unicodedata.east_asian_width(char) in ('W', 'F')
+
+
+# 不能出现在行首的标点（避头尾规则）
+NO_LINE_START = set("，。、；：？！）》」』】〕〉,.;:?!)]}”’…")
+
+# 不能出现在行尾的标点
+NO_LINE_END = set("（《「『【〔〈([{“‘")
+
+
+class TextLayout:
+    """文本排版引擎
+
+    按字体缓存每个字符的前进宽度，文字宽度由字符宽度累加得到；
+    截断和换行结果按 (操作, 字体, 文本, 宽度) 记忆，重复绘制时直接复用。
+    """
+
+    def __init__(self, max_layouts=2048):
+        self.max_layouts = max_layouts
+        # 字体 -> {字符: 前进宽度}，字体对象释放后自动移除
+        self._advances = weakref.WeakKeyDictionary()
+        self._layouts = OrderedDict()
+
+    def char_widths(self, font, text):
+        """文本中每个字符的前进宽度"""
+        advances = self._advances.setdefault(font, {})
+        missing = [char for char in set(text) if char not in advances]
+        if missing:
+            metrics = font.metrics("".join(missing))
+            for char, metric in zip(missing, metrics):
+                # 字体中不存在的字形metrics为None，退回整体测量
+                advances[char] = metric[4] if metric else font.size(char)[0]
+        return [advances[char] for char in text]
+
+    def text_width(self, font, text):
+        """文本宽度"""
+        return sum(self.char_widths(font, text))
+
+    def truncate(self, font, text, max_width, ellipsis=ELLIPSIS):
+        """截断文本使其不超过max_width，被截断时追加省略号"""
+        key = ("truncate", font, text, max_width, ellipsis)
+        result = self._get(key)
+        if result is None:
+            result = self._truncate(font, text, max_width, ellipsis)
+            self._put(key, result)
+        return result
+
+    def wrap(self, font, text, max_width):
+        """把文本折成不超过max_width的多行
+
+        英文按单词断行，中日韩文字可在任意字符间断行，换行符强制断行
+        （连续换行保留为空行），单个过长的单词按字符拆分。
+        """
+        key = ("wrap", font, text, max_width)
+        result = self._get(key)
+        if result is None:
+            lines = []
+            for paragraph in text.split("\n"):
+                # 空段落保留为空行
+                lines.extend(self._wrap_paragraph(font, paragraph, max_width) or [""])
+            result = tuple(lines)
+            self._put(key, result)
+        return list(result)
+
+    def clear(self):
+        """清空所有缓存（字体重新加载时调用）"""
+        self._advances.clear()
+        self._layouts.clear()
+
+    def _truncate(self, font, text, max_width, ellipsis):
+        """二分查找能放下的最长前缀
+
+        字符前进宽度之和会略小于实际渲染宽度（字形悬垂、字距调整），
+        只用来估计切点的上限；是否放得下以 font.size 的测量结果为准。
+        """
+        if font.size(text)[0] <= max_width:
+            return text
+
+        widths = self.char_widths(font, text)
+        available = max_width - self.text_width(font, ellipsis)
+        # prefix[i] 为前i个字符的宽度，单调递增
+        prefix = [0]
+        for width in widths:
+            prefix.append(prefix[-1] + width)
+        high = min(len(text) - 1, bisect_right(prefix, available) - 1)
+
+        # 在 [1, high] 中二分查找实际宽度不超过max_width的最长前缀，
+        # 至少保留一个字符，与原有截断行为一致
+        low = 1
+        while low < high:
+            middle = (low + high + 1) // 2
+            if font.size(text[:middle].rstrip() + ellipsis)[0] <= max_width:
+                low = middle
+            else:
+                high = middle - 1
+        return text[:max(1, low)].rstrip() + ellipsis
+
+    def _wrap_paragraph(self, font, text, max_width):
+        """对不含换行符的一段文本折行"""
+        if not text.strip():
+            return []
+
+        widths = self.char_widths(font, text)
+        lines = []
+        line_start = 0
+        line_width = 0
+        # 当前行内最后一个可断行位置（该位置的字符作为下一行的开头）
+        break_at = None
+
+        i = 0
+        while i < len(text):
+            char = text[i]
+            if i > line_start and self._can_break_before(text, i):
+                break_at = i
+
+            if line_width + widths[i] > max_width and i > line_start:
+                if char.isspace():
+                    # 行尾空格直接丢弃
+                    lines.append(text[line_start:i].rstrip())
+                    i += 1
+                elif break_at is not None and break_at > line_start:
+                    lines.append(text[line_start:break_at].rstrip())
+                    i = break_at
+                else:
+                    # 没有断行机会的长单词，按字符硬切
+                    lines.append(text[line_start:i])
+                # 新行去掉前导空格
+                while i < len(text) and text[i].isspace():
+                    i += 1
+                line_start = i
+                line_width = 0
+                break_at = None
+                continue
+
+            line_width += widths[i]
+            i += 1
+
+        tail = text[line_start:].rstrip()
+        if tail:
+            lines.append(tail)
+        return lines
+
+    def _can_break_before(self, text, i):
+        """能否在text[i]之前断行"""
+        char = text[i]
+        prev = text[i - 1]
+        if char in NO_LINE_START or prev in NO_LINE_END:
+            return False
+        if prev.isspace() and not char.isspace():
+            return True
+        return is_wide_char(char) or is_wide_char(prev)
+
+    def _get(self, key):
+        result = self._layouts.get(key)
+        if result is not None:
+            self._layouts.move_to_end(key)
+        return result
+
+    def _put(self, key, result):
+        self._layouts[key] = result
+        while len(self._layouts) > self.max_layouts:
+            self._layouts.popitem(last=False)
+
+
+# 全局排版引擎实例
+_global_text_layout = None
+
+def get_text_layout():
+    """获取全局文本排版引擎实例"""
+    global _global_text_layout
+    if _global_text_layout is None:
+        _global_text_layout = TextLayout()
+    return _global_text_layout
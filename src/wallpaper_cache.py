@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+背景缓存模块
+把缩放到屏幕分辨率的背景按显示格式以原始像素数据保存到磁盘，之后直接读入
+显示格式Surface的像素内存，无需解码、缩放和格式转换
+"""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+
+import pygame
+
+
+def _format_tag(target):
+    """像素格式在缓存文件名中的标记，如 32_ff0000_ff00_ff"""
+    masks = target.get_masks()[:3]
+    return "_".join([str(target.get_bitsize())] + [f"{mask:x}" for mask in masks])
+
+
+class WallpaperRawCache:
+    """预缩放背景磁盘缓存
+
+    缓存文件名由源路径哈希、源文件mtime、目标分辨率和像素格式组成，源文件、
+    分辨率或显示格式变化后旧文件自然失效，重新生成时删除同一源文件的过期缓存。
+    target 为 target_format() 返回的参考Surface（不透明），像素数据按它的
+    格式保存，载入后不需要再转换。
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = Path(cache_dir) if cache_dir else Path.home() / ".cache" / "flying-desktop" / "wallpapers"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _source_hash(self, path):
+        """源路径哈希"""
+        return hashlib.md5(str(Path(path).resolve()).encode()).hexdigest()[:16]
+
+    def cache_path(self, path, size, target):
+        """获取背景对应的缓存文件路径，源文件不存在时返回None"""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        return self.cache_dir / f"{self._source_hash(path)}_{mtime}_{size[0]}x{size[1]}_{_format_tag(target)}.raw"
+
+    def load(self, path, size, target):
+        """读取缓存的背景（target格式的Surface），未缓存或缓存无效时返回None"""
+        raw_path = self.cache_path(path, size, target)
+        if raw_path is None:
+            return None
+        surface = pygame.Surface(size, 0, target)
+        if surface.get_pitch() != size[0] * surface.get_bytesize():
+            # 行尾有填充时无法整块复制，不使用缓存
+            return None
+        expected = surface.get_pitch() * size[1]
+        try:
+            with open(raw_path, "rb") as f:
+                if os.fstat(f.fileno()).st_size != expected:
+                    return None
+                # 直接读入Surface的像素内存，只复制一次
+                pixels = memoryview(surface.get_view("0"))
+                try:
+                    read = f.readinto(pixels)
+                finally:
+                    pixels.release()
+        except OSError:
+            return None
+        except Exception as e:
+            print(f"背景缓存读取失败 {raw_path}: {e}")
+            return None
+        return surface if read == expected else None
+
+    def store(self, path, surface):
+        """保存缩放后的背景（surface 须已是 load 时使用的 target 格式）"""
+        size = surface.get_size()
+        raw_path = self.cache_path(path, size, surface)
+        if raw_path is None or surface.get_pitch() != size[0] * surface.get_bytesize():
+            return
+        try:
+            # 先写临时文件再重命名，避免读到不完整的缓存
+            tmp_path = raw_path.with_suffix(f".{threading.get_ident()}.tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(surface.get_buffer().raw)
+            os.replace(tmp_path, raw_path)
+            self._remove_stale(path, raw_path)
+        except Exception as e:
+            print(f"背景缓存写入失败 {path}: {e}")
+
+    def _remove_stale(self, path, current_path):
+        """删除同一源文件的过期缓存（旧mtime或旧分辨率）"""
+        with self._lock:
+            for cached in self.cache_dir.glob(f"{self._source_hash(path)}_*.raw"):
+                if cached != current_path:
+                    try:
+                        cached.unlink()
+                    except OSError:
+                        pass
+
+
+# 全局背景缓存实例
+_global_wallpaper_cache = None
+
+def get_wallpaper_cache():
+    """获取全局背景缓存实例"""
+    global _global_wallpaper_cache
+    if _global_wallpaper_cache is None:
+        _global_wallpaper_cache = WallpaperRawCache()
+    return _global_wallpaper_cache
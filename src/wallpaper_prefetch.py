@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+背景预取模块
+启动时只加载当前背景，下一张背景在后台线程中提前解码和缩放，其余背景不常驻内存
+"""
+
+import queue
+import threading
+from pathlib import Path
+
+import pygame
+
+from .surface_ingest import ingest, target_format
+
+# 背景预取完成事件
+WALLPAPER_LOADED_EVENT = pygame.USEREVENT + 2
+
+# 目录中识别为背景图片的扩展名
+WALLPAPER_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".webp", ".tga")
+
+
+def expand_wallpaper_paths(entries):
+    """展开配置的背景列表
+
+    文件直接使用，目录按文件名排序展开其中的图片，不存在的条目和重复项被忽略。
+    """
+    paths = []
+    seen = set()
+    for entry in entries:
+        path = Path(entry).expanduser()
+        if path.is_dir():
+            try:
+                candidates = sorted(
+                    p for p in path.iterdir()
+                    if p.suffix.lower() in WALLPAPER_EXTENSIONS and p.is_file()
+                )
+            except OSError as e:
+                print(f"读取背景目录失败 {path}: {e}")
+                continue
+        elif path.exists():
+            candidates = [path]
+        else:
+            continue
+
+        for candidate in candidates:
+            if candidate not in seen:
+                seen.add(candidate)
+                paths.append(candidate)
+    return paths
+
+
+class WallpaperPrefetcher:
+    """背景预取器
+
+    只保存路径列表；解码并缩放好的背景按索引暂存，由渲染器取走后即释放，
+    因此无论配置了多少张背景，常驻内存的只有当前和下一张。
+    预取完成后通过 WALLPAPER_LOADED_EVENT 事件唤醒主线程。
+    """
+
+    def __init__(self, paths, size, cache=None):
+        self.paths = list(paths)
+        self.size = size
+        # 预缩放背景的磁盘缓存（WallpaperRawCache），为None时每次都解码
+        self.cache = cache
+        # 背景在工作线程中转换为显示格式（参考Surface须在主线程取得）
+        self._target = target_format()
+
+        # 已预取的背景：索引 -> Surface
+        self._ready = {}
+        self._pending = set()
+        self._failed = set()
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def __len__(self):
+        return len(self.paths)
+
+    def load(self, index):
+        """同步加载指定索引的背景（显示格式），失败时返回None"""
+        path = self.paths[index]
+        if self.cache is not None:
+            surface = self.cache.load(path, self.size, self._target)
+            if surface is not None:
+                return surface
+        try:
+            image = pygame.image.load(str(path))
+            surface = ingest(pygame.transform.scale(image, self.size), "wallpaper",
+                             alpha=False, target=self._target)
+            print(f"背景图片加载成功: {path}")
+            if self.cache is not None:
+                self.cache.store(path, surface)
+            return surface
+        except Exception as e:
+            print(f"背景图片加载失败 {path}: {e}")
+            with self._lock:
+                self._failed.add(index)
+            return None
+
+    def request(self, index):
+        """在后台线程中预取指定索引的背景，并释放其他已预取的背景"""
+        with self._lock:
+            for cached in list(self._ready):
+                if cached != index:
+                    del self._ready[cached]
+            if index in self._ready or index in self._pending or index in self._failed:
+                return
+            self._pending.add(index)
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._worker_loop, name="wallpaper-prefetch", daemon=True
+                )
+                self._worker.start()
+            self._queue.put(index)
+
+    def take(self, index):
+        """取走已预取的背景，尚未完成或失败时返回None"""
+        with self._lock:
+            return self._ready.pop(index, None)
+
+    def is_pending(self, index):
+        """该背景是否正在预取"""
+        with self._lock:
+            return index in self._pending
+
+    def is_failed(self, index):
+        """该背景是否加载失败"""
+        with self._lock:
+            return index in self._failed
+
+    def _worker_loop(self):
+        """后台预取线程"""
+        while True:
+            try:
+                index = self._queue.get(timeout=5)
+            except queue.Empty:
+                # 空闲一段时间后退出，下次有任务时重新启动
+                with self._lock:
+                    if self._queue.empty():
+                        self._worker = None
+                        return
+                continue
+
+            surface = self.load(index)
+            with self._lock:
+                self._pending.discard(index)
+                if surface is not None:
+                    self._ready[index] = surface
+
+            try:
+                pygame.event.post(pygame.event.Event(WALLPAPER_LOADED_EVENT, index=index))
+            except pygame.error:
+                # 事件系统已关闭
+                return